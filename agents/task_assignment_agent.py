@@ -1,8 +1,11 @@
-import autogen
+import threading
 from flask import current_app
-from models.database import db, Employee, Task, TaskAssignment
-from utils.email_service import EmailService
+from models.database import db, Task, TaskAssignment
+from utils.side_effects import enqueue_assignment_email
 from utils.employee_matcher import EmployeeMatcher
+from utils.domain_classifier import domain_classifier
+from utils.skill_extractor import skill_extractor
+from utils.autogen_fallback import autogen_fallback, task_content_key
 import json
 
 
@@ -11,49 +14,91 @@ class TaskAssignmentAgent:
     
     def __init__(self):
         self.employee_matcher = EmployeeMatcher()
-        self.email_service = EmailService()
         
-        # Keep AutoGen for complex decision making if needed
-        self.config_list = [
-            {
-                'model': 'gpt-3.5-turbo',
-                'api_key': current_app.config['OPENAI_API_TOKEN']
-            }
-        ]
+        # AutoGen is kept for complex decisions the matcher can't make. Its
+        # agents (and the autogen import) are only built on the first fallback,
+        # once per thread, since a conversation keeps its history on the agents.
+        self._autogen_agents = threading.local()
+    
+    @property
+    def manager_agent(self):
+        return self._get_autogen_agents()[0]
+    
+    @property
+    def user_proxy(self):
+        return self._get_autogen_agents()[1]
+    
+    def _get_autogen_agents(self):
+        """
+        Build this thread's AutoGen manager and user proxy agents on first use.
+        
+        Web workers that never take the fallback path never import autogen.
+        Each fallback pool thread gets its own pair, so concurrent chats
+        don't share a conversation.
+        
+        Returns:
+            tuple: (manager AssistantAgent, UserProxyAgent)
+        """
+        agents = getattr(self._autogen_agents, 'pair', None)
+        if agents is not None:
+            return agents
+        
+        import autogen
+        
+        # Bounds each LLM request, so a chat that outlived its caller's
+        # deadline still ends and frees its fallback slot
+        llm_config = {
+            'config_list': [
+                {
+                    'model': 'gpt-3.5-turbo',
+                    'api_key': current_app.config['OPENAI_API_TOKEN']
+                }
+            ],
+            'timeout': current_app.config.get('AUTOGEN_TIMEOUT_SECONDS', 20)
+        }
         
-        self.manager_agent = autogen.AssistantAgent(
+        manager_agent = autogen.AssistantAgent(
             name="TaskManager",
             system_message="""You are a task manager responsible for analyzing tasks 
             and determining the best employee assignment based on skills, availability, 
             and workload. You make final assignment decisions.""",
-            llm_config={"config_list": self.config_list}
+            llm_config=llm_config
         )
         
-        self.user_proxy = autogen.UserProxyAgent(
+        user_proxy = autogen.UserProxyAgent(
             name="UserProxy",
             human_input_mode="NEVER",
-            max_consecutive_auto_reply=10,
+            max_consecutive_auto_reply=current_app.config.get('AUTOGEN_MAX_AUTO_REPLY', 1),
             is_termination_msg=lambda x: x.get("content", "").rstrip().endswith("TERMINATE"),
             code_execution_config={"work_dir": "coding"},
-            llm_config={"config_list": self.config_list}
+            llm_config=llm_config
         )
+        
+        self._autogen_agents.pair = (manager_agent, user_proxy)
+        return self._autogen_agents.pair
     
-    def assign_task(self, task_data):
-        """Assign a task to the best available employee using intelligent matching"""
+    def assign_task(self, task_data, task=None):
+        """
+        Assign a task to the best available employee using intelligent matching.
+        
+        The task, its assignment and the notification job are written in one
+        transaction: the employee is chosen before anything is written, a
+        single flush gives the rows their ids and the session commits once.
+        
+        Args:
+            task_data (dict): Task fields and matching hints (task_type,
+                domain, required_skills)
+            task (Task): A task built by the caller and not yet committed;
+                one is created from task_data when omitted
+            
+        Returns:
+            TaskAssignment or None: The committed assignment, or None when
+                no employee was found (the task is still committed) or the
+                transaction failed
+        """
         try:
-            # Create task in database
-            task = Task(
-                title=task_data.get('title', 'Untitled Task'),
-                description=task_data.get('description', ''),
-                priority=task_data.get('priority', 'medium'),
-                source=task_data.get('source', 'manual'),
-                source_id=task_data.get('source_id'),
-                created_by=task_data.get('created_by', 'system'),
-                estimated_hours=task_data.get('estimated_hours'),
-                due_date=task_data.get('due_date')
-            )
-            db.session.add(task)
-            db.session.commit()
+            if task is None:
+                task = self._build_task(task_data)
             
             # Determine task type and domain from the task data
             task_type = self._determine_task_type(task_data)
@@ -71,27 +116,16 @@ class TaskAssignmentAgent:
             )
             
             if best_employee:
-                # Create assignment
-                assignment = TaskAssignment(
-                    task_id=task.id,
-                    employee_id=best_employee.id,
+                assignment = self._add_assignment(
+                    task,
+                    best_employee.id,
+                    best_employee.email,
                     assigned_by='AI Matcher',
                     notes=f"Assigned by intelligent matching system. "
                           f"Task type: {task_type}, Domain: {required_domain}"
                 )
-                db.session.add(assignment)
-                
-                # Update task status
-                task.status = 'assigned'
                 db.session.commit()
                 
-                # Send notification
-                self.email_service.send_task_assignment_notification(
-                    best_employee.email,
-                    task.title,
-                    task.description
-                )
-                
                 current_app.logger.info(
                     f"Task '{task.title}' assigned to {best_employee.name} "
                     f"using intelligent matching"
@@ -104,12 +138,279 @@ class TaskAssignmentAgent:
                     f"No suitable employee found for task '{task.title}'. "
                     f"Falling back to AutoGen assignment."
                 )
-                return self._fallback_autogen_assignment(task, task_data)
+                assignment = self._fallback_autogen_assignment(
+                    task, task_type, required_domain, required_skills
+                )
+                if assignment is None:
+                    db.session.add(task)
+                db.session.commit()
+                return assignment
             
         except Exception as e:
+            db.session.rollback()
             current_app.logger.error(f"Task assignment failed: {str(e)}")
             return None
     
+    def ingest_tasks(self, payloads):
+        """
+        Create and assign a list of tasks in a single transaction.
+        
+        Every task is matched in one capacity-constrained pass (see
+        assign_tasks_batch), then all tasks, assignments and notification
+        jobs are written with one flush and one commit. Tasks that could not
+        be placed are still created, unassigned.
+        
+        Args:
+            payloads (list): Task data dicts, as accepted by assign_task
+            
+        Returns:
+            dict: 'tasks' (list of Task, in payload order), 'assignments'
+                (list of TaskAssignment) and 'unassigned' (list of Task)
+        """
+        result = {'tasks': [], 'assignments': [], 'unassigned': []}
+        
+        try:
+            payloads = list(payloads)
+            if not payloads:
+                return result
+            
+            tasks = [self._build_task(task_data) for task_data in payloads]
+            plan = self._plan_batch(tasks, payloads)
+            
+            db.session.add_all(tasks)
+            assignments = self._add_batch_assignments(tasks, plan, assigned_by='AI Bulk Matcher')
+            db.session.commit()
+            
+            current_app.logger.info(
+                f"Bulk ingestion created {len(tasks)} tasks and assigned {len(assignments)}"
+            )
+            
+            assigned_tasks = {assignment.task_id for assignment in assignments}
+            return {
+                'tasks': tasks,
+                'assignments': assignments,
+                'unassigned': [task for task in tasks if task.id not in assigned_tasks]
+            }
+            
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Bulk task ingestion failed: {str(e)}")
+            return result
+    
+    def _build_task(self, task_data):
+        """Create an unsaved Task from task data"""
+        return Task(
+            title=task_data.get('title', 'Untitled Task'),
+            description=task_data.get('description', ''),
+            priority=task_data.get('priority', 'medium'),
+            source=task_data.get('source', 'manual'),
+            source_id=task_data.get('source_id'),
+            created_by=task_data.get('created_by', 'system'),
+            estimated_hours=task_data.get('estimated_hours'),
+            due_date=task_data.get('due_date')
+        )
+    
+    def _add_assignment(self, task, employee_id, employee_email, assigned_by, notes):
+        """
+        Add a task's assignment and notification job to the session without committing.
+        
+        The task is added too if it isn't already; one flush gives the task
+        and the assignment their ids for the notification's idempotency key.
+        """
+        db.session.add(task)
+        if task.id is None:
+            db.session.flush()
+        
+        assignment = TaskAssignment(
+            task_id=task.id,
+            employee_id=employee_id,
+            assigned_by=assigned_by,
+            notes=notes
+        )
+        db.session.add(assignment)
+        
+        # Update task status
+        task.status = 'assigned'
+        
+        # The notification is sent by a side-effect worker once this commits
+        if employee_email:
+            enqueue_assignment_email(
+                assignment,
+                employee_email,
+                task.title,
+                task.description
+            )
+        return assignment
+    
+    def open_tasks(self, task_ids=None):
+        """
+        Get the tasks a batch may assign: not closed and never assigned.
+        
+        Args:
+            task_ids (list): Only consider these tasks; every task when None
+            
+        Returns:
+            list: Task objects
+        """
+        assigned_task_ids = db.session.query(TaskAssignment.task_id)
+        query = Task.query.filter(
+            ~Task.id.in_(assigned_task_ids),
+            Task.status != 'Closed'
+        )
+        if task_ids is not None:
+            query = query.filter(Task.id.in_(task_ids))
+        return query.all()
+    
+    def assign_tasks_batch(self, tasks):
+        """
+        Assign many open tasks in a single matching pass.
+        
+        Scores every task against every available employee in one
+        tasks x employees matrix and solves a capacity-constrained optimal
+        assignment over it, instead of assigning greedily one task at a time.
+        All TaskAssignment rows are committed in one transaction.
+        
+        Args:
+            tasks (list): Existing Task objects to assign
+            
+        Returns:
+            dict: 'assignments' (list of TaskAssignment) and 'unassigned'
+                (list of Task that could not be placed within capacity)
+        """
+        tasks = list(tasks)
+        result = {'assignments': [], 'unassigned': tasks}
+        
+        try:
+            if not tasks:
+                return result
+            
+            plan = self._plan_batch(tasks, [self._task_data(task) for task in tasks])
+            if plan is None:
+                return result
+            
+            assigned = self._add_batch_assignments(tasks, plan, assigned_by='AI Batch Matcher')
+            
+            # Notifications are sent by side-effect workers once every assignment is committed
+            db.session.commit()
+            
+            current_app.logger.info(
+                f"Batch assignment placed {len(assigned)} of {len(tasks)} tasks"
+            )
+            
+            assigned_tasks = {assignment.task_id for assignment in assigned}
+            return {
+                'assignments': assigned,
+                'unassigned': [task for task in tasks if task.id not in assigned_tasks]
+            }
+            
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Batch task assignment failed: {str(e)}")
+            return result
+    
+    def _plan_batch(self, tasks, task_data_list):
+        """
+        Choose an employee for each task with one capacity-constrained solve.
+        
+        Only reads from the database, so tasks may still be unsaved.
+        
+        Args:
+            tasks (list): Task objects, for their estimated hours
+            task_data_list (list): Task data per task, for the matching criteria
+            
+        Returns:
+            dict or None: 'employees', 'profiles' and 'columns' (employee
+                index per task, None when it could not be placed), or None
+                when no employee is available
+        """
+        from utils.batch_assignment import solve_batch_assignment
+        from utils.vectorized_scorer import VectorizedScorer
+        
+        employees = self.employee_matcher._get_available_employees()
+        if not employees:
+            current_app.logger.warning("No available employees for batch assignment")
+            return None
+        
+        # Derive matching criteria for each task
+        profiles = [{
+            'task_type': self._determine_task_type(task_data),
+            'priority': task_data.get('priority') or 'medium',
+            'required_domain': self._determine_required_domain(task_data),
+            'required_skills': self._extract_required_skills(task_data)
+        } for task_data in task_data_list]
+        
+        scorer = VectorizedScorer(self.employee_matcher).encode(employees)
+        columns = solve_batch_assignment(
+            scorer.score_matrix(profiles),
+            scorer.task_count,
+            scorer.estimated_hours,
+            [task.estimated_hours for task in tasks]
+        )
+        
+        return {'employees': employees, 'profiles': profiles, 'columns': columns}
+    
+    def _add_batch_assignments(self, tasks, plan, assigned_by):
+        """
+        Add the planned assignments and their notification jobs without committing.
+        
+        Tasks and assignments get their ids from two flushes, however many
+        tasks there are.
+        
+        Returns:
+            list: The TaskAssignment objects added
+        """
+        if plan is None:
+            return []
+        
+        # One flush gives new tasks their ids
+        if any(task.id is None for task in tasks):
+            db.session.flush()
+        
+        assigned = []
+        notifications = []
+        for task, profile, column in zip(tasks, plan['profiles'], plan['columns']):
+            if column is None:
+                continue
+            
+            employee = plan['employees'][column]
+            assignment = TaskAssignment(
+                task_id=task.id,
+                employee_id=employee.id,
+                assigned_by=assigned_by,
+                notes=f"Assigned by batch optimal matching. "
+                      f"Task type: {profile['task_type']}, Domain: {profile['required_domain']}"
+            )
+            db.session.add(assignment)
+            task.status = 'assigned'
+            assigned.append(assignment)
+            notifications.append((assignment, employee.email, task.title, task.description))
+        
+        # One flush gives every assignment its id for the notification keys
+        db.session.flush()
+        for assignment, employee_email, task_title, task_description in notifications:
+            enqueue_assignment_email(assignment, employee_email, task_title, task_description)
+        
+        return assigned
+    
+    def _task_data(self, task):
+        """Get the matching inputs of a stored task as task data"""
+        return {
+            'title': task.title,
+            'description': task.description or '',
+            'priority': task.priority or 'medium',
+            'source': task.source or ''
+        }
+    
+    def _task_profile(self, task):
+        """Get a stored task's matching criteria"""
+        task_data = self._task_data(task)
+        return {
+            'task_type': self._determine_task_type(task_data),
+            'priority': task_data['priority'],
+            'required_domain': self._determine_required_domain(task_data),
+            'required_skills': self._extract_required_skills(task_data)
+        }
+    
     def _determine_task_type(self, task_data):
         """Determine task type from task data"""
         # Check if task type is explicitly provided
@@ -137,78 +438,82 @@ class TaskAssignmentAgent:
         if task_data.get('domain'):
             return task_data['domain']
         
-        # Infer from description or skills
-        description = task_data.get('description', '').lower()
-        title = task_data.get('title', '').lower()
-        
-        # Simple keyword-based domain detection
-        if any(keyword in description or keyword in title 
-               for keyword in ['frontend', 'ui', 'ux', 'react', 'vue', 'angular']):
-            return 'frontend'
-        elif any(keyword in description or keyword in title 
-                for keyword in ['backend', 'api', 'database', 'server']):
-            return 'backend'
-        elif any(keyword in description or keyword in title 
-                for keyword in ['devops', 'deployment', 'infrastructure', 'docker']):
-            return 'devops'
-        elif any(keyword in description or keyword in title 
-                for keyword in ['mobile', 'ios', 'android', 'app']):
-            return 'mobile'
-        elif any(keyword in description or keyword in title 
-                for keyword in ['data', 'analytics', 'machine learning', 'ai']):
-            return 'data'
-        elif any(keyword in description or keyword in title 
-                for keyword in ['security', 'auth', 'encryption']):
-            return 'security'
-        elif any(keyword in description or keyword in title 
-                for keyword in ['test', 'qa', 'testing']):
-            return 'qa'
-        elif any(keyword in description or keyword in title 
-                for keyword in ['design', 'figma', 'photoshop']):
-            return 'design'
-        else:
-            return 'general'
+        # Infer from the best-scoring domain keywords in title and description
+        return domain_classifier.best_domain(
+            task_data.get('title', ''),
+            task_data.get('description', ''),
+            'general'
+        )
     
     def _extract_required_skills(self, task_data):
-        """Extract required skills from task data"""
+        """
+        Get the task's required skills: the ones given, or else the known
+        skills mentioned in its title and description (see SkillExtractor).
+        
+        Returns:
+            list or None: Required skills, or None to let the matcher use
+                domain-based matching
+        """
         if task_data.get('required_skills'):
             return task_data['required_skills']
         
-        # Could implement skill extraction from description using NLP
-        # For now, return None to let the matcher use domain-based matching
-        return None
+        try:
+            return skill_extractor.extract(
+                task_data.get('title', ''), task_data.get('description', '')
+            ) or None
+        except Exception as e:
+            current_app.logger.error(f"Skill extraction failed: {str(e)}")
+            return None
     
-    def _fallback_autogen_assignment(self, task, task_data):
-        """Fallback to AutoGen-based assignment if intelligent matching fails"""
+    def _fallback_autogen_assignment(self, task, task_type, required_domain, required_skills):
+        """
+        Fallback to AutoGen-based assignment if intelligent matching fails.
+        
+        Only the matcher's top AUTOGEN_SHORTLIST_SIZE candidates are sent to
+        the agents, ranked without the task's capacity constraints, and the
+        answer must be one of them. The chat runs under the shared
+        autogen_fallback limits: a cached answer for the same task content
+        and shortlist is reused, busy slots or a missed deadline give
+        no recommendation, and the task is then left unassigned.
+        
+        Adds the task and the recommended assignment to the session without
+        committing. The task is left out of the session until the agents
+        have answered, so no write transaction is held open during the chat.
+        """
         try:
-            # Get available employees
-            employees = Employee.query.filter_by(availability=True).all()
+            shortlist = self.employee_matcher.get_employee_recommendations(
+                task_type=task_type,
+                priority=task.priority,
+                required_domain=required_domain,
+                required_skills=required_skills,
+                limit=current_app.config.get('AUTOGEN_SHORTLIST_SIZE', 5)
+            )
             
-            if not employees:
+            if not shortlist:
                 return None
             
-            # Prepare employee data for AutoGen
+            # Prepare the shortlisted candidates for AutoGen
             employee_data = []
-            for emp in employees:
+            for emp, score in shortlist:
                 emp_info = {
                     'id': emp.id,
                     'name': emp.name,
-                    'email': emp.email,
                     'department': emp.department,
                     'skills': emp.skills,
-                    'current_tasks': len(emp.task_assignments)
+                    'current_tasks': (emp.current_workload or {}).get('task_count'),
+                    'match_score': round(score, 1)
                 }
                 employee_data.append(emp_info)
             
             # Create analysis prompt
             analysis_prompt = f"""
-            Analyze the following task and available employees to determine the best assignment:
+            Analyze the following task and candidate employees to determine the best assignment:
             
             Task: {task.title}
             Description: {task.description}
             Priority: {task.priority}
             
-            Available Employees: {json.dumps(employee_data, indent=2)}
+            Candidate Employees: {json.dumps(employee_data, indent=2)}
             
             Consider:
             1. Skills match between task requirements and employee skills
@@ -220,45 +525,45 @@ class TaskAssignmentAgent:
             Return the employee_id in your response.
             """
             
-            # Run agent conversation
-            chat_result = self.user_proxy.initiate_chat(
-                self.manager_agent,
-                message=analysis_prompt
-            )
-            
-            # Extract recommendation from chat
-            recommendation = self._extract_recommendation(chat_result)
-            
-            if recommendation and recommendation.get('employee_id'):
-                # Create assignment
-                assignment = TaskAssignment(
-                    task_id=task.id,
-                    employee_id=recommendation['employee_id'],
-                    assigned_by='AutoGen Fallback',
-                    notes=recommendation.get('reasoning', '')
+            def chat():
+                # Runs on a fallback pool thread, with its own agents
+                manager_agent, user_proxy = self._get_autogen_agents()
+                chat_result = user_proxy.initiate_chat(
+                    manager_agent,
+                    message=analysis_prompt
                 )
-                db.session.add(assignment)
-                
-                # Update task status
-                task.status = 'assigned'
-                db.session.commit()
-                
-                # Send notification
-                employee = Employee.query.get(recommendation['employee_id'])
-                if employee:
-                    self.email_service.send_task_assignment_notification(
-                        employee.email,
-                        task.title,
-                        task.description
-                    )
-                
-                return assignment
+                return self._extract_recommendation(chat_result), chat_result
             
-            return None
+            # Answers are reused while the task and its shortlisted candidates are unchanged
+            recommendation = autogen_fallback.recommend(
+                task_content_key(task.title, task.description, task.priority, [emp for emp, _ in shortlist]),
+                chat
+            )
             
         except Exception as e:
             current_app.logger.error(f"AutoGen fallback assignment failed: {str(e)}")
             return None
+        
+        if not recommendation or not recommendation.get('employee_id'):
+            return None
+        
+        candidates = {emp.id: emp for emp, _ in shortlist}
+        employee = candidates.get(recommendation['employee_id'])
+        if employee is None:
+            current_app.logger.warning(
+                f"AutoGen recommended employee {recommendation['employee_id']}, "
+                f"who wasn't shortlisted for task '{task.title}'"
+            )
+            return None
+        
+        # Added to the caller's transaction, which commits it with the task
+        return self._add_assignment(
+            task,
+            employee.id,
+            employee.email,
+            assigned_by='AutoGen Fallback',
+            notes=recommendation.get('reasoning', '')
+        )
     
     def _extract_recommendation(self, chat_result):
         """Extract assignment recommendation from agent conversation"""
@@ -307,31 +612,53 @@ class TaskAssignmentAgent:
             current_app.logger.error(f"Failed to get recommendations: {str(e)}")
             return []
     
-    def optimize_workload(self):
-        """Optimize workload distribution across employees"""
+    def optimize_workload(self, apply=False, max_moves=None):
+        """
+        Rebalance work from overloaded to underloaded employees.
+        
+        Plans a bounded set of moves of low-priority open tasks to qualified
+        employees with spare capacity (see WorkloadRebalancer), and carries
+        them out in one transaction when apply is set.
+        
+        Args:
+            apply (bool): Reassign the planned tasks; otherwise a dry run
+            max_moves (int): Most tasks to move (default
+                WORKLOAD_REBALANCE_MAX_MOVES)
+            
+        Returns:
+            dict: The plan (see WorkloadRebalancer.plan) plus 'applied', the
+                number of tasks moved, and 'skipped', moves that were no
+                longer valid; an empty dict on failure
+        """
+        from utils.workload_rebalancer import WorkloadRebalancer
+        
         try:
-            # Get current assignments
-            assignments = TaskAssignment.query.filter_by(status='assigned').all()
-            
-            # Analyze workload distribution
-            workload_data = {}
-            for assignment in assignments:
-                emp_id = assignment.employee_id
-                if emp_id not in workload_data:
-                    workload_data[emp_id] = 0
-                workload_data[emp_id] += 1
-            
-            # Find overloaded employees
-            avg_workload = sum(workload_data.values()) / len(workload_data) if workload_data else 0
-            overloaded = [emp_id for emp_id, count in workload_data.items() 
-                         if count > avg_workload * 1.5]
-            
-            if overloaded:
-                current_app.logger.info(f"Found overloaded employees: {overloaded}")
-                # Here you could implement workload rebalancing logic
-                
-            return workload_data
+            config = current_app.config
+            rebalancer = WorkloadRebalancer(
+                self.employee_matcher,
+                self._task_profile,
+                overload_ratio=config.get('WORKLOAD_REBALANCE_OVERLOAD_RATIO', 1.5),
+                min_score_ratio=config.get('WORKLOAD_REBALANCE_MIN_SCORE_RATIO', 0.9),
+                max_moves=config.get('WORKLOAD_REBALANCE_MAX_MOVES', 50)
+            )
+            plan = rebalancer.plan(max_moves)
+            plan['applied'] = 0
+            plan['skipped'] = []
+            
+            if plan['overloaded']:
+                current_app.logger.info(
+                    f"Found {len(plan['overloaded'])} overloaded employees; "
+                    f"{len(plan['moves'])} moves planned"
+                )
+            
+            if apply and plan['moves']:
+                result = rebalancer.apply(plan)
+                plan['applied'] = len(result['applied'])
+                plan['skipped'] = result['skipped']
+            
+            return plan
             
         except Exception as e:
+            db.session.rollback()
             current_app.logger.error(f"Workload optimization failed: {str(e)}")
-            return {} 
\ No newline at end of file
+            return {}
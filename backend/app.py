@@ -9,6 +9,17 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.config import config
 from models.database import db
+from utils.workload_ledger import workload_ledger
+from utils.roster_events import roster_version
+from utils.ranking_cache import ranking_cache
+from utils.skill_index import skill_index
+from utils.candidate_filter import candidate_filter
+from utils.capacity_timeline import capacity_timeline
+from utils.matcher_daemon import daemon_notifier
+from utils.side_effects import side_effect_queue
+from utils.domain_classifier import domain_classifier
+from utils.skill_extractor import skill_extractor
+from utils.autogen_fallback import autogen_fallback
 from utils.slack_service import SlackService
 from utils.jira_service import JiraService
 from utils.email_service import EmailService
@@ -24,14 +35,32 @@ def create_app(config_name='default'):
     
     # Initialize extensions
     db.init_app(app)
+    workload_ledger.init_app(app)
+    roster_version.init_app(app)
+    ranking_cache.init_app(app)
+    skill_index.init_app(app)
+    candidate_filter.init_app(app)
+    capacity_timeline.init_app(app)
+    daemon_notifier.init_app(app)
+    side_effect_queue.init_app(app)
+    domain_classifier.init_app(app)
+    skill_extractor.init_app(app)
+    autogen_fallback.init_app(app)
+    
+    # Start from the persisted matcher indexes instead of rebuilding them on first use
+    if app.config.get('MATCHER_INDEX_SNAPSHOT_DIR'):
+        from utils.index_snapshot import load_snapshot
+        with app.app_context():
+            load_snapshot(app.config['MATCHER_INDEX_SNAPSHOT_DIR'])
     CORS(app)
     Migrate(app, db)
     
-    # Initialize services
-    slack_service = SlackService()
-    jira_service = JiraService()
-    email_service = EmailService()
-    task_agent = TaskAssignmentAgent()
+    # Initialize services; they read their credentials from the app config
+    with app.app_context():
+        slack_service = SlackService()
+        jira_service = JiraService()
+        email_service = EmailService()
+        task_agent = TaskAssignmentAgent()
     
     # Register blueprints
     from backend.routes import api_bp, web_bp
@@ -1,11 +1,25 @@
 from flask import Blueprint, request, jsonify, render_template, current_app
-from models.database import db, Employee, Task, TaskAssignment, Notification
+from models.database import db, Employee, Task, TaskAssignment, Notification, SideEffectJob
 from utils.email_service import EmailService
 from utils.jira_service import JiraService
 from utils.slack_service import SlackService
+from utils.skill_index import skill_index
+from utils.skills import skill_cache
+from utils.static_scores import static_score_table
+from utils.workload_ledger import workload_ledger
+from utils.ranking_cache import ranking_cache, ranking_signature, MISS
+from utils.candidate_filter import candidate_filter, normalize_constraints
+from utils.capacity_timeline import capacity_timeline
+from utils.domain_classifier import domain_classifier
+from utils.skill_extractor import skill_extractor
+from utils.autogen_fallback import autogen_fallback
+from utils.side_effects import (
+    side_effect_queue, enqueue_assignment_email, assignment_email_key, job_for_key, JOB_STATUSES
+)
 from agents.task_assignment_agent import TaskAssignmentAgent
 from datetime import datetime
 import json
+import math
 
 # Create blueprints
 api_bp = Blueprint('api', __name__)
@@ -51,6 +65,7 @@ def create_employee():
         )
         db.session.add(employee)
         db.session.commit()
+        skill_index.update_employee(employee.id, employee.skills)
         return jsonify({'id': employee.id, 'message': 'Employee created'}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 400
@@ -72,7 +87,7 @@ def get_tasks():
                 'employee_id': ass.employee_id,
                 'employee_name': ass.employee.name,
                 'status': ass.status
-            } for ass in task.assignments]
+            } for ass in task.task_assignments]
         } for task in tasks])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -90,10 +105,8 @@ def create_task():
             source=data.get('source', 'manual'),
             created_by=data.get('created_by', 'system')
         )
-        db.session.add(task)
-        db.session.commit()
         
-        # Auto-assign task if requested
+        # Auto-assign task if requested, committing the task with its assignment
         if data.get('auto_assign', False):
             assignment = task_agent.assign_task({
                 'title': task.title,
@@ -101,7 +114,7 @@ def create_task():
                 'priority': task.priority,
                 'source': task.source,
                 'created_by': task.created_by
-            })
+            }, task=task)
             if assignment:
                 return jsonify({
                     'id': task.id,
@@ -109,6 +122,10 @@ def create_task():
                     'assignment_id': assignment.id
                 }), 201
         
+        if task.id is None:
+            db.session.add(task)
+            db.session.commit()
+        
         return jsonify({'id': task.id, 'message': 'Task created'}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 400
@@ -136,16 +153,20 @@ def assign_task(task_id):
         
         # Update task status
         task.status = 'assigned'
-        db.session.commit()
         
-        # Send notification
-        email_service.send_task_assignment_notification(
+        # Sent by a side-effect worker once the assignment is committed
+        job = enqueue_assignment_email(
+            assignment,
             employee.email,
             task.title,
             task.description
         )
+        db.session.commit()
         
-        return jsonify({'message': 'Task assigned successfully'}), 200
+        return jsonify({
+            'message': 'Task assigned successfully',
+            'notification_job_id': job.id
+        }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
@@ -168,8 +189,10 @@ def update_task_status(task_id):
 def sync_jira():
     """Sync tasks from Jira"""
     try:
+        data = request.get_json(silent=True) or {}
         issues = jira_service.get_project_issues()
         synced_count = 0
+        synced_tasks = []
         
         for issue in issues:
             # Check if task already exists
@@ -188,9 +211,20 @@ def sync_jira():
                     created_by='jira_sync'
                 )
                 db.session.add(task)
+                synced_tasks.append(task)
                 synced_count += 1
         
         db.session.commit()
+        
+        # Assign the whole synced backlog in one optimal pass if requested
+        if data.get('auto_assign', False) and synced_tasks:
+            result = task_agent.assign_tasks_batch(synced_tasks)
+            return jsonify({
+                'message': f'Synced {synced_count} tasks from Jira',
+                'assigned': len(result['assignments']),
+                'unassigned_task_ids': [task.id for task in result['unassigned']]
+            }), 200
+        
         return jsonify({'message': f'Synced {synced_count} tasks from Jira'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -239,29 +273,58 @@ def find_best_employee():
             if field not in data:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        # Import the employee matcher
-        from utils.employee_matcher import find_best_employee_for_task
-        
-        # Find best employee
-        best_employee = find_best_employee_for_task(
-            task_type=data['task_type'],
-            priority=data['priority'],
-            required_domain=data['required_domain'],
-            estimated_hours=data.get('estimated_hours'),
-            due_date=data.get('due_date'),
-            required_skills=data.get('required_skills')
-        )
-        
-        if best_employee:
-            return jsonify({
-                'success': True,
-                'employee': {
+        estimated_hours = data.get('estimated_hours')
+        if estimated_hours is not None:
+            try:
+                estimated_hours = float(estimated_hours)
+            except (TypeError, ValueError):
+                estimated_hours = math.nan
+            if not math.isfinite(estimated_hours):
+                return jsonify({'error': 'estimated_hours must be a number'}), 400
+        
+        try:
+            constraints = normalize_constraints(data.get('constraints'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Identical requests share a ranking until the roster changes
+        cache_key = ranking_signature(
+            data['task_type'], data['priority'], data['required_domain'], data.get('required_skills')
+        ) + ('best', constraints, estimated_hours, data.get('due_date'))
+        employee = ranking_cache.get(cache_key)
+        
+        if employee is MISS:
+            # Import the employee matcher
+            from utils.employee_matcher import find_best_employee_for_task
+            
+            version = ranking_cache.current_version()
+            
+            # Find best employee
+            best_employee = find_best_employee_for_task(
+                task_type=data['task_type'],
+                priority=data['priority'],
+                required_domain=data['required_domain'],
+                estimated_hours=estimated_hours,
+                due_date=data.get('due_date'),
+                required_skills=data.get('required_skills'),
+                constraints=dict(constraints)
+            )
+            
+            employee = None
+            if best_employee:
+                employee = {
                     'id': best_employee.id,
                     'name': best_employee.name,
                     'email': best_employee.email,
                     'department': best_employee.department,
                     'skills': best_employee.skills
                 }
+            ranking_cache.put(cache_key, employee, version)
+        
+        if employee:
+            return jsonify({
+                'success': True,
+                'employee': employee
             })
         else:
             return jsonify({
@@ -288,29 +351,64 @@ def get_employee_recommendations():
             if field not in data:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        # Import the employee matcher
-        from utils.employee_matcher import EmployeeMatcher
-        
-        matcher = EmployeeMatcher()
-        recommendations = matcher.get_employee_recommendations(
-            task_type=data['task_type'],
-            priority=data['priority'],
-            required_domain=data['required_domain'],
-            required_skills=data.get('required_skills'),
-            limit=data.get('limit', 5)
-        )
-        
-        # Format recommendations
-        formatted_recommendations = []
-        for employee, score in recommendations:
-            formatted_recommendations.append({
-                'id': employee.id,
-                'name': employee.name,
-                'email': employee.email,
-                'department': employee.department,
-                'skills': employee.skills,
-                'score': round(score, 2)
-            })
+        # Coerced, so "5" and 5 share a cache entry
+        try:
+            limit = int(data.get('limit', 5))
+        except (TypeError, ValueError):
+            limit = 0
+        if limit < 1:
+            return jsonify({'error': 'limit must be a positive integer'}), 400
+        
+        estimated_hours = data.get('estimated_hours')
+        if estimated_hours is not None:
+            try:
+                estimated_hours = float(estimated_hours)
+            except (TypeError, ValueError):
+                estimated_hours = math.nan
+            if not math.isfinite(estimated_hours):
+                return jsonify({'error': 'estimated_hours must be a number'}), 400
+        
+        try:
+            constraints = normalize_constraints(data.get('constraints'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Identical requests share a ranking until the roster changes
+        cache_key = ranking_signature(
+            data['task_type'], data['priority'], data['required_domain'], data.get('required_skills')
+        ) + ('recommendations', limit, constraints, estimated_hours, data.get('due_date'))
+        formatted_recommendations = ranking_cache.get(cache_key)
+        
+        if formatted_recommendations is MISS:
+            # Import the employee matcher
+            from utils.employee_matcher import EmployeeMatcher
+            
+            version = ranking_cache.current_version()
+            
+            matcher = EmployeeMatcher()
+            recommendations = matcher.get_employee_recommendations(
+                task_type=data['task_type'],
+                priority=data['priority'],
+                required_domain=data['required_domain'],
+                required_skills=data.get('required_skills'),
+                limit=limit,
+                constraints=dict(constraints),
+                estimated_hours=estimated_hours,
+                due_date=data.get('due_date')
+            )
+            
+            # Format recommendations
+            formatted_recommendations = []
+            for employee, score in recommendations:
+                formatted_recommendations.append({
+                    'id': employee.id,
+                    'name': employee.name,
+                    'email': employee.email,
+                    'department': employee.department,
+                    'skills': employee.skills,
+                    'score': round(score, 2)
+                })
+            ranking_cache.put(cache_key, formatted_recommendations, version)
         
         return jsonify({
             'success': True,
@@ -322,6 +420,30 @@ def get_employee_recommendations():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@api_bp.route('/api/employee-matching/cache-stats', methods=['GET'])
+def get_matcher_cache_stats():
+    """Get hit/miss counters for the employee matcher caches"""
+    try:
+        return jsonify({
+            'success': True,
+            'caches': {
+                'parsed_skills': skill_cache.stats(),
+                'static_scores': static_score_table.stats(),
+                'workload_ledger': workload_ledger.stats(),
+                'rankings': ranking_cache.stats(),
+                'skill_index': skill_index.stats(),
+                'candidate_filter': candidate_filter.stats(),
+                'capacity_timeline': capacity_timeline.stats(),
+                'domain_rules': domain_classifier.stats(),
+                'skill_extractor': skill_extractor.stats(),
+                'autogen_fallback': autogen_fallback.stats()
+            }
+        })
+    except Exception as e:
+        current_app.logger.error(f"Error getting matcher cache stats: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @api_bp.route('/api/employee-matching/assign-task', methods=['POST'])
 def assign_task_with_matching():
     """Assign a task using intelligent employee matching"""
@@ -362,9 +484,11 @@ def assign_task_with_matching():
             # Get employee details
             employee = Employee.query.get(assignment.employee_id)
             task = Task.query.get(assignment.task_id)
+            notification_job = job_for_key(assignment_email_key(assignment.id))
             
             return jsonify({
                 'success': True,
+                'notification_job_id': notification_job.id if notification_job else None,
                 'assignment': {
                     'id': assignment.id,
                     'task_id': assignment.task_id,
@@ -398,6 +522,150 @@ def assign_task_with_matching():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@api_bp.route('/api/tasks/batch-assign', methods=['POST'])
+def batch_assign_tasks():
+    """Assign many open tasks with capacity-constrained optimal matching"""
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        task_ids = data.get('task_ids')
+        if task_ids is not None and (
+                not isinstance(task_ids, list) or not all(isinstance(task_id, int) for task_id in task_ids)):
+            return jsonify({'error': 'task_ids must be a list of task ids'}), 400
+        
+        # Default to every open task without an assignment; requested tasks
+        # that are closed or already assigned are rejected, not reassigned
+        tasks = task_agent.open_tasks(task_ids or None)
+        rejected_task_ids = sorted(set(task_ids or ()) - {task.id for task in tasks})
+        
+        if not tasks:
+            return jsonify({
+                'success': True,
+                'assignments': [],
+                'unassigned_task_ids': [],
+                'rejected_task_ids': rejected_task_ids
+            })
+        
+        result = task_agent.assign_tasks_batch(tasks)
+        
+        return jsonify({
+            'success': True,
+            'assignments': [{
+                'id': assignment.id,
+                'task_id': assignment.task_id,
+                'employee_id': assignment.employee_id
+            } for assignment in result['assignments']],
+            'unassigned_task_ids': [task.id for task in result['unassigned']],
+            'rejected_task_ids': rejected_task_ids
+        })
+        
+    except Exception as e:
+        current_app.logger.error(f"Error in batch assignment: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@api_bp.route('/api/workload/rebalance', methods=['POST'])
+def rebalance_workload():
+    """Plan, and optionally apply, moves from overloaded to underloaded employees"""
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        max_moves = data.get('max_moves')
+        if max_moves is not None and (not isinstance(max_moves, int) or max_moves < 0):
+            return jsonify({'error': 'max_moves must be a non-negative integer'}), 400
+        
+        plan = task_agent.optimize_workload(apply=bool(data.get('apply')), max_moves=max_moves)
+        if not plan:
+            return jsonify({'error': 'Workload rebalancing failed'}), 500
+        
+        return jsonify({'success': True, 'dry_run': not data.get('apply'), **plan})
+        
+    except Exception as e:
+        current_app.logger.error(f"Error rebalancing workload: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@api_bp.route('/api/tasks/bulk', methods=['POST'])
+def bulk_create_tasks():
+    """Create and assign a list of tasks in one transaction"""
+    try:
+        data = request.get_json(silent=True) or {}
+        payloads = data.get('tasks')
+        
+        if not isinstance(payloads, list) or not payloads:
+            return jsonify({'error': 'tasks must be a non-empty list'}), 400
+        if any(not isinstance(payload, dict) or not payload.get('title') for payload in payloads):
+            return jsonify({'error': 'Every task needs a title'}), 400
+        
+        result = task_agent.ingest_tasks(payloads)
+        if not result['tasks']:
+            return jsonify({'error': 'Tasks could not be created'}), 500
+        
+        return jsonify({
+            'success': True,
+            'task_ids': [task.id for task in result['tasks']],
+            'assignments': [{
+                'id': assignment.id,
+                'task_id': assignment.task_id,
+                'employee_id': assignment.employee_id
+            } for assignment in result['assignments']],
+            'unassigned_task_ids': [task.id for task in result['unassigned']]
+        }), 201
+        
+    except Exception as e:
+        current_app.logger.error(f"Error in bulk task creation: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@api_bp.route('/api/jobs', methods=['GET'])
+def get_side_effect_jobs():
+    """List side-effect jobs, newest first, with counts per status"""
+    try:
+        status = request.args.get('status')
+        if status and status not in JOB_STATUSES:
+            return jsonify({'error': f"Status must be one of: {', '.join(JOB_STATUSES)}"}), 400
+        
+        query = SideEffectJob.query
+        if status:
+            query = query.filter_by(status=status)
+        if request.args.get('kind'):
+            query = query.filter_by(kind=request.args['kind'])
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        
+        return jsonify({
+            'success': True,
+            'jobs': [job.to_dict() for job in query.order_by(SideEffectJob.id.desc()).limit(limit)],
+            'stats': side_effect_queue.stats()
+        })
+        
+    except Exception as e:
+        current_app.logger.error(f"Error listing side-effect jobs: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@api_bp.route('/api/jobs/<int:job_id>', methods=['GET'])
+def get_side_effect_job(job_id):
+    """Get the status of a side-effect job"""
+    job = db.session.get(SideEffectJob, job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+
+@api_bp.route('/api/jobs/<int:job_id>/retry', methods=['POST'])
+def retry_side_effect_job(job_id):
+    """Queue a failed side-effect job again"""
+    try:
+        job = side_effect_queue.retry(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify({'success': True, 'job': job.to_dict()})
+        
+    except Exception as e:
+        current_app.logger.error(f"Error retrying side-effect job: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @api_bp.route('/api/jira/create-ticket', methods=['POST'])
 def create_jira_ticket_api():
     """Create a Jira ticket via API"""
@@ -739,6 +1007,7 @@ def create_employee():
         
         db.session.add(employee)
         db.session.commit()
+        skill_index.update_employee(employee.id, employee.skills)
         
         return jsonify({
             'success': True,
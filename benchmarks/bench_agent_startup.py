@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Startup time and memory of a worker constructing TaskAssignmentAgent.
+
+Each scenario runs in a fresh interpreter, as a newly started web worker
+would: it imports the agent module, creates an app and constructs the
+agent. 'no fallback' stops there, as a worker that only ever assigns
+through the employee matcher does. 'fallback built' also builds the AutoGen
+agents, which every worker used to pay for at construction. Wall time from
+interpreter start and peak RSS are reported as the median of several runs.
+
+Usage:
+    python -m benchmarks.bench_agent_startup --runs 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+SCENARIO = """
+import json, resource, sys, time
+started = time.perf_counter()
+from agents.task_assignment_agent import TaskAssignmentAgent
+from benchmarks.bench_matcher import create_app
+
+app = create_app('sqlite://')
+with app.app_context():
+    agent = TaskAssignmentAgent()
+    if {build_fallback}:
+        agent._get_autogen_agents()
+
+print(json.dumps({{
+    'seconds': time.perf_counter() - started,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'autogen_imported': 'autogen' in sys.modules
+}}))
+"""
+
+SCENARIOS = (
+    ('no fallback', False),
+    ('fallback built', True),
+)
+
+
+def run(build_fallback):
+    output = subprocess.check_output(
+        [sys.executable, '-c', SCENARIO.format(build_fallback=build_fallback)], text=True
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure TaskAssignmentAgent startup cost")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<16} {'startup ms':>11} {'max RSS MB':>11} {'autogen imported':>17}")
+    results = {}
+    for name, build_fallback in SCENARIOS:
+        samples = [run(build_fallback) for _ in range(args.runs)]
+        results[name] = {
+            'seconds': statistics.median(sample['seconds'] for sample in samples),
+            'max_rss_mb': statistics.median(sample['max_rss_mb'] for sample in samples)
+        }
+        print(f"{name:<16} {results[name]['seconds'] * 1000:>11.0f} {results[name]['max_rss_mb']:>11.1f} "
+              f"{str(samples[0]['autogen_imported']):>17}")
+
+    lazy, eager = results['no fallback'], results['fallback built']
+    print(f"\nWorkers that never fall back save {(eager['seconds'] - lazy['seconds']) * 1000:.0f}ms "
+          f"and {eager['max_rss_mb'] - lazy['max_rss_mb']:.1f}MB each")
+
+
+if __name__ == "__main__":
+    main()
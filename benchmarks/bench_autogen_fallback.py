@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the AutoGen fallback under a slow LLM.
+
+The AutoGen agents are replaced with a fake whose chat sleeps for
+--latency seconds and answers with the first candidate in its prompt, so
+the benchmark never leaves the process. A burst of fallback requests is
+sent from --concurrency request threads through:
+
+- the previous fallback, which serialized every available employee (with a
+  lazy load of each one's assignments) and waited for the chat
+  synchronously, holding its pooled connection throughout, so a burst
+  beyond the pool size (15 by default) fails;
+- the bounded fallback, with a shortlist, a deadline and a concurrency cap;
+- the bounded fallback again for the same tasks after a roster write,
+  answered from the cache.
+
+For each it reports request latency, the most chats running at once, LLM
+calls, prompt size and tokens, and how many tasks got a recommendation.
+
+Usage:
+    python -m benchmarks.bench_autogen_fallback --employees 2000 --requests 32 \\
+        --concurrency 12 --latency 2 --timeout 0.5
+"""
+
+import argparse
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from models.database import db, Employee, Task
+from agents.task_assignment_agent import TaskAssignmentAgent
+from utils.autogen_fallback import autogen_fallback
+from utils.roster_events import roster_version
+from benchmarks.bench_matcher import create_app, percentile
+from benchmarks.synthetic_org import generate_org, make_task_requests
+
+
+class SlowLLM:
+    """Stand-in for the AutoGen agents that takes `latency` seconds per chat"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+        self.prompt_chars = 0
+
+    def agents(self):
+        return None, self
+
+    def reset(self):
+        with self.lock:
+            self.running = self.peak = self.calls = self.prompt_chars = 0
+
+    def initiate_chat(self, manager_agent, message):
+        with self.lock:
+            self.running += 1
+            self.calls += 1
+            self.prompt_chars += len(message)
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+        match = re.search(r'"id": (\d+)', message)
+        content = f"employee_id: {match.group(1)} TERMINATE" if match else "TERMINATE"
+        return SimpleNamespace(
+            chat_history=[{'name': 'TaskManager', 'content': content}],
+            cost={'usage_including_cached_inference': {
+                'total_cost': 0.0,
+                'gpt-3.5-turbo': {'prompt_tokens': len(message) // 4, 'completion_tokens': 12}
+            }}
+        )
+
+
+def legacy_fallback(agent, task):
+    """The fallback before the shortlist and limits, without its assignment write"""
+    employees = Employee.query.filter_by(availability=True).all()
+    employee_data = [
+        {
+            'id': emp.id,
+            'name': emp.name,
+            'email': emp.email,
+            'department': emp.department,
+            'skills': emp.skills,
+            'current_tasks': len(emp.task_assignments)
+        }
+        for emp in employees
+    ]
+    analysis_prompt = f"""
+            Task: {task.title}
+            Description: {task.description}
+            Priority: {task.priority}
+
+            Available Employees: {json.dumps(employee_data, indent=2)}
+            """
+    manager_agent, user_proxy = agent._get_autogen_agents()
+    return agent._extract_recommendation(user_proxy.initiate_chat(manager_agent, message=analysis_prompt))
+
+
+def bounded_fallback(agent, task, task_data):
+    """The current fallback; its assignment is rolled back by the caller"""
+    return agent._fallback_autogen_assignment(
+        task,
+        agent._determine_task_type(task_data),
+        agent._determine_required_domain(task_data),
+        agent._extract_required_skills(task_data)
+    )
+
+
+def burst(app, agent, requests, concurrency, fallback):
+    """
+    Send every request from `concurrency` threads at once.
+
+    Returns:
+        tuple: (request latencies in ms, number of recommendations)
+    """
+    def one(task_data):
+        with app.app_context():
+            task = agent._build_task(task_data)
+            started = time.perf_counter()
+            try:
+                result = fallback(agent, task, task_data)
+            finally:
+                elapsed = (time.perf_counter() - started) * 1000
+                db.session.rollback()
+            return elapsed, result is not None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, requests))
+    return [elapsed for elapsed, _ in results], sum(found for _, found in results)
+
+
+def wait_for_chats(timeout=60):
+    """Wait for chats that outlived their callers"""
+    deadline = time.monotonic() + timeout
+    while autogen_fallback.stats()['running'] and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the AutoGen fallback under a slow LLM")
+    parser.add_argument('--database-url', default='sqlite:///autogen_fallback.db')
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--tasks', type=int, default=20000)
+    parser.add_argument('--requests', type=int, default=32)
+    parser.add_argument('--concurrency', type=int, default=12, help='Request threads')
+    parser.add_argument('--latency', type=float, default=2.0, help='Seconds per fake LLM chat')
+    parser.add_argument('--timeout', type=float, default=0.5, help='AUTOGEN_TIMEOUT_SECONDS')
+    parser.add_argument('--max-concurrent', type=int, default=2, help='AUTOGEN_MAX_CONCURRENT')
+    parser.add_argument('--shortlist', type=int, default=5, help='AUTOGEN_SHORTLIST_SIZE')
+    args = parser.parse_args()
+
+    app = create_app(args.database_url)
+    app.config.update(
+        AUTOGEN_TIMEOUT_SECONDS=args.timeout,
+        AUTOGEN_MAX_CONCURRENT=args.max_concurrent,
+        AUTOGEN_SHORTLIST_SIZE=args.shortlist
+    )
+    roster_version.init_app(app)
+    autogen_fallback.init_app(app)
+    # Every rejected or timed-out request logs a warning
+    app.logger.setLevel(logging.ERROR)
+
+    llm = SlowLLM(args.latency)
+    agent = TaskAssignmentAgent()
+    agent._get_autogen_agents = llm.agents
+
+    with app.app_context():
+        db.create_all()
+        if not db.session.query(Employee.id).first():
+            generate_org(employees=args.employees, tasks=args.tasks)
+        available = db.session.query(Employee.id).filter(Employee.availability == True).count()
+    print(f"{available} available employees, {args.requests} fallback requests from "
+          f"{args.concurrency} threads, {args.latency}s LLM\n")
+
+    requests = make_task_requests(args.requests)
+    scenarios = (
+        ('previous fallback', lambda agent, task, task_data: legacy_fallback(agent, task)),
+        ('bounded', bounded_fallback),
+        ('bounded, repeated tasks', bounded_fallback)
+    )
+
+    print(f"{'fallback':<24} {'p50 ms':>8} {'max ms':>8} {'peak chats':>11} {'LLM calls':>10} "
+          f"{'prompt chars':>13} {'answered':>9} {'cache hits':>11}")
+    for name, fallback in scenarios:
+        llm.reset()
+        if name == 'bounded, repeated tasks':
+            # Assignments committed since; the shortlists are unchanged
+            roster_version.bump()
+        hits_before = autogen_fallback.cache_hits
+        started = time.perf_counter()
+        latencies, answered = burst(app, agent, requests, args.concurrency, fallback)
+        wall = time.perf_counter() - started
+        wait_for_chats()
+
+        prompt_chars = llm.prompt_chars // llm.calls if llm.calls else 0
+        print(f"{name:<24} {percentile(latencies, 50):>8.0f} {max(latencies):>8.0f} {llm.peak:>11} "
+              f"{llm.calls:>10} {prompt_chars:>13} {answered:>9} "
+              f"{autogen_fallback.cache_hits - hits_before:>11}   ({wall:.1f}s wall)")
+
+    stats = autogen_fallback.stats()
+    print(f"\nbounded totals: {stats['chats']} chats, {stats['rejected']} rejected, "
+          f"{stats['timeouts']} timed out, avg chat {stats['avg_latency_ms']} ms, "
+          f"{stats['prompt_tokens']} prompt + {stats['completion_tokens']} completion tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the due-date-aware capacity timeline.
+
+Fills a synthetic organization with the given number of concurrent
+(assigned or accepted) tasks spread over the coming weeks, then reports how
+long the timeline takes to build, to refresh after a batch of reassignments,
+and to answer "hours booked before this due date" for every employee. The
+answers are checked against a direct walk over the reservations.
+
+Usage:
+    python -m benchmarks.bench_capacity_timeline --employees 10000 --active-tasks 50000
+"""
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+from models.database import db, Employee, Task, TaskAssignment
+from utils.capacity_timeline import capacity_timeline, working_day
+from benchmarks.bench_matcher import create_app
+from benchmarks.bench_sharded_scoring import best_of
+
+
+def fill(employees, active_tasks, seed=7):
+    """Add employees and active tasks due over the next 8 weeks"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    db.session.bulk_insert_mappings(Employee, [
+        {'name': f'Employee {i}', 'email': f'employee{i}@example.com', 'availability': True}
+        for i in range(employees)
+    ])
+    employee_ids = [employee_id for employee_id, in db.session.query(Employee.id)]
+
+    db.session.bulk_insert_mappings(Task, [
+        {
+            'title': f'Task {i}',
+            'estimated_hours': rng.choice([1, 2, 4, 8, 16, 24]),
+            'due_date': now + timedelta(days=rng.randint(-3, 56)) if rng.random() < 0.9 else None
+        }
+        for i in range(active_tasks)
+    ])
+    task_ids = [task_id for task_id, in db.session.query(Task.id)]
+    db.session.bulk_insert_mappings(TaskAssignment, [
+        {
+            'task_id': task_id,
+            'employee_id': rng.choice(employee_ids),
+            'assigned_at': now - timedelta(days=rng.randint(0, 14)),
+            'status': 'assigned'
+        }
+        for task_id in task_ids
+    ])
+    db.session.commit()
+    return employee_ids
+
+
+def walk(employee_ids, due_on):
+    """Booked hours per employee before a due date, straight from the reservations"""
+    origin = working_day(date.today())
+    days = min(max(working_day(due_on + timedelta(days=1)) - origin, 1), capacity_timeline.horizon_days)
+    wanted = set(employee_ids)
+    booked = dict.fromkeys(employee_ids, 0.0)
+
+    rows = db.session.query(
+        TaskAssignment.employee_id, TaskAssignment.assigned_at, Task.estimated_hours, Task.due_date
+    ).join(Task, Task.id == TaskAssignment.task_id).filter(
+        TaskAssignment.status.in_(('assigned', 'accepted')), Task.estimated_hours > 0
+    )
+    for employee_id, assigned_at, hours, due_date in rows:
+        if employee_id not in wanted:
+            continue
+        start = working_day(assigned_at.date())
+        end = working_day(due_date.date() + timedelta(days=1)) if due_date else start + capacity_timeline.default_task_days
+        end = max(end, start + 1)
+        if end <= origin:
+            booked[employee_id] += hours
+            continue
+        overlap = min(end, origin + days) - max(start, origin)
+        booked[employee_id] += hours * max(overlap, 0) / (end - start)
+    return [booked[employee_id] for employee_id in employee_ids]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the capacity timeline")
+    parser.add_argument('--database-url', default='sqlite:///capacity_timeline.db')
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--active-tasks', type=int, default=50000)
+    parser.add_argument('--reassigned', type=int, default=200,
+                        help='Assignments moved between refreshes')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app(args.database_url)
+    app.config['CAPACITY_TIMELINE_ENABLED'] = True
+    capacity_timeline.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        if not db.session.query(Employee.id).first():
+            fill(args.employees, args.active_tasks)
+        employee_ids = [employee_id for employee_id, in db.session.query(Employee.id)]
+        active = db.session.query(TaskAssignment.id).filter(TaskAssignment.status == 'assigned').count()
+        print(f"{len(employee_ids)} employees, {active} active assignments\n")
+
+        build_ms, _ = best_of(capacity_timeline.rebuild, args.repeat)
+
+        rng = random.Random(11)
+        assignments = db.session.query(TaskAssignment).limit(args.reassigned * 10).all()
+        for assignment in rng.sample(assignments, min(args.reassigned, len(assignments))):
+            assignment.employee_id = rng.choice(employee_ids)
+        db.session.commit()
+        started = time.perf_counter()
+        capacity_timeline.ensure_loaded()
+        refresh_ms = (time.perf_counter() - started) * 1000
+
+        print(f"{'operation':<36} {'ms':>10}")
+        print(f"{'build':<36} {build_ms:>10.1f}")
+        print(f"{f'refresh after {args.reassigned} reassignments':<36} {refresh_ms:>10.1f}")
+
+        for weeks in (1, 4, 12):
+            due_on = date.today() + timedelta(weeks=weeks)
+            query_ms, (booked, capacity) = best_of(
+                lambda: capacity_timeline.reserved_hours(employee_ids, due_on), args.repeat
+            )
+            walk_ms, expected = best_of(lambda: walk(employee_ids, due_on), 1)
+            assert all(abs(a - b) < 1e-6 for a, b in zip(booked.tolist(), expected)), \
+                "timeline differs from the reservations"
+            print(f"{f'query all, due in {weeks} weeks':<36} {query_ms:>10.2f}  "
+                  f"(walk {walk_ms:.0f}ms, {capacity:.0f}h capacity)")
+
+    print("\nTimeline answers identical to walking the reservations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Accuracy and throughput of task domain detection.
+
+Classifies a labeled sample of task titles and descriptions
+(benchmarks/domain_sample.jsonl by default) with the previous keyword chain,
+which took the first domain with any keyword occurring as a substring of
+either text, and with the rule-compiled DomainClassifier. Reports accuracy,
+the sample's misclassifications, and tasks classified per second on the
+sample and on long descriptions.
+
+Usage:
+    python -m benchmarks.bench_domain_classifier --rules config/domain_rules.json
+"""
+
+import argparse
+import json
+import os
+import timeit
+from utils.domain_classifier import DomainClassifier, DEFAULT_RULES_PATH
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'domain_sample.jsonl')
+
+# Domain keywords of the previous chain, checked in this order
+LEGACY_DOMAIN_KEYWORDS = {
+    'frontend': ['frontend', 'ui', 'ux', 'react', 'vue', 'angular'],
+    'backend': ['backend', 'api', 'database', 'server'],
+    'devops': ['devops', 'deployment', 'infrastructure', 'docker'],
+    'mobile': ['mobile', 'ios', 'android', 'app'],
+    'data': ['data', 'analytics', 'machine learning', 'ai'],
+    'security': ['security', 'auth', 'encryption'],
+    'qa': ['test', 'qa', 'testing'],
+    'design': ['design', 'figma', 'photoshop']
+}
+
+
+def legacy_domain(title, description):
+    """Domain detection before the classifier"""
+    title = title.lower()
+    description = description.lower()
+    for domain, keywords in LEGACY_DOMAIN_KEYWORDS.items():
+        if any(keyword in description or keyword in title for keyword in keywords):
+            return domain
+    return 'general'
+
+
+def load_sample(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def tasks_per_second(classify, sample, repeat=5):
+    """Best throughput over the sample"""
+    timer = timeit.Timer(lambda: [classify(task['title'], task['description']) for task in sample])
+    number, _ = timer.autorange()
+    return len(sample) * number / min(timer.repeat(repeat=repeat, number=number))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark task domain detection")
+    parser.add_argument('--rules', default=DEFAULT_RULES_PATH)
+    parser.add_argument('--sample', default=SAMPLE_PATH)
+    parser.add_argument('--show-errors', action='store_true', help='List misclassified tasks')
+    args = parser.parse_args()
+
+    sample = load_sample(args.sample)
+    classifier = DomainClassifier(args.rules)
+    classifier.best_domain('')  # load the rules
+    stats = classifier.stats()
+    print(f"{len(sample)} labeled tasks, {stats['keywords']} rule keywords in {stats['domains']} domains\n")
+
+    methods = (
+        ('keyword chain', legacy_domain),
+        ('classifier', lambda title, description: classifier.best_domain(title, description, 'general'))
+    )
+
+    long_sample = [
+        {'title': task['title'], 'description': ' '.join([task['description']] * 20)}
+        for task in sample
+    ]
+
+    print(f"{'method':<14} {'accuracy':>9} {'tasks/s':>10} {'long tasks/s':>13}")
+    for name, classify in methods:
+        errors = [
+            (task, predicted) for task in sample
+            for predicted in [classify(task['title'], task['description'])]
+            if predicted != task['domain']
+        ]
+        accuracy = 1 - len(errors) / len(sample)
+        print(f"{name:<14} {accuracy:>9.1%} {tasks_per_second(classify, sample):>10.0f} "
+              f"{tasks_per_second(classify, long_sample):>13.0f}")
+        if args.show_errors:
+            for task, predicted in errors:
+                print(f"    {task['title']!r}: expected {task['domain']}, got {predicted}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the persisted matcher index snapshot.
+
+Fills a synthetic organization, then compares a cold start (skill index and
+candidate filter built from the database, static scores computed on the
+first rankings) with a start from a memory-mapped snapshot after a number of
+employees changed since it was written. Both starts must produce the same
+rankings.
+
+Usage:
+    python -m benchmarks.bench_index_snapshot --employees 50000 --changed 500
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from models.database import db, Employee
+from utils.employee_matcher import EmployeeMatcher
+from utils.skill_index import skill_index
+from utils.candidate_filter import candidate_filter
+from utils.static_scores import static_score_table
+from utils.index_snapshot import write_snapshot, load_snapshot
+from benchmarks.bench_matcher import create_app
+from benchmarks.synthetic_org import generate_org, make_task_requests, skill_vocabulary
+
+
+def reset_indexes():
+    """Forget every in-memory index, as in a freshly started process"""
+    skill_index.is_built = False
+    candidate_filter.invalidate()
+    static_score_table.invalidate()
+
+
+def rank_all(requests):
+    matcher = EmployeeMatcher()
+    return [
+        [(employee.id, score) for employee, score in matcher.get_employee_recommendations(
+            request['task_type'], request['priority'], request['domain'],
+            request.get('required_skills'), limit=5, constraints={'max_active_tasks': 4}
+        )]
+        for request in requests
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark matcher index snapshots")
+    parser.add_argument('--database-url', default='sqlite:///synthetic_org.db')
+    parser.add_argument('--employees', type=int, default=50000)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--changed', type=int, default=500,
+                        help='Employees edited after the snapshot is written')
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--snapshot-dir', help='Snapshot directory (default: a temporary directory)')
+    args = parser.parse_args()
+
+    app = create_app(args.database_url)
+    candidate_filter.init_app(app)
+    snapshot_dir = args.snapshot_dir or tempfile.mkdtemp(prefix='matcher-index-')
+    requests = make_task_requests(args.requests)
+
+    with app.app_context():
+        db.create_all()
+        if not db.session.query(Employee.id).first():
+            generate_org(employees=args.employees, tasks=args.tasks)
+
+        # An established roster: edits spread over the past month, none in the last hour
+        rng = random.Random(7)
+        now = datetime.now()
+        employee_ids = [employee_id for employee_id, in db.session.query(Employee.id)]
+        db.session.execute(update(Employee), [
+            {'id': employee_id, 'updated_at': now - timedelta(hours=1, seconds=rng.randint(0, 30 * 86400))}
+            for employee_id in employee_ids
+        ])
+        db.session.commit()
+
+        started = time.perf_counter()
+        write_snapshot(snapshot_dir)
+        print(f"snapshot written in {time.perf_counter() - started:.2f}s to {snapshot_dir}")
+        size = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(snapshot_dir) for name in names
+        )
+        print(f"snapshot size {size / 1e6:.1f} MB\n")
+
+        # Edits made after the snapshot
+        skills = skill_vocabulary()
+        for employee in db.session.query(Employee).filter(
+                Employee.id.in_(rng.sample(employee_ids, min(args.changed, len(employee_ids))))):
+            employee.skills = ', '.join(rng.sample(skills, 4))
+        db.session.commit()
+
+        reset_indexes()
+        started = time.perf_counter()
+        skill_index.ensure_built()
+        candidate_filter.ensure_loaded()
+        cold_build = time.perf_counter() - started
+        started = time.perf_counter()
+        cold = rank_all(requests)
+        cold_rank = time.perf_counter() - started
+
+        reset_indexes()
+        started = time.perf_counter()
+        manifest = load_snapshot(snapshot_dir)
+        warm_load = time.perf_counter() - started
+        started = time.perf_counter()
+        warm = rank_all(requests)
+        warm_rank = time.perf_counter() - started
+
+        assert manifest is not None, "snapshot was not loaded"
+        assert warm == cold, "snapshot rankings differ from a cold build"
+
+    print(f"{'start':<10} {'load ms':>10} {'first rankings ms':>18}")
+    print(f"{'cold':<10} {cold_build * 1000:>10.1f} {cold_rank * 1000:>18.1f}")
+    print(f"{'snapshot':<10} {warm_load * 1000:>10.1f} {warm_rank * 1000:>18.1f}")
+    print(f"\n{args.changed} employees changed since the snapshot; rankings identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the shared keyword automaton.
+
+Compares the previous per-keyword substring scans with KeywordAutomaton on
+Slack-sized and long messages, as the keyword vocabulary grows (automaton
+walk forced on to show the crossover behind DFA_MIN_KEYWORDS), and for
+per-employee domain expertise counting.
+
+Usage:
+    python -m benchmarks.bench_keyword_automaton
+"""
+
+import random
+import timeit
+from utils.keyword_automaton import (
+    KeywordAutomaton, TASK_TYPE_KEYWORDS, PRIORITY_KEYWORDS,
+    task_type_automaton, priority_automaton
+)
+
+
+FILLER_WORDS = (
+    "hey team quick note from the standup we looked at the checkout flow "
+    "yesterday and customers keep reporting that totals look off when they "
+    "switch currencies on the summary page please take a look when you can"
+).split()
+
+
+def make_message(length, seed=7):
+    """Build a message of roughly `length` characters with a keyword near the end"""
+    rng = random.Random(seed)
+    words = []
+    while sum(len(word) + 1 for word in words) < length:
+        words.append(rng.choice(FILLER_WORDS))
+    words.append('docker outage')
+    return ' '.join(words)
+
+
+def baseline_task_type(text):
+    """Task type detection before the automaton"""
+    text_lower = text.lower()
+    for task_type, keywords in TASK_TYPE_KEYWORDS.items():
+        if any(keyword in text_lower for keyword in keywords):
+            return task_type
+    return None
+
+
+def baseline_priority(text):
+    """Priority extraction before the automaton"""
+    text_lower = text.lower()
+    if any(word in text_lower for word in PRIORITY_KEYWORDS['high']):
+        return 'high'
+    elif any(word in text_lower for word in PRIORITY_KEYWORDS['low']):
+        return 'low'
+    return 'medium'
+
+
+def baseline_pipeline(text):
+    return baseline_task_type(text), baseline_priority(text)
+
+
+def automaton_pipeline(text):
+    return (
+        task_type_automaton.first_category(text),
+        priority_automaton.first_category(text, 'medium')
+    )
+
+
+def time_call(func, *args, repeat=5):
+    """Best per-call time in microseconds"""
+    timer = timeit.Timer(lambda: func(*args))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def bench_messages():
+    print("=== Slack message classification (task type + priority) ===")
+    print(f"{'chars':>8} {'baseline us':>12} {'automaton us':>13} {'speedup':>8}")
+    for length in (200, 2000, 10000, 50000):
+        text = make_message(length)
+        assert baseline_pipeline(text) == automaton_pipeline(text)
+        before = time_call(baseline_pipeline, text)
+        after = time_call(automaton_pipeline, text)
+        print(f"{length:>8} {before:>12.1f} {after:>13.1f} {before / after:>7.2f}x")
+
+
+def bench_vocabulary_size():
+    print("\n=== Vocabulary size on a 2,000 character message ===")
+    print(f"{'keywords':>8} {'baseline us':>12} {'automaton us':>13} {'speedup':>8}")
+    rng = random.Random(3)
+    text = make_message(2000)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    for size in (50, 500, 5000):
+        keywords = list({''.join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(size)})
+        keywords.append('docker')
+        automaton = KeywordAutomaton({'skill': keywords})
+        automaton.build()
+        
+        def baseline(text):
+            text_lower = text.lower()
+            return {keyword for keyword in keywords if keyword in text_lower}
+        
+        # Time the automaton walk itself, whatever strategy scan() would pick
+        automaton.DFA_MIN_KEYWORDS = 0
+        assert baseline(text) == set(automaton.scan(text))
+        before = time_call(baseline, text)
+        after = time_call(automaton.scan, text)
+        print(f"{len(keywords):>8} {before:>12.1f} {after:>13.1f} {before / after:>7.2f}x")
+
+
+def bench_domain_expertise():
+    print("\n=== Domain expertise counting for 2,000 employees ===")
+    from utils.employee_matcher import DOMAIN_EXPERTISE_MAP, domain_expertise_automaton
+    
+    rng = random.Random(5)
+    vocabulary = sorted({keyword for keywords in DOMAIN_EXPERTISE_MAP.values() for keyword in keywords})
+    vocabulary += ['go', 'rust', 'scala', 'excel', 'jira', 'communication']
+    rosters = [
+        [skill.title() for skill in rng.sample(vocabulary, rng.randint(2, 8))]
+        for _ in range(2000)
+    ]
+    
+    def baseline(domain):
+        keywords = DOMAIN_EXPERTISE_MAP[domain]
+        total = 0
+        for skills in rosters:
+            for skill in skills:
+                for keyword in keywords:
+                    if keyword.lower() in skill.lower():
+                        total += 1
+                        break
+        return total
+    
+    normalized = [[skill.lower() for skill in skills] for skills in rosters]
+    
+    def automaton(domain):
+        return sum(
+            1 for skills in normalized for skill in skills
+            if domain in domain_expertise_automaton.cached_categories(skill)
+        )
+    
+    for domain in ('frontend', 'data'):
+        assert baseline(domain) == automaton(domain)
+        before = time_call(baseline, domain, repeat=3)
+        after = time_call(automaton, domain, repeat=3)
+        print(f"{domain:>8} {before / 1000:>9.2f} ms {after / 1000:>10.2f} ms {before / after:>7.2f}x")
+
+
+def main():
+    bench_messages()
+    bench_vocabulary_size()
+    bench_domain_expertise()
+
+
+if __name__ == "__main__":
+    main()
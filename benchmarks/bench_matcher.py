@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Employee matcher benchmark.
+
+Times find_best_employee, get_employee_recommendations and
+TaskAssignmentAgent.assign_task against a synthetic organization and
+reports p50/p95/p99 latency, SQL statements per call and peak traced
+memory. Results are written to JSON so runs can be compared over time.
+
+The database is generated first if it has no employees. assign_task writes
+a task, an assignment and a queued notification job per call; no side-effect
+workers run, and the AutoGen fallback is replaced with a counter, so the
+benchmark never leaves the process.
+
+Usage:
+    python -m benchmarks.bench_matcher --database-url sqlite:///bench.db \\
+        --employees 10000 --tasks 1000000 --calls 200
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from flask import Flask
+from sqlalchemy import event
+from config.config import TestingConfig
+from models.database import db, Employee, Task, SideEffectJob
+from utils.employee_matcher import EmployeeMatcher
+from utils.workload_ledger import workload_ledger
+from benchmarks.synthetic_org import generate_org, make_task_requests
+
+
+def create_app(database_url, scoring_engine='python', use_workload_ledger=False):
+    """Create a minimal Flask app for benchmarking"""
+    app = Flask(__name__)
+    app.config.from_object(TestingConfig)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    app.config['MATCHER_SCORING_ENGINE'] = scoring_engine
+    # The AutoGen client needs a key to construct; the fallback itself is never called
+    app.config['OPENAI_API_TOKEN'] = app.config.get('OPENAI_API_TOKEN') or 'benchmark-unused'
+    db.init_app(app)
+    if use_workload_ledger:
+        workload_ledger.init_app(app)
+    return app
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, int(round(percent / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class StatementCounter:
+    """Counts SQL statements sent through an engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def run_operation(name, func, requests, warmup=5, memory_calls=20):
+    """
+    Time one operation over the task requests.
+
+    Latency is measured without tracemalloc (which slows allocation-heavy
+    code); peak memory is measured on a separate pass over the first
+    `memory_calls` requests.
+    """
+    for task_data in requests[:warmup]:
+        func(task_data)
+
+    latencies = []
+    with StatementCounter(db.engine) as counter:
+        for task_data in requests:
+            started = time.perf_counter()
+            func(task_data)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        for task_data in requests[:memory_calls]:
+            func(task_data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = {
+        'calls': len(latencies),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(max(latencies), 3),
+        'sql_per_call': round(counter.count / len(latencies), 2),
+        'peak_memory_mb': round(peak / (1024 * 1024), 2)
+    }
+
+    print(f"{name:<32} p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  "
+          f"p99 {result['p99_ms']:>9.2f} ms  sql/call {result['sql_per_call']:>6.2f}  "
+          f"peak {result['peak_memory_mb']:>7.2f} MB")
+    return result
+
+
+def bench_matcher(requests, scoring_engine):
+    matcher = EmployeeMatcher(scoring_engine=scoring_engine)
+
+    def find_best(task_data):
+        return matcher.find_best_employee(
+            task_data['task_type'], task_data['priority'], task_data['domain'],
+            task_data['estimated_hours'], required_skills=task_data['required_skills']
+        )
+
+    def recommendations(task_data):
+        return matcher.get_employee_recommendations(
+            task_data['task_type'], task_data['priority'], task_data['domain'],
+            task_data['required_skills'], limit=5
+        )
+
+    return {
+        'find_best_employee': run_operation('find_best_employee', find_best, requests),
+        'get_employee_recommendations': run_operation('get_employee_recommendations', recommendations, requests)
+    }
+
+
+def bench_assign_task(requests):
+    try:
+        from agents.task_assignment_agent import TaskAssignmentAgent
+        agent = TaskAssignmentAgent()
+    except Exception as e:
+        print(f"{'assign_task':<32} skipped: {e}")
+        return {'skipped': str(e)}
+
+    fallbacks = []
+    agent._fallback_autogen_assignment = lambda task, *profile: fallbacks.append(task.title)
+
+    queued = SideEffectJob.query.filter_by(kind='assignment_email').count()
+    result = run_operation('assign_task', agent.assign_task, requests)
+    result['notifications'] = SideEffectJob.query.filter_by(kind='assignment_email').count() - queued
+    result['autogen_fallbacks'] = len(fallbacks)
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark employee matching")
+    parser.add_argument('--database-url', default='sqlite:///synthetic_org.db')
+    parser.add_argument('--employees', type=int, default=10000,
+                        help="Employees to generate when the database is empty")
+    parser.add_argument('--tasks', type=int, default=1000000,
+                        help="Historical tasks to generate when the database is empty")
+    parser.add_argument('--calls', type=int, default=200, help="Timed calls per operation")
+    parser.add_argument('--scoring-engine', choices=EmployeeMatcher.SCORING_ENGINES, default='python')
+    parser.add_argument('--workload-ledger', action='store_true',
+                        help="Read workload from the in-memory ledger instead of SQL")
+    parser.add_argument('--skip-assign', action='store_true', help="Don't benchmark assign_task")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help="JSON output path (default benchmarks/results/matcher-<timestamp>.json)")
+    args = parser.parse_args()
+
+    app = create_app(args.database_url, args.scoring_engine, args.workload_ledger)
+    with app.app_context():
+        db.create_all()
+
+        org = None
+        if not db.session.query(Employee.id).first():
+            org = generate_org(employees=args.employees, tasks=args.tasks)
+
+        organization = {
+            'employees': db.session.query(Employee).count(),
+            'tasks': db.session.query(Task).count(),
+            'generated': org
+        }
+        print(f"Organization: {organization['employees']} employees, {organization['tasks']} tasks\n")
+
+        requests = make_task_requests(args.calls, seed=args.seed)
+        results = bench_matcher(requests, args.scoring_engine)
+        if not args.skip_assign:
+            results['assign_task'] = bench_assign_task(requests)
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'database': args.database_url.split(':', 1)[0],
+        'scoring_engine': args.scoring_engine,
+        'workload_ledger': args.workload_ledger,
+        'calls': args.calls,
+        'organization': organization,
+        'results': results
+    }
+
+    output = args.output or os.path.join(
+        'benchmarks', 'results', f"matcher-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
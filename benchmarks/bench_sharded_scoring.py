@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark for process-pool sharded scoring.
+
+Scores a synthetic in-memory roster (50k employees by default) in-process
+and with 1/2/4/8 worker processes, for a top-5 recommendation and a full
+org-wide ranking, and checks every sharded result matches the in-process
+ranking. Pools are started before timing so process start-up isn't counted.
+
+Usage:
+    python -m benchmarks.bench_sharded_scoring --employees 50000
+"""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+from datetime import datetime
+from utils.employee_matcher import EmployeeMatcher
+from utils.sharded_scoring import sharded_top_employees, get_pool, shutdown_pools
+from benchmarks.synthetic_org import (
+    DEPARTMENTS, TASK_TYPE_SOURCES, skill_vocabulary, skill_weights, primary_domain
+)
+
+
+def make_roster(count, seed=42):
+    """Employees with skills, department, workload and history, no database"""
+    rng = random.Random(seed)
+    skills = skill_vocabulary()
+    weights = skill_weights(skills, seed=seed)
+    sources = list(TASK_TYPE_SOURCES.values())
+    updated_at = datetime.now()
+
+    roster = []
+    for employee_id in range(1, count + 1):
+        employee_skills = set()
+        target = rng.randint(2, 8)
+        while len(employee_skills) < target:
+            employee_skills.add(rng.choices(skills, weights)[0])
+        employee_skills = sorted(employee_skills)
+
+        roster.append(SimpleNamespace(
+            id=employee_id,
+            name=f'Employee {employee_id}',
+            skills=', '.join(employee_skills),
+            department=DEPARTMENTS.get(primary_domain(employee_skills), 'Operations'),
+            updated_at=updated_at,
+            current_workload={
+                'task_count': rng.randint(0, 6),
+                'estimated_hours': float(rng.choice([0, 4, 8, 16, 32, 48])),
+                'high_priority_count': rng.randint(0, 3)
+            },
+            task_history={source: rng.randint(1, 20) for source in rng.sample(sources, rng.randint(0, 3))}
+        ))
+    return roster
+
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sharded scoring")
+    parser.add_argument('--employees', type=int, default=50000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--strategy', choices=['hash', 'department'], default='hash')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    roster = make_roster(args.employees)
+    matcher = EmployeeMatcher(scoring_engine='python')
+    task = ('bug', 'high', 'backend')
+    required_skills = ['python', 'sql']
+
+    print(f"Roster: {len(roster)} employees, strategy: {args.strategy}\n")
+    print(f"{'ranking':<12} {'workers':>8} {'ms':>10} {'speedup':>8}")
+
+    for label, limit in (('top-5', 5), ('full', None)):
+        baseline_ms, expected = best_of(
+            lambda: matcher._top_employees(roster, *task, limit, required_skills=required_skills),
+            args.repeat
+        )
+        expected = [(employee.id, score) for employee, score in expected]
+        print(f"{label:<12} {'in-proc':>8} {baseline_ms:>10.1f} {1.0:>7.2f}x")
+
+        for workers in args.workers:
+            # Start the workers and import the matcher in them before timing
+            pool = get_pool(workers)
+            list(pool.map(abs, range(workers * 4)))
+            sharded_top_employees(matcher, roster[:workers * 10], *task, limit, workers, args.strategy, required_skills)
+
+            elapsed_ms, result = best_of(
+                lambda: sharded_top_employees(
+                    matcher, roster, *task, limit, workers, args.strategy, required_skills
+                ),
+                args.repeat
+            )
+            assert [(employee.id, score) for employee, score in result] == expected
+            print(f"{label:<12} {workers:>8} {elapsed_ms:>10.1f} {baseline_ms / elapsed_ms:>7.2f}x")
+
+    shutdown_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Accuracy and throughput of required-skill extraction.
+
+Builds labeled tasks whose titles and descriptions mention one to three
+roster skills, each written under one of its aliases half the time
+("k8s" for kubernetes), and extracts the skills back with SkillExtractor.
+Before the extractor, tasks without explicit skills got none. Reports the
+vocabulary load and compile time, a refresh that finds the vocabulary
+unchanged, precision and recall against the labels, and tasks per second
+on the sample and on long descriptions.
+
+--extra-skills adds employees with one unique skill each, to measure a
+larger vocabulary than the synthetic roster's.
+
+Usage:
+    python -m benchmarks.bench_skill_extractor --employees 10000 --extra-skills 5000
+"""
+
+import argparse
+import random
+import time
+import timeit
+from models.database import db, Employee
+from utils.skills import SKILL_ALIASES
+from utils.skill_extractor import SkillExtractor, is_extractable
+from benchmarks.bench_matcher import create_app
+from benchmarks.synthetic_org import generate_org, skill_vocabulary, AREAS, TITLE_TEMPLATES
+
+EXTRA_SKILL_PREFIX = 'platform-'
+
+FILLER = (
+    "Customers reported the issue after the last release. Please investigate, "
+    "add logging where it helps and coordinate with the team before deploying."
+)
+
+
+def make_sample(count, seed=11):
+    """Labeled tasks: (title, description, set of canonical skills)"""
+    rng = random.Random(seed)
+    skills = [skill for skill in skill_vocabulary() if is_extractable(skill)]
+    aliases = {}
+    for alias, skill in SKILL_ALIASES.items():
+        if is_extractable(alias):
+            aliases.setdefault(skill, []).append(alias)
+
+    sample = []
+    for _ in range(count):
+        required = rng.sample(skills, rng.randint(1, 3))
+        written = [
+            rng.choice(aliases[skill]) if skill in aliases and rng.random() < 0.5 else skill
+            for skill in required
+        ]
+        template = rng.choice(list(TITLE_TEMPLATES.values()))
+        title = template.format(skill=written[0], area=rng.choice(AREAS))
+        description = f"{FILLER} Needs someone comfortable with {' and '.join(written[1:]) or 'it'}."
+        sample.append((title, description, set(required)))
+    return sample
+
+
+def add_extra_skills(count):
+    """Employees with one unique skill each"""
+    db.session.add_all(
+        Employee(name=f'Specialist {i}', email=f'specialist{i}@example.com',
+                 expertise=f'{EXTRA_SKILL_PREFIX}{i}', level='mid',
+                 skills=f'{EXTRA_SKILL_PREFIX}{i}', availability=True)
+        for i in range(count)
+    )
+    db.session.commit()
+
+
+def tasks_per_second(extract, sample, repeat=5):
+    """Best throughput over the sample"""
+    timer = timeit.Timer(lambda: [extract(title, description) for title, description, _ in sample])
+    number, _ = timer.autorange()
+    return len(sample) * number / min(timer.repeat(repeat=repeat, number=number))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark required-skill extraction")
+    parser.add_argument('--database-url', default='sqlite:///skill_extractor.db')
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--extra-skills', type=int, default=0)
+    parser.add_argument('--sample', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = create_app(args.database_url)
+    with app.app_context():
+        db.create_all()
+        if not db.session.query(Employee.id).first():
+            generate_org(employees=args.employees, tasks=args.employees)
+        extra = Employee.query.filter(Employee.skills.like(f'{EXTRA_SKILL_PREFIX}%')).count()
+        if extra < args.extra_skills:
+            add_extra_skills(args.extra_skills)
+
+        extractor = SkillExtractor()
+        started = time.perf_counter()
+        extractor.extract('')
+        load_ms = (time.perf_counter() - started) * 1000
+
+        extractor._last_checked = 0.0
+        started = time.perf_counter()
+        extractor.extract('')
+        refresh_ms = (time.perf_counter() - started) * 1000
+        stats = extractor.stats()
+
+        sample = make_sample(args.sample)
+        long_sample = [(title, ' '.join([description] * 20), skills) for title, description, skills in sample]
+
+        found = expected = correct = 0
+        for title, description, skills in sample:
+            extracted = set(extractor.extract(title, description))
+            found += len(extracted)
+            expected += len(skills)
+            correct += len(extracted & skills)
+
+        short_rate = tasks_per_second(extractor.extract, sample)
+        long_rate = tasks_per_second(extractor.extract, long_sample)
+
+    print(f"{stats['keywords']} keywords for {stats['skills']} skills, "
+          f"loaded and compiled in {load_ms:.0f} ms, unchanged refresh {refresh_ms:.0f} ms\n")
+    print(f"{'method':<16} {'precision':>10} {'recall':>8} {'tasks/s':>10} {'long tasks/s':>13}")
+    print(f"{'explicit only':<16} {'-':>10} {0:>8.1%} {'-':>10} {'-':>13}")
+    print(f"{'skill extractor':<16} {correct / found if found else 0:>10.1%} {correct / expected:>8.1%} "
+          f"{short_rate:>10.0f} {long_rate:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark for TF-IDF skill similarity.
+
+Builds a synthetic in-memory roster (10k employees by default) and rewrites
+a share of its skills into the variant spellings real profiles contain:
+aliases ("k8s", "reactjs"), dropped or swapped letters, and separators.
+Each probe asks for one canonical skill, and the employees who originally
+held it are the relevant set. Recall and precision of the required-skill
+match are reported for the substring scorer ('numpy') and the 'tfidf'
+scorer, along with encode and per-task scoring latency.
+
+Usage:
+    python -m benchmarks.bench_skill_similarity --employees 10000
+"""
+
+import argparse
+import random
+import time
+from utils.employee_matcher import EmployeeMatcher
+from utils.skills import SKILL_ALIASES
+from utils.skill_similarity import SemanticScorer, SkillSimilarityIndex
+from utils.vectorized_scorer import VectorizedScorer
+from benchmarks.bench_sharded_scoring import make_roster, best_of
+
+# Canonical skill -> spellings seen in profiles
+ALIAS_VARIANTS = {}
+for alias, canonical in SKILL_ALIASES.items():
+    ALIAS_VARIANTS.setdefault(canonical, []).append(alias)
+
+
+def misspell(skill, rng):
+    """Drop, swap or double one letter, or change a separator"""
+    if ' ' in skill and rng.random() < 0.5:
+        return skill.replace(' ', rng.choice(['-', '', '_']))
+    if len(skill) < 5:
+        return skill
+    i = rng.randrange(1, len(skill) - 2)
+    edit = rng.choice(('drop', 'swap', 'double'))
+    if edit == 'drop':
+        return skill[:i] + skill[i + 1:]
+    if edit == 'swap':
+        return skill[:i] + skill[i + 1] + skill[i] + skill[i + 2:]
+    return skill[:i] + skill[i] + skill[i:]
+
+
+def add_variants(roster, share, seed=7):
+    """
+    Rewrite a share of skills into variant spellings.
+
+    Returns:
+        dict: canonical skill -> ids of the employees holding it
+    """
+    rng = random.Random(seed)
+    holders = {}
+    for employee in roster:
+        skills = []
+        for skill in employee.skills.split(', '):
+            holders.setdefault(skill, set()).add(employee.id)
+            if rng.random() < share:
+                if skill in ALIAS_VARIANTS and rng.random() < 0.6:
+                    skill = rng.choice(ALIAS_VARIANTS[skill])
+                else:
+                    skill = misspell(skill, rng)
+            skills.append(skill)
+        employee.skills = ', '.join(skills)
+    return holders
+
+
+def recall_precision(scorer, probes, holders):
+    matched = relevant = retrieved = 0
+    for skill in probes:
+        hits = scorer._skills_match_score([skill]) > 0
+        found = {scorer.employees[row].id for row in hits.nonzero()[0]}
+        matched += len(found & holders[skill])
+        relevant += len(holders[skill])
+        retrieved += len(found)
+    return matched / relevant, (matched / retrieved if retrieved else 1.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TF-IDF skill similarity")
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--variant-share', type=float, default=0.3,
+                        help='Share of skills rewritten into variant spellings')
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--probes', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    roster = make_roster(args.employees)
+    holders = add_variants(roster, args.variant_share)
+    probes = sorted(holders, key=lambda skill: -len(holders[skill]))[:args.probes]
+    matcher = EmployeeMatcher(scoring_engine='numpy')
+    task = ('bug', 'high', 'frontend')
+
+    print(f"Roster: {len(roster)} employees, {args.variant_share:.0%} variant skills, "
+          f"{len(probes)} probe skills\n")
+    print(f"{'engine':<8} {'recall':>8} {'precision':>10} {'encode ms':>10} {'score ms':>9}")
+
+    engines = (
+        ('numpy', lambda: VectorizedScorer(matcher)),
+        # A fresh index per run so encode time includes building the vocabulary
+        ('tfidf', lambda: SemanticScorer(matcher, SkillSimilarityIndex(args.threshold))),
+    )
+    for name, make_scorer in engines:
+        encode_ms, scorer = best_of(lambda: make_scorer().encode(roster), args.repeat)
+        recall, precision = recall_precision(scorer, probes, holders)
+        score_ms, _ = best_of(lambda: scorer.score(*task, required_skills=['react', 'typescript']), args.repeat)
+        print(f"{name:<8} {recall:>8.3f} {precision:>10.3f} {encode_ms:>10.1f} {score_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Commits and fsyncs per created-and-assigned task.
+
+Replays the task intake paths against a synthetic organization and counts
+the transactions each one commits. The database runs SQLite in WAL mode
+with synchronous=FULL, where every commit syncs the write-ahead log once,
+so the commit count is also the fsync count (as with PostgreSQL's
+synchronous_commit).
+
+- 'route before': the old POST /tasks with auto_assign, which committed its
+  task, then had the agent create a duplicate task, commit it, and commit
+  the assignment separately.
+- 'assign_task before': the old agent on its own, committing the task and
+  then the assignment.
+- 'assign_task': one flush, one commit per task.
+- 'ingest_tasks': every task of a batch in one commit.
+
+No side-effect workers run and the AutoGen fallback is replaced with a
+counter.
+
+Usage:
+    python -m benchmarks.bench_unit_of_work --employees 2000 --tasks-per-run 200
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from sqlalchemy import event
+from models.database import db, Employee, Task, TaskAssignment
+from agents.task_assignment_agent import TaskAssignmentAgent
+from utils.side_effects import enqueue_assignment_email
+from benchmarks.bench_matcher import create_app
+from benchmarks.synthetic_org import generate_org, make_task_requests
+
+
+class CommitCounter:
+    """Counts transactions committed on an engine's connections"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(self.engine, 'commit', self._on_commit)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'commit', self._on_commit)
+
+    def _on_commit(self, conn):
+        self.count += 1
+
+
+def durable_sqlite(engine):
+    """Make every commit sync the write-ahead log"""
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=FULL')
+        cursor.close()
+
+    engine.dispose()
+
+
+def legacy_assign_task(agent, task_data):
+    """The agent's previous assign_task: commit the task, then the assignment"""
+    task = agent._build_task(task_data)
+    db.session.add(task)
+    db.session.commit()
+
+    employee = agent.employee_matcher.find_best_employee(
+        task_type=agent._determine_task_type(task_data),
+        priority=task.priority,
+        required_domain=agent._determine_required_domain(task_data),
+        estimated_hours=task.estimated_hours,
+        due_date=task.due_date,
+        required_skills=agent._extract_required_skills(task_data)
+    )
+    if employee is None:
+        return None
+
+    assignment = TaskAssignment(task_id=task.id, employee_id=employee.id, assigned_by='AI Matcher')
+    db.session.add(assignment)
+    task.status = 'assigned'
+    enqueue_assignment_email(assignment, employee.email, task.title, task.description)
+    db.session.commit()
+    return assignment
+
+
+def legacy_route(agent, task_data):
+    """The previous POST /tasks with auto_assign: a committed task plus the agent's duplicate"""
+    db.session.add(agent._build_task(task_data))
+    db.session.commit()
+    return legacy_assign_task(agent, task_data)
+
+
+def measure(name, run, requests):
+    """Run one intake path over the requests, counting commits and new tasks"""
+    tasks_before = db.session.query(Task.id).count()
+    with CommitCounter(db.engine) as commits:
+        started = time.perf_counter()
+        run(requests)
+        elapsed = time.perf_counter() - started
+    db.session.remove()
+    created = db.session.query(Task.id).count() - tasks_before
+
+    per_task = commits.count / len(requests)
+    print(f"{name:<20} {commits.count:>8} {per_task:>13.2f} {per_task:>11.2f} "
+          f"{created / len(requests):>15.2f} {elapsed * 1000 / len(requests):>11.2f}")
+    return per_task
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count commits and fsyncs per assigned task")
+    parser.add_argument('--database-url',
+                        help='SQLite database (default: a temporary file)')
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--history', type=int, default=20000,
+                        help='Historical tasks to generate when the database is empty')
+    parser.add_argument('--tasks-per-run', type=int, default=200)
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(
+        tempfile.mkdtemp(prefix='unit-of-work-'), 'bench.db'
+    )
+    app = create_app(database_url)
+
+    with app.app_context():
+        durable_sqlite(db.engine)
+        db.create_all()
+        if not db.session.query(Employee.id).first():
+            generate_org(employees=args.employees, tasks=args.history)
+
+        agent = TaskAssignmentAgent()
+        fallbacks = []
+        agent._fallback_autogen_assignment = lambda task, *profile: fallbacks.append(task.title)
+
+        print(f"{'path':<20} {'commits':>8} {'commits/task':>13} {'fsyncs/task':>11} "
+              f"{'tasks created/task':>15} {'ms/task':>11}")
+        count = args.tasks_per_run
+        before = measure('route before', lambda requests: [
+            legacy_route(agent, task_data) for task_data in requests
+        ], make_task_requests(count, seed=1))
+        measure('assign_task before', lambda requests: [
+            legacy_assign_task(agent, task_data) for task_data in requests
+        ], make_task_requests(count, seed=2))
+        after = measure('assign_task', lambda requests: [
+            agent.assign_task(task_data) for task_data in requests
+        ], make_task_requests(count, seed=3))
+        bulk = measure('ingest_tasks', agent.ingest_tasks, make_task_requests(count, seed=4))
+
+    print(f"\nassign_task commits {before / after:.0f}x less than the old route, "
+          f"ingest_tasks {before / bulk:.0f}x less ({len(fallbacks)} fallbacks skipped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the workload rebalancer.
+
+Fills a synthetic organization whose historical load is skewed towards a
+few employees, then times:
+
+- the previous optimize_workload, which loaded every assigned TaskAssignment
+  to count them per employee;
+- the single aggregate load query;
+- a dry-run plan;
+- applying that plan in one transaction.
+
+The plan's moves are checked against the loads afterwards: every moved task
+leaves an overloaded employee and lands on an available one below the
+target load.
+
+Usage:
+    python -m benchmarks.bench_workload_rebalancer --employees 10000 --tasks 200000 --active-ratio 0.5
+"""
+
+import argparse
+import time
+from models.database import db, Employee, TaskAssignment
+from agents.task_assignment_agent import TaskAssignmentAgent
+from utils.workload_rebalancer import WorkloadRebalancer, employee_loads
+from benchmarks.bench_matcher import create_app
+from benchmarks.synthetic_org import generate_org
+
+
+def legacy_optimize_workload():
+    """optimize_workload before the rebalancer: count assigned rows in Python"""
+    workload_data = {}
+    for assignment in TaskAssignment.query.filter_by(status='assigned').all():
+        workload_data[assignment.employee_id] = workload_data.get(assignment.employee_id, 0) + 1
+    average = sum(workload_data.values()) / len(workload_data) if workload_data else 0
+    return [employee_id for employee_id, count in workload_data.items() if count > average * 1.5]
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark workload rebalancing")
+    parser.add_argument('--database-url', default='sqlite:///workload_rebalancer.db')
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--tasks', type=int, default=200000)
+    parser.add_argument('--active-ratio', type=float, default=0.5,
+                        help='Share of generated tasks still assigned or accepted')
+    parser.add_argument('--max-moves', type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_app(args.database_url)
+
+    with app.app_context():
+        db.create_all()
+        if not db.session.query(Employee.id).first():
+            generate_org(employees=args.employees, tasks=args.tasks, active_ratio=args.active_ratio)
+
+        agent = TaskAssignmentAgent()
+        rebalancer = WorkloadRebalancer(agent.employee_matcher, agent._task_profile, max_moves=args.max_moves)
+
+        legacy_ms, _ = timed(legacy_optimize_workload)
+        db.session.expunge_all()
+        loads_ms, loads = timed(employee_loads)
+        active = sum(load['task_count'] for load in loads.values())
+        print(f"{len(loads)} employees, {active} active assignments\n")
+
+        plan_ms, plan = timed(rebalancer.plan)
+        apply_ms, result = timed(lambda: rebalancer.apply(plan))
+
+        after = employee_loads()
+        donors = {donor['employee_id'] for donor in plan['overloaded']}
+        for move in plan['moves']:
+            assert move['from_employee_id'] in donors, "moved a task off an employee who wasn't overloaded"
+            assert loads[move['to_employee_id']]['available'], "moved a task to an unavailable employee"
+        assert all(after[employee_id]['task_count'] <= plan['target_load']
+                   for employee_id in {move['to_employee_id'] for move in plan['moves']}), \
+            "a receiver ended above the target load"
+        assert sum(load['task_count'] for load in after.values()) == active, "active task count changed"
+
+    print(f"{'operation':<36} {'ms':>10}")
+    print(f"{'previous optimize_workload':<36} {legacy_ms:>10.1f}")
+    print(f"{'aggregate load query':<36} {loads_ms:>10.1f}")
+    print(f"{'plan (dry run)':<36} {plan_ms:>10.1f}")
+    print(f"{'apply':<36} {apply_ms:>10.1f}")
+    print(f"\naverage load {plan['average_load']}, target {plan['target_load']}, "
+          f"{len(plan['overloaded'])} overloaded, {plan['underloaded']} underloaded")
+    print(f"{len(plan['moves'])} moves planned, {len(result['applied'])} applied, "
+          f"{len(result['skipped'])} skipped")
+    top = max(load['task_count'] for load in loads.values())
+    print(f"most loaded employee {top} -> {max(load['task_count'] for load in after.values())} tasks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Synthetic organization generator for matcher benchmarks.
+
+Fills a database with employees, historical tasks and assignments at a
+configurable scale (e.g. 10k employees and 1M tasks). Rows go in through
+batched Core inserts, so large organizations load in minutes rather than
+hours. Skill popularity follows a Zipf distribution by default, so a few
+skills are very common and most are rare, as in real rosters.
+
+Usage:
+    python -m benchmarks.synthetic_org --database-url sqlite:///bench.db \\
+        --employees 10000 --tasks 1000000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, func
+from models.database import db, Employee, Task, TaskAssignment
+from utils.employee_matcher import DOMAIN_EXPERTISE_MAP
+
+
+# Skills nobody's domain map mentions, to keep the roster realistic
+GENERAL_SKILLS = [
+    'go', 'rust', 'scala', 'c++', 'excel', 'jira', 'communication', 'leadership',
+    'graphql', 'redis', 'kafka', 'terraform', 'swift', 'kotlin', 'typescript'
+]
+
+LEVELS = ['junior', 'mid', 'senior']
+
+DEPARTMENTS = {
+    'frontend': 'Frontend Engineering',
+    'backend': 'Backend Engineering',
+    'devops': 'DevOps Infrastructure',
+    'mobile': 'Mobile Development',
+    'data': 'Data Analytics',
+    'security': 'Security',
+    'qa': 'QA Testing',
+    'design': 'Design UX'
+}
+
+TASK_TYPE_SOURCES = {
+    'bug': 'jira_bug',
+    'feature': 'jira_feature',
+    'incident': 'incident',
+    'story': 'jira_story',
+    'task': 'slack_command'
+}
+
+TITLE_TEMPLATES = {
+    'bug': 'Fix {skill} bug in {area}',
+    'feature': 'New feature: {skill} support for {area}',
+    'incident': 'Incident: {area} outage related to {skill}',
+    'story': 'User story: {area} improvements with {skill}',
+    'task': 'Update {area} {skill} configuration'
+}
+
+AREAS = ['checkout', 'login', 'dashboard', 'billing', 'search', 'reports', 'onboarding', 'settings']
+
+PRIORITY_WEIGHTS = {'high': 0.2, 'medium': 0.5, 'low': 0.3}
+ACTIVE_STATUSES = ['assigned', 'accepted']
+CLOSED_STATUSES = ['completed', 'declined']
+
+
+def skill_vocabulary():
+    """Every skill the generator can give an employee, domain skills first"""
+    skills = []
+    for keywords in DOMAIN_EXPERTISE_MAP.values():
+        for keyword in keywords:
+            if keyword not in skills:
+                skills.append(keyword)
+    return skills + [skill for skill in GENERAL_SKILLS if skill not in skills]
+
+
+def skill_weights(skills, distribution='zipf', zipf_exponent=1.1, seed=42):
+    """Popularity weight per skill"""
+    if distribution == 'uniform':
+        return [1.0] * len(skills)
+    if distribution != 'zipf':
+        raise ValueError(f"Unknown skill distribution: {distribution}")
+
+    # Shuffle ranks so popularity isn't tied to domain order
+    ranks = list(range(1, len(skills) + 1))
+    random.Random(seed).shuffle(ranks)
+    return [1.0 / rank ** zipf_exponent for rank in ranks]
+
+
+def primary_domain(skills):
+    """First domain any of the skills belong to"""
+    for skill in skills:
+        for domain, keywords in DOMAIN_EXPERTISE_MAP.items():
+            if skill in keywords:
+                return domain
+    return None
+
+
+def generate_org(employees=10000, tasks=1000000, min_skills=2, max_skills=8,
+                 skill_distribution='zipf', zipf_exponent=1.1, active_ratio=0.02,
+                 availability_ratio=0.9, seed=42, batch_size=10000, verbose=True):
+    """
+    Insert a synthetic organization into the current app's database.
+
+    Args:
+        employees (int): Number of employees
+        tasks (int): Number of historical tasks, each with one assignment
+        min_skills (int): Fewest skills per employee
+        max_skills (int): Most skills per employee
+        skill_distribution (str): 'zipf' or 'uniform' skill popularity
+        zipf_exponent (float): Skew of the Zipf distribution
+        active_ratio (float): Share of assignments still assigned/accepted
+        availability_ratio (float): Share of employees marked available
+        seed (int): Random seed
+        batch_size (int): Rows per insert statement batch
+        verbose (bool): Print progress
+
+    Returns:
+        dict: Row counts and load time
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    skills = skill_vocabulary()
+    weights = skill_weights(skills, skill_distribution, zipf_exponent, seed)
+    max_skills = min(max_skills, len(skills))
+
+    first_employee_id = (db.session.query(func.max(Employee.id)).scalar() or 0) + 1
+    first_task_id = (db.session.query(func.max(Task.id)).scalar() or 0) + 1
+    now = datetime.now()
+
+    # Employees
+    employee_ids = []
+    employee_domains = []
+    rows = []
+    for i in range(employees):
+        employee_id = first_employee_id + i
+        employee_skills = []
+        target = rng.randint(min_skills, max_skills)
+        while len(employee_skills) < target:
+            skill = rng.choices(skills, weights)[0]
+            if skill not in employee_skills:
+                employee_skills.append(skill)
+
+        domain = primary_domain(employee_skills)
+        department = DEPARTMENTS.get(domain) if rng.random() < 0.8 else rng.choice(list(DEPARTMENTS.values()))
+
+        skills_string = ', '.join(skill.title() for skill in employee_skills)
+        available = rng.random() < availability_ratio
+        rows.append({
+            'id': employee_id,
+            'name': f'Employee {employee_id}',
+            'email': f'employee{employee_id}@synthetic.example.com',
+            'expertise': skills_string[:500],
+            'level': rng.choice(LEVELS),
+            'is_available': available,
+            'department': department,
+            'skills': skills_string,
+            'availability': available,
+            'created_at': now,
+            'updated_at': now
+        })
+        employee_ids.append(employee_id)
+        employee_domains.append(domain)
+
+        if len(rows) >= batch_size:
+            db.session.execute(insert(Employee), rows)
+            rows = []
+    if rows:
+        db.session.execute(insert(Employee), rows)
+    db.session.commit()
+
+    if verbose:
+        print(f"Inserted {employees} employees")
+
+    # A few employees carry most of the historical load
+    load_weights = [rng.lognormvariate(0, 1) for _ in employee_ids]
+    cumulative_weights = []
+    total = 0
+    for weight in load_weights:
+        total += weight
+        cumulative_weights.append(total)
+
+    # Tasks with one assignment each
+    task_types = list(TASK_TYPE_SOURCES)
+    priorities = list(PRIORITY_WEIGHTS)
+    priority_weights = list(PRIORITY_WEIGHTS.values())
+
+    task_rows = []
+    assignment_rows = []
+    for i in range(tasks):
+        task_id = first_task_id + i
+        task_type = rng.choice(task_types)
+        skill = rng.choices(skills, weights)[0]
+        is_active = rng.random() < active_ratio
+        created_at = now - timedelta(days=rng.randint(0, 720))
+
+        task_rows.append({
+            'id': task_id,
+            'title': TITLE_TEMPLATES[task_type].format(skill=skill, area=rng.choice(AREAS)),
+            'description': f'Synthetic {task_type} involving {skill}',
+            'priority': rng.choices(priorities, priority_weights)[0],
+            'status': 'assigned' if is_active else 'completed',
+            'estimated_hours': rng.choice([None, 1.0, 2.0, 4.0, 8.0, 16.0]),
+            'due_date': created_at + timedelta(days=rng.randint(1, 30)),
+            'source': TASK_TYPE_SOURCES[task_type],
+            'source_id': f'SYN-{task_id}',
+            'created_by': 'synthetic_org',
+            'created_at': created_at,
+            'updated_at': created_at
+        })
+
+        employee_id = rng.choices(employee_ids, cum_weights=cumulative_weights)[0]
+        assignment_rows.append({
+            'task_id': task_id,
+            'employee_id': employee_id,
+            'assigned_at': created_at,
+            'assigned_by': 'synthetic_org',
+            'status': rng.choice(ACTIVE_STATUSES) if is_active else rng.choice(CLOSED_STATUSES)
+        })
+
+        if len(task_rows) >= batch_size:
+            db.session.execute(insert(Task), task_rows)
+            db.session.execute(insert(TaskAssignment), assignment_rows)
+            db.session.commit()
+            task_rows = []
+            assignment_rows = []
+
+            if verbose and (i + 1) % (batch_size * 10) == 0:
+                print(f"Inserted {i + 1} tasks")
+
+    if task_rows:
+        db.session.execute(insert(Task), task_rows)
+        db.session.execute(insert(TaskAssignment), assignment_rows)
+        db.session.commit()
+
+    summary = {
+        'employees': employees,
+        'tasks': tasks,
+        'skill_vocabulary': len(skills),
+        'skill_distribution': skill_distribution,
+        'active_ratio': active_ratio,
+        'seed': seed,
+        'load_seconds': round(time.perf_counter() - started, 2)
+    }
+
+    if verbose:
+        print(f"Generated organization in {summary['load_seconds']}s")
+
+    return summary
+
+
+def make_task_requests(count, seed=7):
+    """
+    Random incoming tasks to match against the organization.
+
+    Returns:
+        list: task_data dicts as accepted by TaskAssignmentAgent.assign_task,
+              with 'task_type', 'domain' and 'required_skills' filled in
+    """
+    rng = random.Random(seed)
+    domains = list(DOMAIN_EXPERTISE_MAP)
+    priorities = list(PRIORITY_WEIGHTS)
+    priority_weights = list(PRIORITY_WEIGHTS.values())
+
+    requests = []
+    for i in range(count):
+        task_type = rng.choice(list(TASK_TYPE_SOURCES))
+        domain = rng.choice(domains)
+        skills = rng.sample(DOMAIN_EXPERTISE_MAP[domain], rng.randint(0, 2))
+        requests.append({
+            'title': TITLE_TEMPLATES[task_type].format(
+                skill=skills[0] if skills else domain, area=rng.choice(AREAS)
+            ),
+            'description': f'Benchmark {task_type} #{i} for the {domain} team',
+            'priority': rng.choices(priorities, priority_weights)[0],
+            'source': TASK_TYPE_SOURCES[task_type],
+            'estimated_hours': rng.choice([None, 2.0, 4.0, 8.0]),
+            'created_by': 'benchmark',
+            'task_type': task_type,
+            'domain': domain,
+            'required_skills': skills or None
+        })
+    return requests
+
+
+def main():
+    from benchmarks.bench_matcher import create_app
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic organization")
+    parser.add_argument('--database-url', default='sqlite:///synthetic_org.db')
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--min-skills', type=int, default=2)
+    parser.add_argument('--max-skills', type=int, default=8)
+    parser.add_argument('--skill-distribution', choices=['zipf', 'uniform'], default='zipf')
+    parser.add_argument('--zipf-exponent', type=float, default=1.1)
+    parser.add_argument('--active-ratio', type=float, default=0.02)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app(args.database_url)
+    with app.app_context():
+        db.create_all()
+        generate_org(
+            employees=args.employees, tasks=args.tasks,
+            min_skills=args.min_skills, max_skills=args.max_skills,
+            skill_distribution=args.skill_distribution, zipf_exponent=args.zipf_exponent,
+            active_ratio=args.active_ratio, seed=args.seed
+        )
+
+
+if __name__ == "__main__":
+    main()
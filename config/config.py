@@ -37,6 +37,49 @@ class Config:
     
     # Gmail App Password for assignment emails
     GMAIL_APP_PASSWORD = os.environ.get('GMAIL_APP_PASSWORD')
+    
+    # Employee Matching Configuration
+    MATCHER_SCORING_ENGINE = os.environ.get('MATCHER_SCORING_ENGINE', 'python')
+    MATCHER_SHARD_WORKERS = int(os.environ.get('MATCHER_SHARD_WORKERS', 0))
+    MATCHER_SHARD_STRATEGY = os.environ.get('MATCHER_SHARD_STRATEGY', 'hash')
+    MATCHER_SHARD_MIN_CANDIDATES = int(os.environ.get('MATCHER_SHARD_MIN_CANDIDATES', 5000))
+    MATCHER_SIMILARITY_THRESHOLD = float(os.environ.get('MATCHER_SIMILARITY_THRESHOLD', 0.5))
+    MATCHER_DAEMON_SOCKET = os.environ.get('MATCHER_DAEMON_SOCKET')
+    MATCHER_DAEMON_TIMEOUT = float(os.environ.get('MATCHER_DAEMON_TIMEOUT', 2.0))
+    MATCHER_INDEX_SNAPSHOT_DIR = os.environ.get('MATCHER_INDEX_SNAPSHOT_DIR')
+    WORKLOAD_LEDGER_ENABLED = os.environ.get('WORKLOAD_LEDGER_ENABLED', 'true').lower() == 'true'
+    WORKLOAD_LEDGER_RECONCILE_SECONDS = int(os.environ.get('WORKLOAD_LEDGER_RECONCILE_SECONDS', 300))
+    RANKING_CACHE_ENABLED = os.environ.get('RANKING_CACHE_ENABLED', 'true').lower() == 'true'
+    RANKING_CACHE_SIZE = int(os.environ.get('RANKING_CACHE_SIZE', 1024))
+    RANKING_CACHE_TTL_SECONDS = int(os.environ.get('RANKING_CACHE_TTL_SECONDS', 30))
+    SKILL_INDEX_REBUILD_SECONDS = int(os.environ.get('SKILL_INDEX_REBUILD_SECONDS', 300))
+    CANDIDATE_FILTER_ENABLED = os.environ.get('CANDIDATE_FILTER_ENABLED', 'true').lower() == 'true'
+    CANDIDATE_FILTER_REBUILD_SECONDS = int(os.environ.get('CANDIDATE_FILTER_REBUILD_SECONDS', 300))
+    CAPACITY_TIMELINE_ENABLED = os.environ.get('CAPACITY_TIMELINE_ENABLED', 'true').lower() == 'true'
+    CAPACITY_TIMELINE_MODE = os.environ.get('CAPACITY_TIMELINE_MODE', 'penalize')
+    CAPACITY_TIMELINE_REBUILD_SECONDS = int(os.environ.get('CAPACITY_TIMELINE_REBUILD_SECONDS', 300))
+    CAPACITY_HOURS_PER_DAY = float(os.environ.get('CAPACITY_HOURS_PER_DAY', 8.0))
+    CAPACITY_HORIZON_DAYS = int(os.environ.get('CAPACITY_HORIZON_DAYS', 130))
+    CAPACITY_DEFAULT_TASK_DAYS = int(os.environ.get('CAPACITY_DEFAULT_TASK_DAYS', 5))
+    WORKLOAD_REBALANCE_OVERLOAD_RATIO = float(os.environ.get('WORKLOAD_REBALANCE_OVERLOAD_RATIO', 1.5))
+    WORKLOAD_REBALANCE_MIN_SCORE_RATIO = float(os.environ.get('WORKLOAD_REBALANCE_MIN_SCORE_RATIO', 0.9))
+    WORKLOAD_REBALANCE_MAX_MOVES = int(os.environ.get('WORKLOAD_REBALANCE_MAX_MOVES', 50))
+    DOMAIN_RULES_PATH = os.environ.get('DOMAIN_RULES_PATH')
+    DOMAIN_RULES_RELOAD_SECONDS = float(os.environ.get('DOMAIN_RULES_RELOAD_SECONDS', 5.0))
+    SKILL_EXTRACTION_ENABLED = os.environ.get('SKILL_EXTRACTION_ENABLED', 'true').lower() == 'true'
+    SKILL_EXTRACTION_REFRESH_SECONDS = float(os.environ.get('SKILL_EXTRACTION_REFRESH_SECONDS', 5.0))
+    AUTOGEN_SHORTLIST_SIZE = int(os.environ.get('AUTOGEN_SHORTLIST_SIZE', 5))
+    AUTOGEN_TIMEOUT_SECONDS = float(os.environ.get('AUTOGEN_TIMEOUT_SECONDS', 20.0))
+    AUTOGEN_MAX_CONCURRENT = int(os.environ.get('AUTOGEN_MAX_CONCURRENT', 2))
+    AUTOGEN_MAX_AUTO_REPLY = int(os.environ.get('AUTOGEN_MAX_AUTO_REPLY', 1))
+    AUTOGEN_CACHE_SIZE = int(os.environ.get('AUTOGEN_CACHE_SIZE', 256))
+    AUTOGEN_CACHE_TTL_SECONDS = int(os.environ.get('AUTOGEN_CACHE_TTL_SECONDS', 600))
+    SIDE_EFFECT_WORKERS = int(os.environ.get('SIDE_EFFECT_WORKERS', 2))
+    SIDE_EFFECT_MAX_ATTEMPTS = int(os.environ.get('SIDE_EFFECT_MAX_ATTEMPTS', 5))
+    SIDE_EFFECT_BACKOFF_SECONDS = float(os.environ.get('SIDE_EFFECT_BACKOFF_SECONDS', 2.0))
+    SIDE_EFFECT_BACKOFF_MAX_SECONDS = float(os.environ.get('SIDE_EFFECT_BACKOFF_MAX_SECONDS', 300.0))
+    SIDE_EFFECT_POLL_SECONDS = float(os.environ.get('SIDE_EFFECT_POLL_SECONDS', 5.0))
+    SIDE_EFFECT_LEASE_SECONDS = int(os.environ.get('SIDE_EFFECT_LEASE_SECONDS', 300))
 
 
 class DevelopmentConfig(Config):
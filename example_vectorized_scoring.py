@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Example script comparing the per-employee and vectorized scoring engines.
+It checks that both engines produce identical rankings for a range of tasks.
+"""
+
+import random
+from flask import Flask
+from config.config import TestingConfig
+from models.database import db, Employee, Task, TaskAssignment
+from utils.employee_matcher import EmployeeMatcher
+from utils.vectorized_scorer import VectorizedScorer
+
+
+SKILLS = [
+    'javascript', 'react', 'vue', 'html', 'css', 'python', 'java', 'node.js',
+    'api', 'sql', 'docker', 'kubernetes', 'aws', 'ios', 'android', 'flutter',
+    'machine learning', 'analytics', 'security', 'encryption', 'selenium',
+    'testing', 'figma', 'ui design'
+]
+
+DEPARTMENTS = [
+    'Frontend Engineering', 'Backend Engineering', 'DevOps', 'Mobile Development',
+    'Data Science', 'Security', 'QA', 'Design', 'Marketing'
+]
+
+
+def create_app():
+    """Create a Flask app backed by an in-memory database"""
+    app = Flask(__name__)
+    app.config.from_object(TestingConfig)
+    db.init_app(app)
+    return app
+
+
+def setup_sample_data(employee_count=200, task_count=1000, seed=42):
+    """Create random employees, tasks and assignments"""
+    rng = random.Random(seed)
+    
+    employees = []
+    for i in range(employee_count):
+        employee = Employee(
+            name=f'Employee {i}',
+            email=f'employee{i}@company.com',
+            department=rng.choice(DEPARTMENTS),
+            skills=','.join(rng.sample(SKILLS, rng.randint(1, 6))),
+            availability=rng.random() < 0.9
+        )
+        db.session.add(employee)
+        employees.append(employee)
+    db.session.flush()
+    
+    for i in range(task_count):
+        task = Task(
+            title=f'Sample Task {i}',
+            priority=rng.choice(['low', 'medium', 'high']),
+            source=rng.choice(['manual', 'jira_bug', 'jira_feature', 'slack_command', 'incident']),
+            estimated_hours=rng.choice([None, 1.0, 2.0, 4.0, 8.0])
+        )
+        db.session.add(task)
+        db.session.flush()
+        
+        db.session.add(TaskAssignment(
+            task_id=task.id,
+            employee_id=rng.choice(employees).id,
+            assigned_by='example',
+            status=rng.choice(['assigned', 'accepted', 'declined'])
+        ))
+    
+    db.session.commit()
+    print(f"Created {employee_count} employees and {task_count} assignments")
+
+
+def check_ranking_parity():
+    """Compare rankings from both scoring engines"""
+    print("\n=== Checking Ranking Parity ===\n")
+    
+    cases = [
+        (task_type, priority, domain, skills)
+        for task_type in ['bug', 'incident', 'feature', 'task']
+        for priority in ['high', 'medium']
+        for domain in ['frontend', 'backend', 'devops', 'data', 'unknown']
+        for skills in [None, ['python', 'api'], ['react']]
+    ]
+    
+    mismatches = 0
+    for task_type, priority, domain, skills in cases:
+        python_ranking = EmployeeMatcher(scoring_engine='python').get_employee_recommendations(
+            task_type, priority, domain, required_skills=skills, limit=1000
+        )
+        numpy_ranking = EmployeeMatcher(scoring_engine='numpy').get_employee_recommendations(
+            task_type, priority, domain, required_skills=skills, limit=1000
+        )
+        
+        if ([(e.id, s) for e, s in python_ranking] !=
+                [(e.id, s) for e, s in numpy_ranking]):
+            mismatches += 1
+            print(f"  ✗ Mismatch for {task_type}/{priority}/{domain}/{skills}")
+    
+    assert mismatches == 0, f"{mismatches} rankings differ between engines"
+    print(f"  ✓ {len(cases)} task profiles ranked identically by both engines")
+
+
+def show_batch_score_matrix():
+    """Score several tasks against every candidate in one pass"""
+    print("\n=== Batch Score Matrix ===\n")
+    
+    matcher = EmployeeMatcher()
+    scorer = VectorizedScorer(matcher).encode(matcher._get_available_employees())
+    
+    tasks = [
+        {'task_type': 'bug', 'priority': 'high', 'required_domain': 'frontend'},
+        {'task_type': 'feature', 'priority': 'medium', 'required_domain': 'backend',
+         'required_skills': ['python', 'api']},
+        {'task_type': 'incident', 'priority': 'high', 'required_domain': 'devops'}
+    ]
+    
+    matrix = scorer.score_matrix(tasks)
+    print(f"Score matrix shape (tasks x employees): {matrix.shape}")
+    for task, row in zip(tasks, matrix):
+        best = scorer.employees[int(row.argmax())]
+        print(f"  {task['task_type']}/{task['required_domain']}: {best.name} ({row.max():.2f})")
+
+
+def main():
+    """Main function to run the example"""
+    app = create_app()
+    
+    with app.app_context():
+        db.create_all()
+        setup_sample_data()
+        
+        check_ranking_parity()
+        show_batch_score_matrix()
+        
+        print("\n=== Example completed successfully! ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Add the employee and task columns the routes and matcher read
+
+Databases created by setup.py already have these columns, while databases
+created from the models before this revision lack them, so only the
+missing ones are added.
+
+Revision ID: 3f9a1c2d7b41
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2d7b41'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+EMPLOYEE_COLUMNS = (
+    ('slack_id', sa.String(length=50)),
+    ('jira_id', sa.String(length=50)),
+    ('department', sa.String(length=100)),
+    ('skills', sa.Text()),
+    ('availability', sa.Boolean()),
+)
+
+TASK_COLUMNS = (
+    ('priority', sa.String(length=20)),
+    ('estimated_hours', sa.Float()),
+    ('due_date', sa.DateTime()),
+    ('source', sa.String(length=50)),
+    ('source_id', sa.String(length=100)),
+    ('created_by', sa.String(length=100)),
+)
+
+
+def _columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _add_missing(table, columns):
+    """Add the columns the table lacks and return their names"""
+    existing = _columns(table)
+    missing = [(name, type_) for name, type_ in columns if name not in existing]
+    if missing:
+        with op.batch_alter_table(table) as batch_op:
+            for name, type_ in missing:
+                batch_op.add_column(sa.Column(name, type_, nullable=True))
+    return {name for name, _ in missing}, existing
+
+
+def upgrade():
+    added, existing = _add_missing('employees', EMPLOYEE_COLUMNS)
+    # Carry the legacy columns over to the ones the matcher reads
+    if 'availability' in added and 'is_available' in existing:
+        op.execute("UPDATE employees SET availability = is_available")
+    if 'skills' in added and 'expertise' in existing:
+        op.execute("UPDATE employees SET skills = expertise")
+
+    added, _ = _add_missing('tasks', TASK_COLUMNS)
+    if 'priority' in added:
+        op.execute("UPDATE tasks SET priority = 'medium'")
+
+
+def downgrade():
+    with op.batch_alter_table('tasks') as batch_op:
+        for name, _ in reversed(TASK_COLUMNS):
+            batch_op.drop_column(name)
+
+    with op.batch_alter_table('employees') as batch_op:
+        for name, _ in reversed(EMPLOYEE_COLUMNS):
+            batch_op.drop_column(name)
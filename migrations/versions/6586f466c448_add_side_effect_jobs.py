@@ -0,0 +1,54 @@
+"""Add the side_effect_jobs queue table
+
+Databases created by setup.py already have the table, so it is only
+created when missing.
+
+Revision ID: 6586f466c448
+Revises: 3f9a1c2d7b41
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6586f466c448'
+down_revision = '3f9a1c2d7b41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('side_effect_jobs'):
+        return
+
+    op.create_table(
+        'side_effect_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=200), nullable=True),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('max_attempts', sa.Integer(), nullable=True),
+        sa.Column('run_after', sa.DateTime(), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        # Enqueueing relies on this to drop a job already queued under the same key
+        sa.UniqueConstraint('idempotency_key')
+    )
+    # Workers claim due pending jobs and expired running leases by status and run_after
+    op.create_index('ix_side_effect_jobs_status', 'side_effect_jobs', ['status'])
+    op.create_index('ix_side_effect_jobs_run_after', 'side_effect_jobs', ['run_after'])
+
+
+def downgrade():
+    op.drop_index('ix_side_effect_jobs_run_after', table_name='side_effect_jobs')
+    op.drop_index('ix_side_effect_jobs_status', table_name='side_effect_jobs')
+    op.drop_table('side_effect_jobs')
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.ext.declarative import declarative_base
@@ -8,6 +9,11 @@ db = SQLAlchemy()
 Base = declarative_base()
 
 
+def _default_expertise(context):
+    """Fall back to the skills list for employees created without expertise"""
+    return context.get_current_parameters().get('skills') or ''
+
+
 class Employee(db.Model):
     """Employee model for storing employee information"""
     __tablename__ = 'employees'
@@ -15,9 +21,15 @@ class Employee(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    expertise = db.Column(db.String(500), nullable=False)  # String of expertise/skills
-    level = db.Column(db.String(20), nullable=False)  # junior, mid, senior
+    expertise = db.Column(db.String(500), nullable=False,
+                          default=_default_expertise)  # String of expertise/skills
+    level = db.Column(db.String(20), nullable=False, default='mid')  # junior, mid, senior
     is_available = db.Column(db.Boolean, default=True)
+    slack_id = db.Column(db.String(50))
+    jira_id = db.Column(db.String(50))
+    department = db.Column(db.String(100))
+    skills = db.Column(db.Text)  # Comma-separated skills read by the matcher
+    availability = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, 
                           onupdate=datetime.now)
@@ -25,6 +37,7 @@ class Employee(db.Model):
     # Relationships
     assigned_tasks = db.relationship('Task', backref='assigned_employee',
                                     lazy=True, foreign_keys='Task.assigned_employee_id')
+    task_assignments = db.relationship('TaskAssignment', backref='employee', lazy=True)
     
     def __repr__(self):
         return f'<Employee {self.name}>'
@@ -57,10 +70,19 @@ class Task(db.Model):
     description = db.Column(db.Text)
     status = db.Column(db.String(20), default='Open')  # Open, In Progress, Closed
     assigned_employee_id = db.Column(db.Integer, db.ForeignKey('employees.id'))
+    priority = db.Column(db.String(20), default='medium')  # low, medium, high, urgent
+    estimated_hours = db.Column(db.Float)
+    due_date = db.Column(db.DateTime)
+    source = db.Column(db.String(50))  # slack, jira, email, web
+    source_id = db.Column(db.String(100))
+    created_by = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now,
                           onupdate=datetime.now)
     
+    # Relationships
+    task_assignments = db.relationship('TaskAssignment', backref='task', lazy=True)
+    
     def __repr__(self):
         return f'<Task {self.title}>'
     
@@ -109,12 +131,18 @@ def add_new_employee(name, email, expertise, level, is_available=True):
             email=email,
             expertise=expertise,
             level=level.lower(),
-            is_available=is_available
+            is_available=is_available,
+            skills=expertise,
+            availability=is_available
         )
         
         db.session.add(employee)
         db.session.commit()
         
+        # Keep the matcher's skill index in sync with the new row
+        from utils.skill_index import skill_index
+        skill_index.update_employee(employee.id, employee.skills)
+        
         return employee
         
     except Exception as e:
@@ -288,4 +316,43 @@ class Notification(db.Model):
     error_message = db.Column(db.Text)
     
     def __repr__(self):
-        return f'<Notification {self.recipient_email}>' 
\ No newline at end of file
+        return f'<Notification {self.recipient_email}>' 
+
+class SideEffectJob(db.Model):
+    """Queued side effect (email, Jira ticket, Slack message) of a committed change"""
+    __tablename__ = 'side_effect_jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    idempotency_key = db.Column(db.String(200), unique=True)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    status = db.Column(db.String(20), default='pending', index=True)  # pending, running, succeeded, failed
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=5)
+    run_after = db.Column(db.DateTime, default=datetime.now, index=True)
+    locked_until = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    result = db.Column(db.Text)  # JSON
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now,
+                          onupdate=datetime.now)
+    finished_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<SideEffectJob {self.id} {self.kind} {self.status}>'
+    
+    def to_dict(self):
+        """Convert job to dictionary"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'idempotency_key': self.idempotency_key,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'run_after': self.run_after.isoformat() if self.run_after else None,
+            'last_error': self.last_error,
+            'result': json.loads(self.result) if self.result else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
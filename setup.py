@@ -141,6 +141,26 @@ def setup_database():
                 status VARCHAR(20) DEFAULT 'sent',
                 error_message TEXT
             );
+            
+            CREATE TABLE IF NOT EXISTS side_effect_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind VARCHAR(50) NOT NULL,
+                idempotency_key VARCHAR(200) UNIQUE,
+                payload TEXT NOT NULL,
+                status VARCHAR(20) DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                max_attempts INTEGER DEFAULT 5,
+                run_after DATETIME DEFAULT CURRENT_TIMESTAMP,
+                locked_until DATETIME,
+                last_error TEXT,
+                result TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                finished_at DATETIME
+            );
+            
+            CREATE INDEX IF NOT EXISTS ix_side_effect_jobs_status ON side_effect_jobs (status);
+            CREATE INDEX IF NOT EXISTS ix_side_effect_jobs_run_after ON side_effect_jobs (run_after);
         """)
         
         conn.commit()
@@ -0,0 +1,101 @@
+import random
+import pytest
+from flask import Flask
+from config.config import TestingConfig
+from models.database import db, Employee, Task, TaskAssignment
+from utils.candidate_filter import candidate_filter
+from utils.capacity_timeline import capacity_timeline
+from utils.ranking_cache import ranking_cache
+from utils.skill_index import skill_index
+from utils.skills import skill_cache
+from utils.static_scores import static_score_table
+from utils.workload_ledger import workload_ledger
+
+SKILLS = [
+    'javascript', 'react', 'vue', 'html', 'css', 'python', 'java', 'node.js',
+    'api', 'sql', 'docker', 'kubernetes', 'aws', 'ios', 'android', 'flutter',
+    'machine learning', 'analytics', 'security', 'encryption', 'selenium',
+    'testing', 'figma', 'ui design'
+]
+
+DEPARTMENTS = [
+    'Frontend Engineering', 'Backend Engineering', 'DevOps', 'Mobile Development',
+    'Data Science', 'Security', 'QA', 'Design', 'Marketing'
+]
+
+SOURCES = ['manual', 'jira_bug', 'jira_feature', 'slack_command', 'incident']
+
+
+def reset_matcher_state():
+    """Drop every process-wide index so the next match reads the test database"""
+    skill_index.is_built = False
+    skill_cache.invalidate()
+    static_score_table.invalidate()
+    candidate_filter.invalidate()
+    capacity_timeline.invalidate()
+    ranking_cache.clear()
+    workload_ledger.is_loaded = False
+
+
+def seed_roster(employee_count=120, task_count=400, seed=42):
+    """
+    Add random employees, tasks and assignments.
+
+    Returns:
+        list: The Employee objects
+    """
+    rng = random.Random(seed)
+
+    employees = []
+    for i in range(employee_count):
+        employee = Employee(
+            name=f'Employee {i}',
+            email=f'employee{i}@company.com',
+            level=rng.choice(['junior', 'mid', 'senior']),
+            department=rng.choice(DEPARTMENTS),
+            skills=','.join(rng.sample(SKILLS, rng.randint(1, 6))),
+            availability=rng.random() < 0.9
+        )
+        db.session.add(employee)
+        employees.append(employee)
+    db.session.flush()
+
+    for i in range(task_count):
+        task = Task(
+            title=f'Sample Task {i}',
+            priority=rng.choice(['low', 'medium', 'high']),
+            source=rng.choice(SOURCES),
+            estimated_hours=rng.choice([None, 1.0, 2.0, 4.0, 8.0])
+        )
+        db.session.add(task)
+        db.session.flush()
+
+        db.session.add(TaskAssignment(
+            task_id=task.id,
+            employee_id=rng.choice(employees).id,
+            assigned_by='test',
+            status=rng.choice(['assigned', 'accepted', 'in_progress', 'completed', 'declined'])
+        ))
+
+    db.session.commit()
+    return employees
+
+
+@pytest.fixture
+def app():
+    """App backed by a fresh in-memory database, with an app context pushed"""
+    app = Flask(__name__)
+    app.config.from_object(TestingConfig)
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        reset_matcher_state()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def roster(app):
+    return seed_roster()
@@ -0,0 +1,51 @@
+from models.database import db, Employee
+from utils.autogen_fallback import AutogenFallback, task_content_key
+from utils.roster_events import roster_version
+
+
+def add_candidates():
+    employees = [
+        Employee(name=f'Dev {i}', email=f'dev{i}@company.com', department='Backend Engineering',
+                 skills='python, api')
+        for i in range(3)
+    ]
+    db.session.add_all(employees)
+    db.session.commit()
+    return employees
+
+
+def test_cached_answer_survives_roster_writes(app):
+    fallback = AutogenFallback(timeout=5)
+    fallback.init_app(app)
+    candidates = add_candidates()
+    calls = []
+
+    def chat():
+        calls.append(1)
+        return {'employee_id': candidates[0].id}, None
+
+    key = task_content_key('Fix login', 'Users get a 500', 'high', candidates)
+    assert fallback.recommend(key, chat) == {'employee_id': candidates[0].id}
+
+    # What any committed assignment does
+    roster_version.bump()
+
+    assert fallback.recommend(task_content_key('Fix login', 'Users get a 500', 'high', candidates), chat) == {
+        'employee_id': candidates[0].id
+    }
+    assert len(calls) == 1
+    assert fallback.cache_hits == 1
+
+
+def test_shortlist_changes_change_the_key(app):
+    candidates = add_candidates()
+    key = task_content_key('Fix login', 'Users get a 500', 'high', candidates)
+
+    assert task_content_key('Fix login', 'Users get a 500', 'high', candidates[:2]) != key
+
+    candidates[1].skills = 'figma'
+    assert task_content_key('Fix login', 'Users get a 500', 'high', candidates) != key
+
+    candidates[1].skills = 'python, api'
+    candidates[1].department = 'Design'
+    assert task_content_key('Fix login', 'Users get a 500', 'high', candidates) != key
@@ -0,0 +1,79 @@
+import numpy as np
+from agents.task_assignment_agent import TaskAssignmentAgent
+from models.database import db, Employee, Task, TaskAssignment
+from utils.batch_assignment import solve_batch_assignment
+
+
+def test_idle_employee_has_an_hours_limit():
+    result = solve_batch_assignment([[5.0, 4.0]], [0, 0], [0, 0], [100], max_tasks=5, max_hours=40)
+
+    assert result == [None]
+
+
+def test_idle_employee_fills_up_to_the_hours_limit():
+    result = solve_batch_assignment([[5.0], [4.0], [3.0]], [0], [0], [30, 30, 10], max_tasks=5, max_hours=40)
+
+    assert result[2] == 0
+    assert sorted(result[:2], key=str) == [0, None]
+
+
+def test_tasks_solved_onto_infeasible_slots_are_retried():
+    # Every full matching puts one task on employee 1's only slot, where
+    # none fits; task 2 must be retried once the first round is applied
+    scores = [[10.0, 0.0], [10.0, 0.0], [0.0, 10.0]]
+    result = solve_batch_assignment(scores, [0, 1], [0, 38], [30, 30, 5], max_tasks=2, max_hours=40)
+
+    assert result[2] == 0
+    assert sorted(result[:2], key=str) == [0, None]
+
+
+def test_random_batches_stay_within_capacity():
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        tasks, employees = rng.integers(1, 30), rng.integers(1, 8)
+        task_counts = rng.integers(0, 6, employees)
+        active_hours = rng.choice([0, 8, 20, 36, 40], employees).astype(float)
+        task_hours = rng.choice([None, 1, 4, 8, 16, 45], tasks).tolist()
+
+        result = solve_batch_assignment(
+            rng.random((tasks, employees)) * 50, task_counts, active_hours, task_hours,
+            max_tasks=5, max_hours=40
+        )
+
+        counts = task_counts.astype(float)
+        hours = active_hours.copy()
+        for task, employee in enumerate(result):
+            if employee is not None:
+                counts[employee] += 1
+                hours[employee] += task_hours[task] or 0
+        assert (counts[counts > task_counts] <= 5).all()
+        assert (hours[hours > active_hours] <= 40).all()
+
+        # Nothing left unplaced could still have been placed; employees at
+        # the hours limit take no more tasks
+        for task, employee in enumerate(result):
+            if employee is None:
+                fits = (counts < 5) & (hours < 40) & (hours + (task_hours[task] or 0) <= 40)
+                assert not fits.any()
+
+
+def test_batches_skip_assigned_and_closed_tasks(app):
+    employee = Employee(name='Alice', email='alice@company.com', department='Backend Engineering',
+                        skills='python, api')
+    open_task = Task(title='Fix the login API', estimated_hours=2.0)
+    assigned_task = Task(title='Fix the signup API', estimated_hours=2.0)
+    closed_task = Task(title='Fix the logout API', status='Closed')
+    db.session.add_all([employee, open_task, assigned_task, closed_task])
+    db.session.flush()
+    db.session.add(TaskAssignment(task_id=assigned_task.id, employee_id=employee.id))
+    db.session.commit()
+
+    agent = TaskAssignmentAgent()
+    tasks = agent.open_tasks([open_task.id, assigned_task.id, closed_task.id])
+    assert tasks == [open_task]
+    assert agent.open_tasks() == [open_task]
+
+    result = agent.assign_tasks_batch(tasks)
+
+    assert [assignment.task_id for assignment in result['assignments']] == [open_task.id]
+    assert TaskAssignment.query.filter_by(task_id=assigned_task.id).count() == 1
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+import pytest
+from models.database import db, Employee, Task, TaskAssignment
+from utils.capacity_timeline import CapacityTimeline
+from utils.employee_matcher import EmployeeMatcher
+
+
+def add_employees(count):
+    employees = [
+        Employee(name=f'Dev {i}', email=f'dev{i}@company.com', department='Backend Engineering',
+                 skills='python, api, sql')
+        for i in range(count)
+    ]
+    db.session.add_all(employees)
+    db.session.commit()
+    return employees
+
+
+def test_empty_timeline_reserves_nothing(app):
+    employees = add_employees(3)
+    timeline = CapacityTimeline()
+
+    reserved, capacity = timeline.reserved_hours([employee.id for employee in employees])
+
+    assert reserved.tolist() == [0.0, 0.0, 0.0]
+    assert capacity == timeline.default_task_days * timeline.hours_per_day
+    assert timeline.free_hours(employees[0].id, datetime.now() + timedelta(days=14)) > 0
+
+
+def test_matcher_plans_capacity_on_an_empty_timeline(app, caplog):
+    add_employees(3)
+    app.config.update(CAPACITY_TIMELINE_ENABLED=True, CAPACITY_TIMELINE_MODE='filter')
+
+    best = EmployeeMatcher().find_best_employee(
+        'feature', 'medium', 'backend', estimated_hours=8, due_date=datetime.now() + timedelta(days=7)
+    )
+
+    assert best is not None
+    assert 'Error planning candidate capacity' not in caplog.text
+
+
+def test_reservations_only_count_for_their_employee(app):
+    busy, idle = add_employees(2)
+    task = Task(title='Migration', estimated_hours=16.0, due_date=datetime.now() + timedelta(days=60))
+    db.session.add(task)
+    db.session.flush()
+    db.session.add(TaskAssignment(task_id=task.id, employee_id=busy.id, status='assigned'))
+    db.session.commit()
+
+    reserved, _ = CapacityTimeline().reserved_hours([idle.id, busy.id, 999], task.due_date)
+
+    assert reserved.tolist() == pytest.approx([0.0, 16.0, 0.0])
@@ -0,0 +1,63 @@
+import pytest
+from models.database import db, Employee
+from utils.employee_matcher import EmployeeMatcher
+
+PROFILES = [
+    ('bug', 'high', 'backend', None),
+    ('feature', 'medium', 'frontend', ['react', 'css']),
+    ('incident', 'high', 'devops', ['docker', 'aws']),
+    ('task', 'low', 'data', ['python']),
+    ('story', 'medium', 'unknown', None)
+]
+
+
+def full_ranking(matcher, employees, task_type, priority, domain, skills):
+    scored = matcher._score_employees(employees, task_type, priority, domain, required_skills=skills)
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return [(employee.id, score) for employee, score in scored]
+
+
+@pytest.mark.parametrize('limit', [1, 3, 10, 1000, None, 0])
+def test_top_k_matches_full_sort(roster, limit):
+    matcher = EmployeeMatcher(scoring_engine='python')
+    employees = matcher._get_available_employees()
+
+    for task_type, priority, domain, skills in PROFILES:
+        expected = full_ranking(matcher, employees, task_type, priority, domain, skills)[:limit or None]
+        top = matcher._top_employees(employees, task_type, priority, domain, limit, required_skills=skills)
+
+        assert [(employee.id, score) for employee, score in top] == expected, (task_type, domain)
+
+
+def test_top_k_keeps_candidate_order_for_ties(app):
+    db.session.add_all(
+        Employee(name=f'Twin {i}', email=f'twin{i}@company.com', department='QA', skills='selenium')
+        for i in range(6)
+    )
+    db.session.commit()
+
+    matcher = EmployeeMatcher(scoring_engine='python')
+    employees = matcher._get_available_employees()
+    top = matcher._top_employees(employees, 'bug', 'medium', 'qa', 3)
+
+    assert [employee.id for employee, _ in top] == [employee.id for employee in employees[:3]]
+    assert len({score for _, score in top}) == 1
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+def test_aliases_match_their_canonical_skill(app, engine):
+    from utils.skill_extractor import SkillExtractor
+
+    # Added first, so it would win a tie
+    other = Employee(name='Lee', email='lee@company.com', department='DevOps', skills='terraform')
+    k8s = Employee(name='Kim', email='kim@company.com', department='DevOps', skills='terraform, K8s')
+    db.session.add_all([other, k8s])
+    db.session.commit()
+
+    required = SkillExtractor().extract('Upgrade the kubernetes cluster')
+    assert required == ['kubernetes']
+
+    best = EmployeeMatcher(scoring_engine=engine).find_best_employee(
+        'task', 'medium', 'devops', required_skills=required
+    )
+    assert best.id == k8s.id
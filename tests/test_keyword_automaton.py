@@ -0,0 +1,69 @@
+import random
+import pytest
+from utils.keyword_automaton import KeywordAutomaton
+
+KEYWORDS = [
+    'c', 'c++', 'c#', '.net', 'asp.net', 'net', 'react', 'react native', 'ui', 'ci', 'ci/cd',
+    'node.js', '++', 'a-'
+]
+
+
+@pytest.fixture
+def automaton():
+    automaton = KeywordAutomaton({'skill': KEYWORDS})
+    automaton.add('deploy', 'devops', prefix=True)
+    automaton.build()
+    return automaton
+
+
+def boundary_scan(automaton, text):
+    """find_words() through the lookbehind form of the expression"""
+    pattern = automaton._compile_word_pattern(automaton._categories, separators=False)
+    return set(pattern.findall(text.lower()))
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('New UI for the build page', {'ui'}),
+    ('Port the React Native app', {'react native'}),
+    ('react and react native', {'react', 'react native'}),
+    ('Set up CI/CD', {'ci/cd'}),
+    ('c++11 and c#', {'c++', 'c#'}),
+    ('c++react', {'c++', 'react'}),
+    ('asp.net core', {'asp.net'}),
+    ('Deployments are slow', {'deploy'}),
+    ('redeploy', set())
+])
+def test_finds_whole_words(automaton, text, expected):
+    assert automaton.find_words(text) == expected
+    assert set(automaton.scan_words(text)) == expected
+
+
+def test_matches_the_lookbehind_expression(automaton):
+    rng = random.Random(7)
+    pieces = KEYWORDS + ['deploy', 'deployment', 'build', 'react-native', '11', 'é', 'Ünit', 'x']
+    separators = ['', ' ', '  ', '.', '/', ',', '\n']
+
+    for _ in range(5000):
+        text = ''.join(
+            rng.choice(pieces) + rng.choice(separators) for _ in range(rng.randint(1, 8))
+        )
+        assert automaton.find_words(text) == boundary_scan(automaton, text), text
+
+
+def test_large_vocabularies_scan_with_the_automaton():
+    rng = random.Random(3)
+    letters = 'abcdefghij'
+    keywords = sorted({''.join(rng.choice(letters) for _ in range(rng.randint(2, 5))) for _ in range(300)})
+    automaton = KeywordAutomaton({'skill': keywords})
+    assert len(keywords) >= automaton.DFA_MIN_KEYWORDS
+
+    for _ in range(200):
+        text = ''.join(rng.choice(letters + ' ') for _ in range(rng.randint(0, 60)))
+        assert set(automaton.scan(text)) == {keyword for keyword in keywords if keyword in text}
+    assert automaton._dfa is not None
+
+
+def test_small_vocabularies_never_build_the_automaton(automaton):
+    text = 'Deploy the React app'
+    assert set(automaton.scan(text)) == {keyword for keyword in KEYWORDS + ['deploy'] if keyword in text.lower()}
+    assert automaton._dfa is None
@@ -0,0 +1,115 @@
+import threading
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from sqlalchemy import event
+from models.database import db, Employee, Task, TaskAssignment
+from utils.capacity_timeline import capacity_timeline
+from utils.employee_matcher import EmployeeMatcher
+from utils.matcher_daemon import MatcherDaemon, DaemonNotifier, get_client, encode_rank_request, decode_rank_request, MAX_RANK_LIMIT
+from utils.workload_ledger import workload_ledger
+
+
+@pytest.fixture
+def daemon(app, tmp_path):
+    daemon = MatcherDaemon(app, str(tmp_path / 'matcher.sock'))
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield daemon
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
+
+
+def test_rescheduled_tasks_name_their_assignees(app, daemon):
+    alice = Employee(name='Alice', email='alice@company.com')
+    bob = Employee(name='Bob', email='bob@company.com')
+    task = Task(title='Fix login', estimated_hours=4.0)
+    db.session.add_all([alice, bob, task])
+    db.session.flush()
+    db.session.add(TaskAssignment(task_id=task.id, employee_id=alice.id, status='assigned'))
+    db.session.commit()
+
+    notifier = DaemonNotifier()
+    app.config['MATCHER_DAEMON_SOCKET'] = daemon.socket_path
+    notifier.init_app(app)
+    try:
+        task.due_date = date(2030, 1, 4)
+        db.session.commit()
+        assert daemon._pending_ids == {alice.id}
+
+        task.title = 'Fix the login page'
+        db.session.commit()
+        assert daemon._pending and daemon._pending_ids == {alice.id}
+    finally:
+        event.remove(db.session, 'after_flush', notifier._after_flush)
+        event.remove(db.session, 'after_commit', notifier._after_commit)
+        event.remove(db.session, 'after_rollback', notifier._after_rollback)
+
+
+def test_invalidations_refresh_only_the_named_employees(app, roster, daemon):
+    workload_ledger.reconcile()
+    capacity_timeline.rebuild()
+    reconciliations, rebuilds = workload_ledger.reconciliations, capacity_timeline.rebuilds
+
+    # A commit in another process
+    employee_id = roster[0].id
+    db.session.execute(
+        TaskAssignment.__table__.update().where(TaskAssignment.employee_id == employee_id).values(
+            status='completed'
+        )
+    )
+    db.session.commit()
+
+    get_client(daemon.socket_path).invalidate([employee_id])
+    daemon._apply_invalidations()
+
+    assert workload_ledger.get(employee_id)['task_count'] == 0
+    assert workload_ledger.reconciliations == reconciliations
+    assert capacity_timeline.is_loaded and capacity_timeline._stale == {employee_id}
+    assert capacity_timeline.rebuilds == rebuilds
+
+    get_client(daemon.socket_path).invalidate(full=True)
+    daemon._apply_invalidations()
+
+    assert workload_ledger.reconciliations == reconciliations + 1
+    assert not capacity_timeline.is_loaded
+
+
+@pytest.mark.parametrize('limit', [None, 3])
+def test_daemon_ranks_like_in_process(app, roster, daemon, limit):
+    def ranking():
+        recommendations = EmployeeMatcher().get_employee_recommendations(
+            'bug', 'high', 'backend', required_skills=['python'], limit=limit
+        )
+        return [(employee.id, score) for employee, score in recommendations]
+
+    expected = ranking()
+    app.config['MATCHER_DAEMON_SOCKET'] = daemon.socket_path
+
+    assert get_client(daemon.socket_path).rank('python', 'bug', 'high', 'backend', limit,
+                                               required_skills=['python']) == expected
+    assert ranking() == expected
+    assert len(expected) == 3 if limit else len(expected) > 3
+
+
+@pytest.mark.parametrize('limit', [0, -1, MAX_RANK_LIMIT + 1])
+def test_out_of_range_limits_are_rejected(limit):
+    with pytest.raises(ValueError):
+        encode_rank_request('python', 'bug', 'high', 'backend', limit)
+
+
+@pytest.mark.parametrize('due_date', [
+    '2030-01-04', '2030-01-04T23:30:00Z', date(2030, 1, 4),
+    datetime(2030, 1, 4, 23, 30, tzinfo=timezone(timedelta(hours=-10))),
+    datetime(2030, 1, 4, 0, 30, tzinfo=timezone(timedelta(hours=14)))
+])
+def test_due_dates_keep_their_calendar_day(due_date):
+    request = decode_rank_request(encode_rank_request('python', 'bug', 'high', 'backend', 5, due_date=due_date))
+    assert request['due_date'] == date(2030, 1, 4)
+
+
+def test_missing_due_dates_stay_missing():
+    for due_date in (None, '', 'next week'):
+        request = decode_rank_request(encode_rank_request('python', 'bug', 'high', 'backend', 5, due_date=due_date))
+        assert request['due_date'] is None
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+from models.database import db, Employee, SideEffectJob
+from utils import side_effects
+from utils.side_effects import SideEffectQueue, SideEffectError, enqueue, job_handler
+
+CALLS = []
+
+
+@job_handler('test_flaky')
+def flaky_job(payload):
+    CALLS.append(payload['name'])
+    if CALLS.count(payload['name']) <= payload['failures']:
+        raise SideEffectError('not yet')
+    return {'calls': CALLS.count(payload['name'])}
+
+
+@pytest.fixture
+def queue(app):
+    CALLS.clear()
+    return SideEffectQueue(workers=0, backoff_base=0, max_attempts=3)
+
+
+def test_enqueue_is_idempotent(app):
+    first = enqueue('test_flaky', {'name': 'a', 'failures': 0}, idempotency_key='key-a')
+    db.session.commit()
+    second = enqueue('test_flaky', {'name': 'a', 'failures': 0}, idempotency_key='key-a')
+    db.session.commit()
+
+    assert second.id == first.id
+    assert SideEffectJob.query.count() == 1
+
+
+def test_enqueue_race_keeps_the_callers_transaction(app, monkeypatch):
+    enqueue('test_flaky', {'name': 'a', 'failures': 0}, idempotency_key='key-a')
+    db.session.commit()
+    existing = SideEffectJob.query.one()
+
+    # The other request's job commits between our check and our insert
+    lookups = iter([None])
+    real_job_for_key = side_effects.job_for_key
+    monkeypatch.setattr(side_effects, 'job_for_key', lambda key: next(lookups, None) or real_job_for_key(key))
+
+    db.session.add(Employee(name='New', email='new@company.com', skills='python'))
+    job = enqueue('test_flaky', {'name': 'a', 'failures': 0}, idempotency_key='key-a')
+    db.session.commit()
+
+    assert job.id == existing.id
+    assert SideEffectJob.query.count() == 1
+    assert Employee.query.filter_by(email='new@company.com').count() == 1
+
+
+def test_failed_attempts_are_retried_until_success(app, queue):
+    job = enqueue('test_flaky', {'name': 'b', 'failures': 2}, idempotency_key='key-b', max_attempts=3)
+    db.session.commit()
+
+    assert queue.run_pending() == 3
+
+    job = db.session.get(SideEffectJob, job.id)
+    assert (job.status, job.attempts, job.last_error) == ('succeeded', 3, None)
+    assert (queue.retried, queue.succeeded) == (2, 1)
+
+
+def test_job_fails_after_max_attempts_and_can_be_retried(app, queue):
+    job = enqueue('test_flaky', {'name': 'c', 'failures': 5}, max_attempts=3)
+    db.session.commit()
+
+    queue.run_pending()
+    job = db.session.get(SideEffectJob, job.id)
+    assert (job.status, job.attempts) == ('failed', 3)
+
+    queue.retry(job.id)
+    queue.run_pending()
+    job = db.session.get(SideEffectJob, job.id)
+    assert (job.status, CALLS.count('c')) == ('succeeded', 6)
+
+
+def test_claims_are_exclusive_until_the_lease_expires(app, queue):
+    job = enqueue('test_flaky', {'name': 'd', 'failures': 0})
+    db.session.commit()
+
+    assert queue._claim(job.id)
+    assert not queue._claim(job.id)
+    assert queue.run_pending() == 0
+
+    # The worker holding the lease died
+    db.session.execute(
+        SideEffectJob.__table__.update().values(locked_until=datetime.now() - timedelta(seconds=1))
+    )
+    db.session.commit()
+
+    assert queue.run_pending() == 1
+    job = db.session.get(SideEffectJob, job.id)
+    assert (job.status, job.attempts) == ('succeeded', 2)
+
+
+def test_workers_start_on_the_first_request(app):
+    queue = SideEffectQueue(workers=1, poll_interval=0.05)
+    app.config['SIDE_EFFECT_WORKERS'] = 1
+    app.add_url_rule('/ping', 'ping', lambda: 'pong')
+    queue.init_app(app)
+
+    try:
+        assert queue.stats()['workers'] == 0
+
+        assert app.test_client().get('/ping').data == b'pong'
+        assert queue.stats()['workers'] == 1
+    finally:
+        queue.stop(timeout=5)
+        event.remove(db.session, 'after_commit', queue._after_commit)
+        event.remove(db.session, 'after_rollback', queue._after_rollback)
@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import event
+from models.database import db, Employee, add_new_employee
+from utils.skill_index import SkillIndex, skill_index
+
+
+@pytest.fixture
+def index(app):
+    index = SkillIndex()
+    index.init_app(app)
+    try:
+        yield index
+    finally:
+        event.remove(db.session, 'after_flush', index._after_flush)
+        event.remove(db.session, 'after_commit', index._after_commit)
+        event.remove(db.session, 'after_rollback', index._after_rollback)
+
+
+def add_employee(name, skills):
+    employee = Employee(name=name, email=f'{name.lower()}@company.com', skills=skills)
+    db.session.add(employee)
+    db.session.commit()
+    return employee
+
+
+def test_committed_writes_are_refreshed_without_a_rebuild(index):
+    alice = add_employee('Alice', 'python, sql')
+    index.ensure_built()
+    assert index.lookup(['python']) == {alice.id}
+
+    bob = add_employee('Bob', 'python, docker')
+    alice.skills = 'figma'
+    db.session.commit()
+    index.ensure_built()
+
+    assert index.lookup(['python']) == {bob.id}
+    assert index.lookup(['figma']) == {alice.id}
+    assert index.rebuilds == 1
+
+    db.session.delete(bob)
+    db.session.commit()
+    index.ensure_built()
+
+    assert index.lookup(['python']) == set()
+
+
+def test_rolled_back_writes_are_ignored(index):
+    alice = add_employee('Alice', 'python')
+    index.ensure_built()
+
+    alice.skills = 'figma'
+    db.session.flush()
+    db.session.rollback()
+    index.ensure_built()
+
+    assert index.lookup(['python']) == {alice.id}
+    assert index.refreshes == 0
+
+
+def test_index_is_rebuilt_after_the_interval(index):
+    alice = add_employee('Alice', 'python')
+    index.ensure_built()
+
+    # A write the session never sees
+    db.session.execute(Employee.__table__.update().values(skills='figma'))
+    db.session.commit()
+    index.ensure_built()
+    assert index.lookup(['python']) == {alice.id}
+
+    index.last_rebuilt -= index.rebuild_interval
+    index.ensure_built()
+
+    assert index.lookup(['figma']) == {alice.id}
+    assert index.rebuilds == 2
+
+
+def test_new_employee_is_indexed_by_skills(index):
+    index.ensure_built()
+    skill_index.ensure_built()
+
+    employee = add_new_employee('Carol', 'carol@company.com', 'kubernetes, aws', 'senior')
+
+    index.ensure_built()
+
+    assert employee.skills == 'kubernetes, aws'
+    assert index.lookup(['aws']) == {employee.id}
+    assert skill_index.lookup(['aws']) == {employee.id}
@@ -0,0 +1,55 @@
+import pytest
+from utils.employee_matcher import EmployeeMatcher
+from utils.vectorized_scorer import VectorizedScorer
+
+PROFILES = [
+    (task_type, priority, domain, skills)
+    for task_type in ['bug', 'incident', 'feature', 'task']
+    for priority in ['high', 'medium', 'low']
+    for domain in ['frontend', 'backend', 'devops', 'data', 'unknown']
+    for skills in [None, ['python', 'api'], ['react']]
+]
+
+
+def ranking(scoring_engine, task_type, priority, domain, skills):
+    recommendations = EmployeeMatcher(scoring_engine=scoring_engine).get_employee_recommendations(
+        task_type, priority, domain, required_skills=skills, limit=1000
+    )
+    return [(employee.id, score) for employee, score in recommendations]
+
+
+@pytest.mark.parametrize('task_type', ['bug', 'incident', 'feature', 'task'])
+def test_numpy_engine_ranks_like_python_engine(roster, task_type):
+    for _, priority, domain, skills in (profile for profile in PROFILES if profile[0] == task_type):
+        expected = ranking('python', task_type, priority, domain, skills)
+
+        assert expected
+        assert ranking('numpy', task_type, priority, domain, skills) == expected, (priority, domain, skills)
+
+
+def test_score_matrix_rows_match_single_task_scores(roster):
+    matcher = EmployeeMatcher()
+    scorer = VectorizedScorer(matcher).encode(matcher._get_available_employees())
+    tasks = [
+        {'task_type': task_type, 'priority': priority, 'required_domain': domain, 'required_skills': skills}
+        for task_type, priority, domain, skills in PROFILES[::7]
+    ]
+
+    matrix = scorer.score_matrix(tasks)
+
+    assert matrix.shape == (len(tasks), len(scorer.employees))
+    for task, row in zip(tasks, matrix):
+        single = scorer.score(
+            task['task_type'], task['priority'], task['required_domain'], task['required_skills']
+        )
+        assert row.tolist() == single.tolist()
+
+
+def test_scores_match_per_employee_scorer(roster):
+    matcher = EmployeeMatcher()
+    employees = matcher._get_available_employees()
+    scores = VectorizedScorer(matcher).encode(employees).score('bug', 'high', 'backend', ['python', 'sql'])
+
+    for employee, score in zip(employees, scores):
+        expected = matcher._calculate_employee_score(employee, 'bug', 'high', 'backend', required_skills=['python', 'sql'])
+        assert float(score) == expected
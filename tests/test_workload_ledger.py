@@ -0,0 +1,94 @@
+import random
+import pytest
+from sqlalchemy import event
+from models.database import db, Task, TaskAssignment
+from utils.workload_ledger import WorkloadLedger
+
+STATUSES = ['assigned', 'accepted', 'in_progress', 'completed', 'declined']
+
+
+@pytest.fixture
+def ledger(app):
+    ledger = WorkloadLedger()
+    ledger.init_app(app)
+    try:
+        yield ledger
+    finally:
+        event.remove(db.session, 'after_flush', ledger._after_flush)
+        event.remove(db.session, 'after_commit', ledger._after_commit)
+        event.remove(db.session, 'after_rollback', ledger._after_rollback)
+
+
+def recount():
+    ledger = WorkloadLedger()
+    ledger.reconcile()
+    return ledger
+
+
+def assert_matches_recount(ledger, employee_ids):
+    expected = recount()
+    for employee_id in employee_ids:
+        workload = ledger.get(employee_id)
+        assert workload == pytest.approx(expected.get(employee_id)), employee_id
+        assert ledger.get_history(employee_id) == expected.get_history(employee_id), employee_id
+
+
+def random_edit(rng, employee_ids):
+    """Make one random assignment or task change in the session"""
+    assignments = TaskAssignment.query.all()
+    choice = rng.random()
+
+    if choice < 0.3 or not assignments:
+        task = Task(
+            title='New task',
+            priority=rng.choice(['low', 'medium', 'high']),
+            source=rng.choice(['manual', 'jira_bug', 'incident']),
+            estimated_hours=rng.choice([None, 2.0, 4.5])
+        )
+        db.session.add(task)
+        db.session.flush()
+        db.session.add(TaskAssignment(
+            task_id=task.id, employee_id=rng.choice(employee_ids), status=rng.choice(STATUSES)
+        ))
+    elif choice < 0.5:
+        rng.choice(assignments).status = rng.choice(STATUSES)
+    elif choice < 0.65:
+        rng.choice(assignments).employee_id = rng.choice(employee_ids)
+    elif choice < 0.8:
+        task = db.session.get(Task, rng.choice(assignments).task_id)
+        task.priority = rng.choice(['low', 'medium', 'high'])
+        task.estimated_hours = rng.choice([None, 1.0, 8.0])
+        task.source = rng.choice(['manual', 'jira_feature', 'slack_command'])
+    else:
+        db.session.delete(rng.choice(assignments))
+
+
+def test_ledger_matches_recount_after_random_writes(ledger, roster):
+    ledger.reconcile()
+    employee_ids = [employee.id for employee in roster]
+    rng = random.Random(3)
+
+    for step in range(150):
+        random_edit(rng, employee_ids)
+        if rng.random() < 0.2:
+            db.session.rollback()
+        else:
+            db.session.commit()
+
+        if step % 25 == 0:
+            assert_matches_recount(ledger, employee_ids)
+
+    assert_matches_recount(ledger, employee_ids)
+    assert ledger.reconcile() == 0
+
+
+def test_reconcile_corrects_writes_outside_the_session(ledger, roster):
+    ledger.reconcile()
+    employee_ids = [employee.id for employee in roster]
+
+    db.session.execute(TaskAssignment.__table__.update().values(status='completed'))
+    db.session.commit()
+
+    assert ledger.reconcile() > 0
+    assert all(ledger.get(employee_id)['task_count'] == 0 for employee_id in employee_ids)
+    assert_matches_recount(ledger, employee_ids)
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from flask import current_app
+from utils.ranking_cache import RankingCache, MISS
+
+
+def task_content_key(title, description, priority, candidates=()):
+    """
+    Hash of the task fields and shortlist an AutoGen recommendation depends on.
+
+    Args:
+        candidates (iterable): Shortlisted employees; only their id,
+            department and skills are hashed, so workload changes and
+            unrelated roster writes keep the key
+    """
+    shortlist = [[employee.id, employee.department or '', employee.skills or ''] for employee in candidates]
+    content = json.dumps([title or '', description or '', priority or '', shortlist])
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def chat_token_usage(chat_result):
+    """
+    Sum the token usage reported on an AutoGen chat result.
+
+    Returns:
+        tuple: (prompt tokens, completion tokens, cost); zeros when the
+            result carries no usage
+    """
+    cost = getattr(chat_result, 'cost', None) or {}
+    # Newer results split usage by cache; older ones are the usage dict itself
+    usage = cost.get('usage_including_cached_inference', cost) if isinstance(cost, dict) else {}
+
+    prompt_tokens = completion_tokens = 0
+    for model_usage in usage.values():
+        if isinstance(model_usage, dict):
+            prompt_tokens += model_usage.get('prompt_tokens', 0)
+            completion_tokens += model_usage.get('completion_tokens', 0)
+    return prompt_tokens, completion_tokens, float(usage.get('total_cost', 0.0) or 0.0)
+
+
+class AutogenFallback:
+    """
+    Bounded, cached runner for AutoGen assignment chats.
+
+    Chats run on a small thread pool with one slot per allowed concurrent
+    chat. A caller that finds every slot taken gets no recommendation right
+    away instead of queueing, and a caller whose chat misses the deadline
+    stops waiting for it. The slot stays taken until the chat really
+    finishes, so a slow LLM holds at most `max_concurrent` threads and
+    never blocks request threads longer than `timeout` seconds.
+
+    Answers are cached by a hash of the task content and its shortlist (see
+    task_content_key), including "no recommendation" answers, so the same
+    task against the same candidates is only sent to the LLM once. Entries
+    aren't tied to the roster version, which every assignment bumps; they
+    expire after `cache_ttl` seconds. A chat that finishes after its caller
+    gave up still fills the cache.
+    """
+
+    def __init__(self, max_concurrent=2, timeout=20.0, cache_size=256, cache_ttl=600):
+        self.timeout = timeout
+        self.max_concurrent = max_concurrent
+        self.cache = RankingCache(max_size=cache_size, ttl=cache_ttl, versioned=False)
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._reset_metrics()
+
+    def init_app(self, app):
+        """Apply the app's fallback limits"""
+        self.timeout = app.config.get('AUTOGEN_TIMEOUT_SECONDS', self.timeout)
+        self.cache.max_size = app.config.get('AUTOGEN_CACHE_SIZE', self.cache.max_size)
+        self.cache.ttl = app.config.get('AUTOGEN_CACHE_TTL_SECONDS', self.cache.ttl)
+
+        max_concurrent = app.config.get('AUTOGEN_MAX_CONCURRENT', self.max_concurrent)
+        with self._lock:
+            if max_concurrent != self.max_concurrent:
+                self.max_concurrent = max_concurrent
+                self._slots = threading.BoundedSemaphore(max_concurrent)
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+
+    def recommend(self, key, chat):
+        """
+        Get a cached recommendation, or run a chat for one within the limits.
+
+        Args:
+            key (str): Task content key (see task_content_key)
+            chat (callable): Runs the conversation in the app context and
+                returns (recommendation or None, AutoGen chat result)
+
+        Returns:
+            dict or None: The recommendation, or None when the chat found
+                none, every slot was busy or the deadline passed
+
+        Raises:
+            Exception: Whatever the chat raised
+        """
+        cached = self.cache.get(key)
+        if cached is not MISS:
+            with self._lock:
+                self.cache_hits += 1
+            return cached
+
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            current_app.logger.warning(
+                f"AutoGen fallback skipped: {self.max_concurrent} chats already running"
+            )
+            return None
+
+        app = current_app._get_current_object()
+        try:
+            future = self._get_executor().submit(self._run, app, slots, key, chat)
+        except Exception:
+            slots.release()
+            raise
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+            current_app.logger.warning(
+                f"AutoGen fallback gave up after {self.timeout}s; the chat keeps its slot until it ends"
+            )
+            return None
+
+    def stats(self):
+        """Get call, latency and token counters"""
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'timeout_seconds': self.timeout,
+                'running': self.running,
+                'chats': self.chats,
+                'cache_hits': self.cache_hits,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+                'avg_latency_ms': round(self.latency_ms / self.chats, 1) if self.chats else 0.0,
+                'max_latency_ms': round(self.max_latency_ms, 1),
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens,
+                'cost': round(self.cost, 6),
+                'cache': self.cache.stats()
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._reset_metrics()
+
+    def _reset_metrics(self):
+        self.running = 0
+        self.chats = 0
+        self.cache_hits = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent, thread_name_prefix='autogen-fallback'
+                )
+            return self._executor
+
+    def _run(self, app, slots, key, chat):
+        """Run one chat on a pool thread, record its metrics and cache its answer"""
+        with self._lock:
+            self.running += 1
+        started = time.perf_counter()
+        try:
+            with app.app_context():
+                recommendation, chat_result = chat()
+            prompt_tokens, completion_tokens, cost = chat_token_usage(chat_result)
+            self.cache.put(key, recommendation)
+            return recommendation
+        except Exception:
+            prompt_tokens = completion_tokens = 0
+            cost = 0.0
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self.running -= 1
+                self.chats += 1
+                self.latency_ms += elapsed_ms
+                self.max_latency_ms = max(self.max_latency_ms, elapsed_ms)
+                self.prompt_tokens += prompt_tokens
+                self.completion_tokens += completion_tokens
+                self.cost += cost
+            slots.release()
+
+
+# Process-wide limits shared by every TaskAssignmentAgent
+autogen_fallback = AutogenFallback()
@@ -0,0 +1,87 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from utils.employee_matcher import MAX_ACTIVE_TASKS, MAX_ACTIVE_HOURS
+
+
+# Score given to task/slot pairs that would break the hours limit
+INFEASIBLE_SCORE = -1e9
+
+
+def solve_batch_assignment(score_matrix, task_counts, active_hours, task_hours,
+                           max_tasks=MAX_ACTIVE_TASKS, max_hours=MAX_ACTIVE_HOURS):
+    """
+    Solve a capacity-constrained task assignment over a score matrix.
+    
+    Each employee gets one column per free capacity slot (up to max_tasks
+    active tasks) and the Hungarian algorithm picks the assignment with the
+    highest total score. Slot k of an employee carries the workload score the
+    employee would have after k more tasks, so load is spread instead of
+    piling onto the single best match. Assignments that would push an
+    employee past max_hours are rejected, so a task longer than max_hours is
+    never placed. Every task left unplaced by a round is re-solved against
+    the remaining capacity until a round places nothing.
+    
+    Args:
+        score_matrix (numpy.ndarray): tasks x employees match scores
+        task_counts (sequence): Current active task count per employee
+        active_hours (sequence): Current active estimated hours per employee
+        task_hours (sequence): Estimated hours per task (None counts as 0)
+        max_tasks (int): Active task limit per employee
+        max_hours (float): Active hours limit per employee
+        
+    Returns:
+        list: Employee column index per task, or None if it could not be placed
+    """
+    score_matrix = np.asarray(score_matrix, dtype=float)
+    task_count, employee_count = score_matrix.shape
+    task_counts = np.array(task_counts, dtype=float)
+    active_hours = np.array(active_hours, dtype=float)
+    task_hours = np.array([hours or 0 for hours in task_hours], dtype=float)
+    
+    result = [None] * task_count
+    pending = list(range(task_count))
+    
+    while pending:
+        # Free capacity slots per employee
+        slots = np.maximum(0, max_tasks - task_counts).astype(int)
+        slots[active_hours >= max_hours] = 0
+        if not slots.any():
+            break
+        
+        slot_employee = np.repeat(np.arange(employee_count), slots)
+        slot_offset = np.concatenate([np.arange(count) for count in slots])
+        
+        # Workload score change for taking the slot (task-count part of _calculate_workload_score)
+        current = np.maximum(0, 1.0 - task_counts[slot_employee] / max_tasks)
+        after = np.maximum(0, 1.0 - (task_counts[slot_employee] + slot_offset) / max_tasks)
+        slot_scores = score_matrix[np.ix_(pending, slot_employee)] + (after - current) * 0.6 * 10
+        
+        feasible = active_hours[slot_employee] + task_hours[pending][:, None] <= max_hours
+        slot_scores = np.where(feasible, slot_scores, INFEASIBLE_SCORE)
+        
+        rows, columns = linear_sum_assignment(slot_scores, maximize=True)
+        
+        # Apply best matches first; a task that no longer fits after earlier
+        # placements in this round is skipped
+        placed = set()
+        for row, column in sorted(zip(rows, columns), key=lambda rc: -slot_scores[rc]):
+            if not feasible[row, column]:
+                continue
+            
+            task = pending[row]
+            employee = slot_employee[column]
+            if active_hours[employee] + task_hours[task] > max_hours:
+                continue
+            
+            result[task] = int(employee)
+            task_counts[employee] += 1
+            active_hours[employee] += task_hours[task]
+            placed.add(task)
+        
+        if not placed:
+            break
+        # Retry every other task, including those solved onto an infeasible
+        # slot or left without a slot when tasks outnumbered slots
+        pending = [task for task in pending if task not in placed]
+    
+    return result
@@ -0,0 +1,415 @@
+import threading
+import time
+import numpy as np
+from flask import current_app
+from sqlalchemy import event, func
+from utils.skills import parse_skills, normalize_skill
+from utils.keyword_automaton import KeywordAutomaton
+from utils.workload_ledger import ACTIVE_ASSIGNMENT_STATUSES
+from utils.roster_events import touched_employee_ids
+
+# Session.info key for employee ids written in the current transaction
+PENDING_KEY = 'candidate_filter_pending'
+
+# Hard constraints understood by CandidateFilter.filter
+CONSTRAINT_KEYS = ('level', 'department', 'domain', 'max_active_tasks')
+
+
+def normalize_constraints(constraints):
+    """
+    Validate hard candidate constraints and normalize them into a hashable key.
+
+    Args:
+        constraints (dict): Any of level (str or list), department (str or
+            list), domain (str) and max_active_tasks (int)
+
+    Returns:
+        tuple: Sorted (name, value) pairs; empty when there are no constraints
+
+    Raises:
+        ValueError: On unknown constraint names or malformed values
+    """
+    if not constraints:
+        return ()
+    if not isinstance(constraints, dict):
+        raise ValueError("Constraints must be an object")
+
+    normalized = []
+    for name, value in constraints.items():
+        if name not in CONSTRAINT_KEYS:
+            raise ValueError(f"Constraint must be one of: {', '.join(CONSTRAINT_KEYS)}")
+        if value is None:
+            continue
+
+        if name == 'max_active_tasks':
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                raise ValueError("max_active_tasks must be a non-negative integer")
+        elif name == 'domain':
+            if not isinstance(value, str):
+                raise ValueError("domain must be a string")
+            value = value.lower()
+        else:
+            values = [value] if isinstance(value, str) else value
+            if not isinstance(values, (list, tuple)) or not all(isinstance(v, str) for v in values):
+                raise ValueError(f"{name} must be a string or a list of strings")
+            value = tuple(sorted({v.lower() for v in values}))
+
+        normalized.append((name, value))
+
+    return tuple(sorted(normalized))
+
+
+class CandidateFilter:
+    """
+    In-memory bitsets over the roster for hard candidate constraints.
+
+    Every employee gets a slot, and each slot has one bit per fact a hard
+    constraint can test: availability, level, department and each domain
+    keyword contained in one of the employee's skills, alongside the count
+    of active assignments. A request like "senior, backend, available, at
+    most 5 tasks" becomes a handful of NumPy bool operations over the whole
+    roster instead of per-employee checks.
+
+    Employee and assignment writes are recorded at flush and the touched
+    employees are refreshed from the database on the next lookup after the
+    transaction commits. Writes the session can't see (bulk SQL, other
+    processes) are picked up by a full rebuild every `rebuild_interval`
+    seconds; without session events the bitsets are rebuilt on every lookup.
+    """
+
+    def __init__(self, rebuild_interval=300):
+        self._lock = threading.RLock()
+        self._slots = {}            # employee id -> slot
+        self._levels = {}           # lowercased level -> bool array
+        self._departments = {}      # lowercased department -> bool array
+        self._stale = set()         # committed employee ids awaiting a refresh
+        self._keyword_columns = {}  # domain keyword -> column
+        self._domain_columns = {}   # domain -> keyword columns
+        self._keyword_automaton = None
+        self._allocate(0)
+        self.rebuild_interval = rebuild_interval
+        self.is_loaded = False
+        self.is_listening = False
+        self.last_rebuilt = 0.0
+        self.rebuilds = 0
+        self.refreshes = 0
+
+    def init_app(self, app):
+        """Start tracking employee and assignment writes made through the app's session"""
+        from models.database import db
+
+        self.rebuild_interval = app.config.get(
+            'CANDIDATE_FILTER_REBUILD_SECONDS', self.rebuild_interval
+        )
+
+        if not app.config.get('CANDIDATE_FILTER_ENABLED', True) or self.is_listening:
+            return
+
+        event.listen(db.session, 'after_flush', self._after_flush)
+        event.listen(db.session, 'after_commit', self._after_commit)
+        event.listen(db.session, 'after_rollback', self._after_rollback)
+        self.is_listening = True
+
+    def filter(self, level=None, department=None, domain=None, max_active_tasks=None):
+        """
+        Get ids of available employees meeting every given constraint.
+
+        Args:
+            level (str or list): Accepted levels (exact, case-insensitive)
+            department (str or list): Department names; an employee matches
+                when their department contains one of them
+            domain (str): Domain whose keywords one of the employee's skills
+                must contain; unknown domains match nobody
+            max_active_tasks (int): Highest accepted count of active assignments
+
+        Returns:
+            set: Matching employee ids
+        """
+        self.ensure_loaded()
+
+        with self._lock:
+            mask = self._present & self._available
+
+            if level is not None:
+                levels = {level.lower()} if isinstance(level, str) else {value.lower() for value in level}
+                mask &= self._any_of(self._levels[value] for value in levels if value in self._levels)
+
+            if department is not None:
+                wanted = [department.lower()] if isinstance(department, str) else [d.lower() for d in department]
+                mask &= self._any_of(
+                    bits for name, bits in self._departments.items()
+                    if any(value in name for value in wanted)
+                )
+
+            if domain is not None:
+                columns = self._domain_columns.get(domain.lower())
+                if columns:
+                    mask &= self._keywords[:, columns].any(axis=1)
+                else:
+                    mask[:] = False
+
+            if max_active_tasks is not None:
+                mask &= self._task_counts <= max_active_tasks
+
+            return set(self._ids[mask].tolist())
+
+    def ensure_loaded(self):
+        """Rebuild when due, otherwise refresh employees written since the last lookup"""
+        if (not self.is_loaded or not self.is_listening
+                or time.monotonic() - self.last_rebuilt >= self.rebuild_interval):
+            self.rebuild()
+            return
+
+        if self._stale:
+            with self._lock:
+                stale, self._stale = self._stale, set()
+            if stale:
+                self._load(stale)
+                self.refreshes += 1
+
+    def rebuild(self):
+        """Replace every bitset with the current database state"""
+        with self._lock:
+            self._slots = {}
+            self._levels = {}
+            self._departments = {}
+            self._stale = set()
+            self._allocate(0)
+            self._load(None)
+            self.is_loaded = True
+            self.last_rebuilt = time.monotonic()
+            self.rebuilds += 1
+
+    def invalidate(self, employee_ids=None):
+        """Refresh the given employees on the next lookup, or rebuild everything"""
+        with self._lock:
+            if employee_ids is None:
+                self.is_loaded = False
+            else:
+                self._stale.update(employee_ids)
+
+    def to_arrays(self):
+        """
+        Export the bitsets for an index snapshot.
+
+        Returns:
+            tuple: (dict of arrays, dict of level, department and keyword names
+                in row/column order)
+        """
+        self.ensure_loaded()
+
+        with self._lock:
+            count = len(self._slots)
+            levels = list(self._levels)
+            departments = list(self._departments)
+            arrays = {
+                'filter_ids': self._ids[:count],
+                'filter_present': self._present[:count],
+                'filter_available': self._available[:count],
+                'filter_task_counts': self._task_counts[:count],
+                'filter_keywords': self._keywords[:count],
+                'filter_levels': np.array(
+                    [self._levels[name][:count] for name in levels], dtype=bool
+                ).reshape(len(levels), count),
+                'filter_departments': np.array(
+                    [self._departments[name][:count] for name in departments], dtype=bool
+                ).reshape(len(departments), count)
+            }
+            names = {'levels': levels, 'departments': departments, 'keywords': list(self._keyword_columns)}
+            return arrays, names
+
+    def load_arrays(self, arrays, names):
+        """
+        Replace the bitsets with ones exported by to_arrays.
+
+        The arrays are used in place, so copy-on-write memory maps load
+        without reading the file up front.
+
+        Returns:
+            bool: False when the snapshot's keyword columns don't match this build
+        """
+        with self._lock:
+            self._automaton()
+            if names['keywords'] != list(self._keyword_columns):
+                return False
+
+            self._ids = arrays['filter_ids']
+            self._present = arrays['filter_present']
+            self._available = arrays['filter_available']
+            self._task_counts = arrays['filter_task_counts']
+            self._keywords = arrays['filter_keywords']
+            self._levels = dict(zip(names['levels'], arrays['filter_levels']))
+            self._departments = dict(zip(names['departments'], arrays['filter_departments']))
+            self._slots = {employee_id: slot for slot, employee_id in enumerate(self._ids.tolist())}
+            self._stale = set()
+            self.is_loaded = True
+            self.last_rebuilt = time.monotonic()
+            return True
+
+    def refresh_task_counts(self):
+        """Reload every active assignment count with one aggregate query"""
+        from models.database import db, TaskAssignment
+
+        counts = db.session.query(
+            TaskAssignment.employee_id, func.count(TaskAssignment.id)
+        ).filter(
+            TaskAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES)
+        ).group_by(TaskAssignment.employee_id).all()
+
+        with self._lock:
+            self._task_counts[:] = 0
+            for employee_id, count in counts:
+                slot = self._slots.get(employee_id)
+                if slot is not None:
+                    self._task_counts[slot] = count
+
+    def stats(self):
+        """Get roster size and rebuild/refresh counters"""
+        return {
+            'employees': len(self._slots),
+            'levels': len(self._levels),
+            'departments': len(self._departments),
+            'keywords': len(self._keyword_columns),
+            'rebuilds': self.rebuilds,
+            'refreshes': self.refreshes,
+            'stale': len(self._stale)
+        }
+
+    def _load(self, employee_ids):
+        """Set the bits of the given employees (all employees when None) from the database"""
+        from models.database import db, Employee, TaskAssignment
+
+        try:
+            query = db.session.query(
+                Employee.id, Employee.availability, Employee.level, Employee.department, Employee.skills
+            )
+            counts = db.session.query(
+                TaskAssignment.employee_id, func.count(TaskAssignment.id)
+            ).filter(
+                TaskAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES)
+            )
+            if employee_ids is not None:
+                query = query.filter(Employee.id.in_(employee_ids))
+                counts = counts.filter(TaskAssignment.employee_id.in_(employee_ids))
+
+            task_counts = dict(counts.group_by(TaskAssignment.employee_id).all())
+            rows = query.all()
+        except Exception as e:
+            current_app.logger.error(f"Error loading candidate filter: {str(e)}")
+            return
+
+        with self._lock:
+            automaton = self._automaton()
+            seen = set()
+            for employee_id, availability, level, department, skills in rows:
+                seen.add(employee_id)
+                slot = self._slot(employee_id)
+                self._clear(slot)
+                self._present[slot] = True
+                self._available[slot] = bool(availability)
+                self._task_counts[slot] = task_counts.get(employee_id, 0)
+                if level:
+                    self._bits(self._levels, level.lower())[slot] = True
+                if department:
+                    self._bits(self._departments, department.lower())[slot] = True
+                for skill in parse_skills(skills):
+                    for keyword in automaton.cached_categories(normalize_skill(skill)):
+                        self._keywords[slot, self._keyword_columns[keyword]] = True
+
+            # Employees no longer in the database keep their slot with every bit cleared
+            for employee_id in (employee_ids or ()):
+                if employee_id not in seen and employee_id in self._slots:
+                    self._clear(self._slots[employee_id])
+
+    def _automaton(self):
+        """Automaton reporting the domain keywords contained in a skill"""
+        if self._keyword_automaton is None:
+            from utils.employee_matcher import DOMAIN_EXPERTISE_MAP
+
+            for domain, keywords in DOMAIN_EXPERTISE_MAP.items():
+                self._domain_columns[domain] = [
+                    self._keyword_columns.setdefault(keyword, len(self._keyword_columns))
+                    for keyword in keywords
+                ]
+            keywords = np.zeros((len(self._ids), len(self._keyword_columns)), dtype=bool)
+            keywords[:, :self._keywords.shape[1]] = self._keywords
+            self._keywords = keywords
+
+            automaton = KeywordAutomaton({keyword: [keyword] for keyword in self._keyword_columns})
+            automaton.build()
+            self._keyword_automaton = automaton
+        return self._keyword_automaton
+
+    def _allocate(self, capacity):
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._present = np.zeros(capacity, dtype=bool)
+        self._available = np.zeros(capacity, dtype=bool)
+        self._task_counts = np.zeros(capacity, dtype=np.int32)
+        self._keywords = np.zeros((capacity, len(self._keyword_columns)), dtype=bool)
+
+    def _slot(self, employee_id):
+        """Get an employee's slot, growing every array when the roster is full"""
+        slot = self._slots.get(employee_id)
+        if slot is not None:
+            return slot
+
+        slot = len(self._slots)
+        capacity = len(self._ids)
+        if slot >= capacity:
+            capacity = max(64, capacity * 2)
+            self._ids = np.resize(self._ids, capacity)
+            for name in ('_present', '_available', '_task_counts'):
+                grown = np.zeros(capacity, dtype=getattr(self, name).dtype)
+                grown[:slot] = getattr(self, name)[:slot]
+                setattr(self, name, grown)
+            keywords = np.zeros((capacity, self._keywords.shape[1]), dtype=bool)
+            keywords[:slot] = self._keywords[:slot]
+            self._keywords = keywords
+            for bitsets in (self._levels, self._departments):
+                for name, bits in bitsets.items():
+                    grown = np.zeros(capacity, dtype=bool)
+                    grown[:slot] = bits[:slot]
+                    bitsets[name] = grown
+
+        self._ids[slot] = employee_id
+        self._slots[employee_id] = slot
+        return slot
+
+    def _bits(self, bitsets, name):
+        bits = bitsets.get(name)
+        if bits is None:
+            bits = bitsets[name] = np.zeros(len(self._ids), dtype=bool)
+        return bits
+
+    def _clear(self, slot):
+        self._present[slot] = False
+        self._available[slot] = False
+        self._task_counts[slot] = 0
+        self._keywords[slot] = False
+        for bitsets in (self._levels, self._departments):
+            for bits in bitsets.values():
+                bits[slot] = False
+
+    def _any_of(self, bitsets):
+        mask = np.zeros(len(self._ids), dtype=bool)
+        for bits in bitsets:
+            mask |= bits
+        return mask
+
+    def _after_flush(self, session, flush_context):
+        employee_ids = touched_employee_ids(session)
+        if employee_ids:
+            session.info.setdefault(PENDING_KEY, set()).update(employee_ids)
+
+    def _after_commit(self, session):
+        pending = session.info.pop(PENDING_KEY, None)
+        if pending:
+            with self._lock:
+                self._stale.update(pending)
+
+    def _after_rollback(self, session):
+        session.info.pop(PENDING_KEY, None)
+
+
+# Process-wide bitsets shared by all matchers
+candidate_filter = CandidateFilter()
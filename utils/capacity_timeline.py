@@ -0,0 +1,338 @@
+import threading
+import time
+from datetime import date, datetime, timedelta
+import numpy as np
+from flask import current_app
+from sqlalchemy import event
+from utils.workload_ledger import ACTIVE_ASSIGNMENT_STATUSES
+from utils.roster_events import touched_employee_ids, task_assignee_ids
+
+# Session.info key for employee ids whose reservations changed in the current transaction
+PENDING_KEY = 'capacity_timeline_pending'
+
+# What the matcher does with candidates lacking the hours a task needs before its due date
+CAPACITY_MODES = ('penalize', 'filter')
+
+# Task columns that move an assignee's reservations
+TIMELINE_TASK_COLUMNS = ('estimated_hours', 'due_date')
+
+# A Monday, day zero of the working-day numbering
+_EPOCH = date(2000, 1, 3).toordinal()
+
+
+def working_day(day):
+    """
+    Number a date by working days (Monday to Friday) since a fixed Monday.
+
+    Saturdays and Sundays get the number of the following Monday, so
+    [working_day(a), working_day(b)) counts the working days from a up to
+    but excluding b.
+    """
+    weeks, weekday = divmod(day.toordinal() - _EPOCH, 7)
+    return weeks * 5 + min(weekday, 5)
+
+
+def as_date(value):
+    """Get the date of a datetime, date or ISO 8601 string; None when missing or malformed"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+        except ValueError:
+            return None
+    return None
+
+
+class CapacityTimeline:
+    """
+    Per-employee reserved hours over the coming working days.
+
+    Each active assignment with estimated hours reserves them evenly over
+    the working days from its assignment date through its task's due date
+    (`default_task_days` when the task has no due date). Work on days
+    already past is assumed done, and overdue work is reserved for today.
+    Every employee with a reservation gets one row of cumulative reserved
+    hours from today over `horizon_days`, so "how many hours does each
+    candidate have booked before this due date" is a single column read
+    across the candidate rows, however many tasks are active.
+
+    Assignment and task writes are recorded at flush and the affected
+    employees' rows are recomputed on the next lookup after the transaction
+    commits. The timeline is rebuilt at the first lookup of each day, and
+    every `rebuild_interval` seconds to pick up writes the session can't
+    see; without session events it is rebuilt on every lookup.
+    """
+
+    def __init__(self, hours_per_day=8.0, horizon_days=130, default_task_days=5, rebuild_interval=300):
+        self._lock = threading.RLock()
+        self._rows = {}      # employee id -> row
+        self._stale = set()  # committed employee ids awaiting a refresh
+        self.hours_per_day = hours_per_day
+        self.horizon_days = horizon_days
+        self.default_task_days = default_task_days
+        self.rebuild_interval = rebuild_interval
+        self._allocate(0)
+        self.origin = None
+        self.is_loaded = False
+        self.is_listening = False
+        self.last_rebuilt = 0.0
+        self.rebuilds = 0
+        self.refreshes = 0
+
+    def init_app(self, app):
+        """Start tracking assignment and task writes made through the app's session"""
+        from models.database import db
+
+        self.hours_per_day = app.config.get('CAPACITY_HOURS_PER_DAY', self.hours_per_day)
+        self.horizon_days = app.config.get('CAPACITY_HORIZON_DAYS', self.horizon_days)
+        self.default_task_days = app.config.get('CAPACITY_DEFAULT_TASK_DAYS', self.default_task_days)
+        self.rebuild_interval = app.config.get(
+            'CAPACITY_TIMELINE_REBUILD_SECONDS', self.rebuild_interval
+        )
+        self.is_loaded = False
+
+        if not app.config.get('CAPACITY_TIMELINE_ENABLED', True) or self.is_listening:
+            return
+
+        event.listen(db.session, 'after_flush', self._after_flush)
+        event.listen(db.session, 'after_commit', self._after_commit)
+        event.listen(db.session, 'after_rollback', self._after_rollback)
+        self.is_listening = True
+
+    def reserved_hours(self, employee_ids, due_date=None):
+        """
+        Get the hours each employee has reserved from today until a due date.
+
+        Args:
+            employee_ids (list): Employee ids
+            due_date (datetime, date or str): Last day of the window, inclusive;
+                without one the window is the next `default_task_days` working days
+
+        Returns:
+            tuple: (numpy.ndarray of reserved hours aligned with employee_ids,
+                hours of capacity in the window)
+        """
+        self.ensure_loaded()
+
+        with self._lock:
+            days = self._window_days(as_date(due_date))
+            rows = np.fromiter(
+                (self._rows.get(employee_id, -1) for employee_id in employee_ids),
+                dtype=np.int64, count=len(employee_ids)
+            )
+            # Index only employees with a row; with no reservations the matrix has no rows at all
+            reserved = np.zeros(len(rows))
+            known = rows >= 0
+            reserved[known] = self._cumulative[rows[known], days]
+            return reserved, days * self.hours_per_day
+
+    def free_hours(self, employee_id, due_date=None):
+        """Get the unreserved hours an employee has from today until a due date"""
+        reserved, capacity = self.reserved_hours([employee_id], due_date)
+        return capacity - float(reserved[0])
+
+    def annotate(self, employees, estimated_hours=None, due_date=None, mode='penalize'):
+        """
+        Set each candidate's capacity load for a task.
+
+        The load is the share of the candidate's capacity until the due date
+        that is reserved, counting the task's own estimated hours, and
+        replaces active hours over a flat 40-hour week in the workload score.
+        A load above 1 means the task doesn't fit before its due date.
+
+        Args:
+            employees (list): EmployeeSnapshot records
+            estimated_hours (float): Estimated hours for the task
+            due_date (datetime, date or str): Task due date
+            mode (str): 'penalize' only scores the load; 'filter' also drops
+                candidates the task doesn't fit when its hours are known
+
+        Returns:
+            list: The candidates kept, in their original order
+        """
+        if not employees:
+            return employees
+
+        reserved, capacity = self.reserved_hours([employee.id for employee in employees], due_date)
+        loads = (reserved + (estimated_hours or 0)) / capacity
+
+        kept = []
+        for employee, load in zip(employees, loads.tolist()):
+            # Tolerance for float residue when the task exactly fills the window
+            if mode == 'filter' and estimated_hours and load > 1.0 + 1e-9:
+                continue
+            employee.current_workload['capacity_load'] = load
+            kept.append(employee)
+        return kept
+
+    def ensure_loaded(self):
+        """Rebuild when due, otherwise refresh employees written since the last lookup"""
+        if (not self.is_loaded or not self.is_listening
+                or self.origin != working_day(date.today())
+                or time.monotonic() - self.last_rebuilt >= self.rebuild_interval):
+            self.rebuild()
+            return
+
+        if self._stale:
+            with self._lock:
+                stale, self._stale = self._stale, set()
+            if stale:
+                self._load(stale)
+                self.refreshes += 1
+
+    def rebuild(self):
+        """Replace every row with reservations from the current database state"""
+        with self._lock:
+            self._rows = {}
+            self._stale = set()
+            self.origin = working_day(date.today())
+            self._allocate(0)
+            self._load(None)
+            self.is_loaded = True
+            self.last_rebuilt = time.monotonic()
+            self.rebuilds += 1
+
+    def invalidate(self, employee_ids=None):
+        """Refresh the given employees on the next lookup, or rebuild everything"""
+        with self._lock:
+            if employee_ids is None:
+                self.is_loaded = False
+            else:
+                self._stale.update(employee_ids)
+
+    def stats(self):
+        """Get timeline size and rebuild/refresh counters"""
+        return {
+            'employees': len(self._rows),
+            'horizon_days': self.horizon_days,
+            'hours_per_day': self.hours_per_day,
+            'rebuilds': self.rebuilds,
+            'refreshes': self.refreshes,
+            'stale': len(self._stale)
+        }
+
+    def _load(self, employee_ids):
+        """Recompute the rows of the given employees (all employees when None) from the database"""
+        from models.database import db, Task, TaskAssignment
+
+        try:
+            query = db.session.query(
+                TaskAssignment.employee_id, TaskAssignment.assigned_at, Task.estimated_hours, Task.due_date
+            ).join(
+                Task, Task.id == TaskAssignment.task_id
+            ).filter(
+                TaskAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
+                Task.estimated_hours > 0
+            )
+            if employee_ids is not None:
+                query = query.filter(TaskAssignment.employee_id.in_(employee_ids))
+            reservations = query.all()
+        except Exception as e:
+            current_app.logger.error(f"Error loading capacity timeline: {str(e)}")
+            return
+
+        with self._lock:
+            horizon = self.horizon_days
+            for employee_id in (employee_ids or ()):
+                row = self._rows.get(employee_id)
+                if row is not None:
+                    self._cumulative[row] = 0
+
+            # Reserved hours per day as differences: +per_day where a window
+            # starts and -per_day where it ends
+            rows, starts, ends, per_day = [], [], [], []
+            for employee_id, assigned_at, hours, due_date in reservations:
+                window = self._reservation(as_date(assigned_at), as_date(due_date), hours)
+                if window is None:
+                    continue
+                rows.append(self._row(employee_id))
+                starts.append(window[0])
+                ends.append(window[1])
+                per_day.append(window[2])
+
+            if not rows:
+                return
+
+            rows = np.array(rows)
+            touched = np.unique(rows)
+            index = np.searchsorted(touched, rows)
+            daily = np.zeros((len(touched), horizon + 1))
+            np.add.at(daily, (index, np.array(starts)), per_day)
+            np.add.at(daily, (index, np.array(ends)), np.negative(per_day))
+            daily = np.cumsum(daily[:, :horizon], axis=1)
+            self._cumulative[touched, 1:] += np.cumsum(daily, axis=1)
+
+    def _reservation(self, assigned_on, due_on, hours):
+        """
+        Get the days an assignment occupies, relative to today.
+
+        Returns:
+            tuple or None: (first day, end day exclusive, hours per day), or
+                None when the remaining work falls beyond the horizon
+        """
+        origin = self.origin
+        start = working_day(assigned_on) if assigned_on else origin
+        if due_on:
+            end = working_day(due_on + timedelta(days=1))
+        else:
+            end = start + self.default_task_days
+        end = max(end, start + 1)
+
+        if end <= origin:
+            # Overdue: everything left is due today
+            return 0, 1, hours
+
+        # The share of the window already past is taken as done
+        first = max(start, origin)
+        if first - origin >= self.horizon_days:
+            return None
+        return first - origin, min(end - origin, self.horizon_days), hours / (end - start)
+
+    def _window_days(self, due_on):
+        """Working days from today through the due date, within 1 and the horizon"""
+        if due_on:
+            days = working_day(due_on + timedelta(days=1)) - self.origin
+        else:
+            days = self.default_task_days
+        return min(max(days, 1), self.horizon_days)
+
+    def _allocate(self, capacity):
+        self._cumulative = np.zeros((capacity, self.horizon_days + 1))
+
+    def _row(self, employee_id):
+        """Get an employee's row, growing the matrix when it is full"""
+        row = self._rows.get(employee_id)
+        if row is not None:
+            return row
+
+        row = len(self._rows)
+        if row >= len(self._cumulative):
+            grown = np.zeros((max(64, len(self._cumulative) * 2), self.horizon_days + 1))
+            grown[:row] = self._cumulative[:row]
+            self._cumulative = grown
+
+        self._rows[employee_id] = row
+        return row
+
+    def _after_flush(self, session, flush_context):
+        # Rescheduled or re-estimated tasks move their assignees' reservations
+        employee_ids = touched_employee_ids(session) | task_assignee_ids(session, TIMELINE_TASK_COLUMNS)
+
+        if employee_ids:
+            session.info.setdefault(PENDING_KEY, set()).update(employee_ids)
+
+    def _after_commit(self, session):
+        pending = session.info.pop(PENDING_KEY, None)
+        if pending:
+            with self._lock:
+                self._stale.update(pending)
+
+    def _after_rollback(self, session):
+        session.info.pop(PENDING_KEY, None)
+
+
+# Process-wide timeline shared by all matchers
+capacity_timeline = CapacityTimeline()
@@ -0,0 +1,182 @@
+import json
+import os
+import threading
+import time
+from flask import current_app, has_app_context
+from utils.keyword_automaton import KeywordAutomaton
+
+# Rules shipped with the app, used unless DOMAIN_RULES_PATH points elsewhere
+DEFAULT_RULES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'domain_rules.json'
+)
+
+
+class CompiledRules:
+    """Domain rules compiled for classification"""
+
+    def __init__(self, rules, mtime=None):
+        """
+        Args:
+            rules (dict): Rules as stored in the rules file:
+                'domains' maps each domain to {keyword: weight}, in tie-break
+                order; a keyword ending in '*' also matches longer words it
+                starts. 'title_weight' multiplies title matches, 'min_score'
+                is the lowest score ranked, and 'default_domain' is reported
+                when nothing is.
+            mtime (int): Modification time of the rules file, in nanoseconds
+
+        Raises:
+            ValueError: If the rules are malformed
+        """
+        domains = rules.get('domains')
+        if not isinstance(domains, dict):
+            raise ValueError("Domain rules need a 'domains' object")
+
+        self.title_weight = float(rules.get('title_weight', 1.0))
+        self.min_score = float(rules.get('min_score', 0.0))
+        self.default_domain = rules.get('default_domain', 'general')
+        self.mtime = mtime
+        self.order = {domain: i for i, domain in enumerate(domains)}
+        self.weights = {}  # keyword -> [(domain, weight)]
+        self.automaton = KeywordAutomaton()
+
+        for domain, keywords in domains.items():
+            if not isinstance(keywords, dict):
+                raise ValueError(f"Keywords of domain '{domain}' must map to weights")
+            for keyword, weight in keywords.items():
+                prefix = keyword.endswith('*')
+                keyword = keyword.rstrip('*').strip().lower()
+                if not keyword:
+                    continue
+                self.automaton.add(keyword, domain, prefix=prefix)
+                self.weights.setdefault(keyword, []).append((domain, float(weight)))
+
+        self.automaton.build()
+        self.keyword_count = len(self.weights)
+
+
+class DomainClassifier:
+    """
+    Weighted keyword classifier for a task's domain.
+
+    Each rule gives a keyword a weight towards a domain. The title and the
+    description are each scanned once by a compiled keyword automaton that
+    only reports whole-word matches, so "ui" doesn't fire on "build" nor
+    "ai" on "said". A domain's score is the sum of the weights of its
+    distinct keywords found, with title matches multiplied by the rules'
+    title weight, and domains are ranked by score.
+
+    Rules are read from a JSON file and compiled on first use. The file's
+    modification time is checked at most every `reload_interval` seconds
+    and changed rules are recompiled and swapped in without a restart. A
+    rules file that fails to load is logged and the previous rules are kept.
+    """
+
+    def __init__(self, path=DEFAULT_RULES_PATH, reload_interval=5.0):
+        self._lock = threading.Lock()
+        self._rules = None
+        self._last_checked = 0.0
+        self.path = path
+        self.reload_interval = reload_interval
+        self.reloads = 0
+        self.reload_errors = 0
+
+    def init_app(self, app):
+        """Read the rules file location and reload interval from the app config"""
+        self.path = app.config.get('DOMAIN_RULES_PATH') or DEFAULT_RULES_PATH
+        self.reload_interval = app.config.get('DOMAIN_RULES_RELOAD_SECONDS', self.reload_interval)
+        with self._lock:
+            self._rules = None
+
+    def load_rules(self, rules):
+        """
+        Replace the rules with a rules dict instead of the rules file.
+
+        File reloading stops until init_app is called again.
+
+        Raises:
+            ValueError: If the rules are malformed
+        """
+        compiled = CompiledRules(rules)
+        with self._lock:
+            self.path = None
+            self._rules = compiled
+            self.reloads += 1
+
+    def classify(self, title, description=''):
+        """
+        Rank the domains matched by a task's title and description.
+
+        Returns:
+            list: (domain, score) tuples scoring at least the rules' minimum,
+                best first; ties keep the rules' domain order
+        """
+        rules = self._current_rules()
+
+        # Best multiplier per keyword, so a keyword counts once per task
+        found = dict.fromkeys(rules.automaton.find_words(description or ''), 1.0)
+        for keyword in rules.automaton.find_words(title or ''):
+            found[keyword] = max(found.get(keyword, 0.0), rules.title_weight)
+
+        scores = {}
+        for keyword, multiplier in found.items():
+            for domain, weight in rules.weights[keyword]:
+                scores[domain] = scores.get(domain, 0.0) + weight * multiplier
+
+        ranked = [(domain, score) for domain, score in scores.items() if score >= rules.min_score]
+        ranked.sort(key=lambda item: (-item[1], rules.order[item[0]]))
+        return ranked
+
+    def best_domain(self, title, description='', default=None):
+        """Get the top-ranked domain, or the default (the rules' default domain when None)"""
+        ranked = self.classify(title, description)
+        if ranked:
+            return ranked[0][0]
+        return default if default is not None else self._current_rules().default_domain
+
+    def stats(self):
+        """Get the loaded rules' size and reload counters"""
+        rules = self._rules
+        return {
+            'path': self.path,
+            'domains': len(rules.order) if rules else 0,
+            'keywords': rules.keyword_count if rules else 0,
+            'reloads': self.reloads,
+            'reload_errors': self.reload_errors
+        }
+
+    def _current_rules(self):
+        """Get the compiled rules, reloading the file when it changed"""
+        rules = self._rules
+        if rules is not None and (
+                self.path is None or time.monotonic() - self._last_checked < self.reload_interval):
+            return rules
+
+        with self._lock:
+            rules = self._rules
+            if rules is not None and (
+                    self.path is None or time.monotonic() - self._last_checked < self.reload_interval):
+                return rules
+            self._last_checked = time.monotonic()
+
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if rules is None or mtime != rules.mtime:
+                    with open(self.path) as f:
+                        rules = CompiledRules(json.load(f), mtime)
+                    self._rules = rules
+                    self.reloads += 1
+            except (OSError, TypeError, ValueError) as e:
+                self.reload_errors += 1
+                if has_app_context():
+                    current_app.logger.error(f"Error loading domain rules from {self.path}: {str(e)}")
+                if rules is None:
+                    # Nothing loaded yet: classify everything as the default domain
+                    rules = CompiledRules({'domains': {}}, None)
+                    self._rules = rules
+
+            return rules
+
+
+# Process-wide classifier used by the task assignment agent
+domain_classifier = DomainClassifier()
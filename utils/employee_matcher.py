@@ -1,13 +1,56 @@
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, case
 from models.database import db, Employee, TaskAssignment, Task
-from flask import current_app
-import json
+from utils.skills import parse_skills, skill_cache, skill_terms
+from utils.skill_index import skill_index
+from utils.candidate_filter import candidate_filter
+from utils.workload_ledger import workload_ledger
+from utils.capacity_timeline import capacity_timeline, CAPACITY_MODES
+from utils.static_scores import StaticScoreTable, static_score_table
+from utils.employee_snapshot import EmployeeSnapshot, SNAPSHOT_COLUMNS, SNAPSHOT_YIELD_PER
+from utils.keyword_automaton import KeywordAutomaton
+from flask import current_app, has_app_context
+import heapq
 from datetime import datetime, timedelta
 
 
+# Assignment statuses that count towards an employee's current workload
+ACTIVE_ASSIGNMENT_STATUSES = ('assigned', 'accepted')
+
+# Workload at which an employee's workload score drops to zero
+MAX_ACTIVE_TASKS = 5
+MAX_ACTIVE_HOURS = 40.0
+
+# Skill keywords that indicate expertise in each domain
+DOMAIN_EXPERTISE_MAP = {
+    'frontend': ['javascript', 'react', 'vue', 'angular', 'html', 'css', 'ui', 'ux'],
+    'backend': ['python', 'java', 'node.js', 'php', 'ruby', 'api', 'database', 'sql'],
+    'devops': ['docker', 'kubernetes', 'aws', 'azure', 'ci/cd', 'deployment', 'infrastructure'],
+    'mobile': ['ios', 'android', 'react native', 'flutter', 'mobile', 'app'],
+    'data': ['python', 'sql', 'machine learning', 'ai', 'analytics', 'data science'],
+    'security': ['security', 'authentication', 'authorization', 'encryption', 'penetration testing'],
+    'qa': ['testing', 'qa', 'quality assurance', 'automation', 'selenium', 'test'],
+    'design': ['ui', 'ux', 'design', 'figma', 'adobe', 'photoshop', 'illustrator']
+}
+
+DOMAIN_DEPARTMENT_MAP = {
+    'frontend': ['engineering', 'development', 'frontend'],
+    'backend': ['engineering', 'development', 'backend'],
+    'devops': ['engineering', 'devops', 'infrastructure'],
+    'mobile': ['engineering', 'development', 'mobile'],
+    'data': ['data', 'analytics', 'engineering'],
+    'security': ['security', 'engineering'],
+    'qa': ['qa', 'testing', 'engineering'],
+    'design': ['design', 'ux', 'ui']
+}
+
+# Built once at import; matchers with a customized map build their own
+domain_expertise_automaton = KeywordAutomaton(DOMAIN_EXPERTISE_MAP)
+domain_expertise_automaton.build()
+
+
 def find_best_employee_for_task(task_type, priority, required_domain,
                                estimated_hours=None, due_date=None, 
-                               required_skills=None):
+                               required_skills=None, constraints=None):
     """
     Simple function to find the best employee for a task.
     
@@ -18,6 +61,7 @@ def find_best_employee_for_task(task_type, priority, required_domain,
         estimated_hours (float): Estimated hours for the task
         due_date (datetime): Task due date
         required_skills (list): List of required skills
+        constraints (dict): Hard candidate constraints (see CandidateFilter.filter)
         
     Returns:
         Employee or None: Best matching employee or None if no match found
@@ -25,23 +69,47 @@ def find_best_employee_for_task(task_type, priority, required_domain,
     matcher = EmployeeMatcher()
     return matcher.find_best_employee(
         task_type, priority, required_domain, 
-        estimated_hours, due_date, required_skills
+        estimated_hours, due_date, required_skills, constraints
     )
 
 
 class EmployeeMatcher:
     """Intelligent employee-task matching system"""
     
-    def __init__(self):
+    SCORING_ENGINES = ('python', 'numpy', 'tfidf')
+    
+    def __init__(self, scoring_engine=None, shard_workers=None, shard_strategy=None):
+        """
+        Settings not given here are read from the config of the app handling
+        each match, so matchers built at import time, before create_app,
+        still follow the app's configuration.
+        
+        Args:
+            scoring_engine (str): 'python' scores employees one at a time,
+                'numpy' uses the vectorized engine and 'tfidf' the vectorized
+                engine with TF-IDF skill similarity. Defaults to the
+                MATCHER_SCORING_ENGINE config value.
+            shard_workers (int): Worker processes for sharded scoring with the
+                'python' engine; 0 or 1 scores in-process. Defaults to the
+                MATCHER_SHARD_WORKERS config value.
+            shard_strategy (str): 'hash' or 'department' candidate partitioning.
+                Defaults to the MATCHER_SHARD_STRATEGY config value.
+        """
+        if scoring_engine is not None and scoring_engine not in self.SCORING_ENGINES:
+            raise ValueError(f"Scoring engine must be one of: {', '.join(self.SCORING_ENGINES)}")
+        self._scoring_engine = scoring_engine
+        self._shard_workers = shard_workers
+        self._shard_strategy = shard_strategy
+        
         self.domain_expertise_map = {
-            'frontend': ['javascript', 'react', 'vue', 'angular', 'html', 'css', 'ui', 'ux'],
-            'backend': ['python', 'java', 'node.js', 'php', 'ruby', 'api', 'database', 'sql'],
-            'devops': ['docker', 'kubernetes', 'aws', 'azure', 'ci/cd', 'deployment', 'infrastructure'],
-            'mobile': ['ios', 'android', 'react native', 'flutter', 'mobile', 'app'],
-            'data': ['python', 'sql', 'machine learning', 'ai', 'analytics', 'data science'],
-            'security': ['security', 'authentication', 'authorization', 'encryption', 'penetration testing'],
-            'qa': ['testing', 'qa', 'quality assurance', 'automation', 'selenium', 'test'],
-            'design': ['ui', 'ux', 'design', 'figma', 'adobe', 'photoshop', 'illustrator']
+            domain: list(keywords) for domain, keywords in DOMAIN_EXPERTISE_MAP.items()
+        }
+        self._domain_automaton = None
+        self._static_table = None
+        
+        # Map domains to departments
+        self.domain_department_map = {
+            domain: list(departments) for domain, departments in DOMAIN_DEPARTMENT_MAP.items()
         }
         
         self.priority_weights = {
@@ -58,8 +126,57 @@ class EmployeeMatcher:
             'story': 1.0     # User stories get normal priority
         }
     
+    @staticmethod
+    def _config(key, default=None):
+        """Read a setting from the current app's config"""
+        return current_app.config.get(key, default) if has_app_context() else default
+    
+    @property
+    def scoring_engine(self):
+        scoring_engine = self._scoring_engine or self._config('MATCHER_SCORING_ENGINE') or 'python'
+        if scoring_engine not in self.SCORING_ENGINES:
+            raise ValueError(f"Scoring engine must be one of: {', '.join(self.SCORING_ENGINES)}")
+        return scoring_engine
+    
+    @property
+    def shard_workers(self):
+        if self._shard_workers is not None:
+            return self._shard_workers
+        return self._config('MATCHER_SHARD_WORKERS', 0)
+    
+    @property
+    def shard_strategy(self):
+        return self._shard_strategy or self._config('MATCHER_SHARD_STRATEGY', 'hash')
+    
+    @property
+    def shard_min_candidates(self):
+        return self._config('MATCHER_SHARD_MIN_CANDIDATES', 5000)
+    
+    @property
+    def similarity_threshold(self):
+        return self._config('MATCHER_SIMILARITY_THRESHOLD')
+    
+    @property
+    def daemon_socket(self):
+        return self._config('MATCHER_DAEMON_SOCKET')
+    
+    @property
+    def daemon_timeout(self):
+        return self._config('MATCHER_DAEMON_TIMEOUT', 2.0)
+    
+    @property
+    def capacity_mode(self):
+        """Capacity timeline mode, or None when the timeline is off"""
+        if not self._config('CAPACITY_TIMELINE_ENABLED'):
+            return None
+        capacity_mode = self._config('CAPACITY_TIMELINE_MODE') or 'penalize'
+        if capacity_mode not in CAPACITY_MODES:
+            raise ValueError(f"Capacity timeline mode must be one of: {', '.join(CAPACITY_MODES)}")
+        return capacity_mode
+    
     def find_best_employee(self, task_type, priority, required_domain, 
-                          estimated_hours=None, due_date=None, required_skills=None):
+                          estimated_hours=None, due_date=None, required_skills=None,
+                          constraints=None):
         """
         Find the best employee for a given task.
         
@@ -70,58 +187,205 @@ class EmployeeMatcher:
             estimated_hours (float): Estimated hours for the task
             due_date (datetime): Task due date
             required_skills (list): List of required skills
+            constraints (dict): Hard candidate constraints (level, department,
+                domain, max_active_tasks); see CandidateFilter.filter
             
         Returns:
             Employee or None: Best matching employee or None if no match found
         """
         try:
-            # Get available employees
-            available_employees = self._get_available_employees()
+            ranked = self._rank_in_daemon(
+                task_type, priority, required_domain, 1,
+                estimated_hours, due_date, required_skills, constraints
+            )
+            if ranked is not None:
+                if not ranked:
+                    current_app.logger.warning(f"No qualified employees found for {task_type} in {required_domain}")
+                    return None
+                
+                employee_id, best_score = ranked[0]
+                current_app.logger.info(
+                    f"Matcher daemon selected employee {employee_id} (score: {best_score:.2f}) "
+                    f"for {task_type} in {required_domain}"
+                )
+                return db.session.get(Employee, employee_id)
+            
+            # Get available employees meeting the constraints, pruned to those
+            # sharing a keyword with the task
+            candidate_ids = self._get_candidate_ids(required_domain, required_skills, constraints)
+            available_employees = self._plan_capacity(
+                self._get_available_employees(candidate_ids), estimated_hours, due_date
+            )
             
             if not available_employees:
                 current_app.logger.warning("No available employees found")
                 return None
             
-            # Score and rank employees
-            scored_employees = []
-            
-            for employee in available_employees:
-                score = self._calculate_employee_score(
-                    employee, task_type, priority, required_domain, 
-                    estimated_hours, due_date, required_skills
-                )
-                
-                if score > 0:  # Only include employees with positive scores
-                    scored_employees.append((employee, score))
+            # Score and rank employees, keeping only the best match
+            top_employees = self._top_employees(
+                available_employees, task_type, priority, required_domain, 1,
+                estimated_hours, due_date, required_skills
+            )
             
-            if not scored_employees:
+            if not top_employees:
                 current_app.logger.warning(f"No qualified employees found for {task_type} in {required_domain}")
                 return None
             
-            # Sort by score (highest first) and return the best match
-            scored_employees.sort(key=lambda x: x[1], reverse=True)
-            best_employee, best_score = scored_employees[0]
+            best_employee, best_score = top_employees[0]
             
             current_app.logger.info(
                 f"Selected employee {best_employee.name} (score: {best_score:.2f}) "
                 f"for {task_type} in {required_domain}"
             )
             
-            return best_employee
+            # Only the winner is loaded as a full Employee
+            return db.session.get(Employee, best_employee.id)
             
         except Exception as e:
             current_app.logger.error(f"Error finding best employee: {str(e)}")
             return None
     
-    def _get_available_employees(self):
-        """Get all available employees with their current workload"""
+    def _get_candidate_ids(self, required_domain, required_skills=None, constraints=None):
+        """
+        Get ids of the employees worth scoring for a task.
+        
+        Hard constraints are resolved against the candidate filter's bitsets
+        and always apply. Within them, candidates are pruned to employees
+        sharing at least one keyword with the task.
+        
+        Returns:
+            set or None: Candidate ids, or None to score every available employee
+        """
+        keyword_ids = self._get_keyword_candidate_ids(required_domain, required_skills)
+        if not constraints:
+            return keyword_ids
+        
+        allowed_ids = candidate_filter.filter(**constraints)
+        if keyword_ids:
+            pruned_ids = keyword_ids & allowed_ids
+            if pruned_ids:
+                return pruned_ids
+        return allowed_ids
+    
+    def _get_keyword_candidate_ids(self, required_domain, required_skills=None):
+        """
+        Get ids of employees sharing at least one keyword with the task.
+        
+        Uses the inverted skill index over the domain keywords and required
+        skills. Returns None (score everyone) when the task has no keywords
+        or nobody matches, so pruning never leaves a task without candidates.
+        The 'tfidf' engine also scores everyone, since similar skills don't
+        share the exact keywords the index is built on.
+        """
+        if self.scoring_engine == 'tfidf':
+            return None
+        
+        try:
+            keywords = list(self.domain_expertise_map.get(required_domain.lower(), []))
+            if required_skills:
+                keywords.extend(required_skills)
+            
+            if not keywords:
+                return None
+            
+            skill_index.ensure_built()
+            candidate_ids = skill_index.lookup(keywords)
+            
+            return candidate_ids or None
+            
+        except Exception as e:
+            current_app.logger.error(f"Error looking up candidate employees: {str(e)}")
+            return None
+    
+    def _get_available_employees(self, employee_ids=None):
+        """
+        Get all available employees with their current workload.
+        
+        Only the scored columns are loaded, streamed into EmployeeSnapshot
+        records rather than Employee instances. Task count, estimated hours,
+        active high-priority count and per-source task history come from the
+        workload ledger when it is tracking this app's commits, and otherwise
+        from one grouped query, so the scorers read in-memory values instead
+        of querying per employee.
+        
+        Args:
+            employee_ids (set): Restrict loading to these employees (None loads all)
+            
+        Returns:
+            list: EmployeeSnapshot records ordered by employee id
+        """
         try:
-            # Get employees who are available
-            employees = Employee.query.filter_by(availability=True).all()
+            if workload_ledger.is_listening:
+                workload_ledger.ensure_loaded()
+                
+                query = db.session.query(*SNAPSHOT_COLUMNS).filter(Employee.availability == True)
+                if employee_ids is not None:
+                    query = query.filter(Employee.id.in_(employee_ids))
+                
+                employees = []
+                for row in query.order_by(Employee.id).yield_per(SNAPSHOT_YIELD_PER):
+                    history_version = workload_ledger.get_history_version(row.id)
+                    employees.append(EmployeeSnapshot.from_row(
+                        row,
+                        workload_ledger.get(row.id),
+                        workload_ledger.get_history(row.id),
+                        history_version
+                    ))
+                
+                return employees
+            
+            active = TaskAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES)
+            
+            query = db.session.query(
+                *SNAPSHOT_COLUMNS,
+                Task.source,
+                func.count(TaskAssignment.id),
+                func.sum(case((active, 1), else_=0)),
+                func.sum(case(
+                    (and_(active, Task.estimated_hours.isnot(None)), Task.estimated_hours),
+                    else_=0
+                )),
+                func.sum(case((and_(active, Task.priority == 'high'), 1), else_=0))
+            ).outerjoin(
+                TaskAssignment, TaskAssignment.employee_id == Employee.id
+            ).outerjoin(
+                Task, Task.id == TaskAssignment.task_id
+            ).filter(
+                Employee.availability == True
+            )
             
-            # Calculate current workload for each employee
-            for employee in employees:
-                employee.current_workload = self._calculate_current_workload(employee)
+            if employee_ids is not None:
+                query = query.filter(Employee.id.in_(employee_ids))
+            
+            rows = query.group_by(
+                Employee.id, Task.source
+            ).order_by(Employee.id).yield_per(SNAPSHOT_YIELD_PER)
+            
+            # Fold the per-(employee, source) groups into one snapshot per employee
+            employees = []
+            employee = None
+            for row in rows:
+                source, assignment_count, task_count, hours, high_priority = row[len(SNAPSHOT_COLUMNS):]
+                
+                if employee is None or employee.id != row.id:
+                    employee = EmployeeSnapshot.from_row(
+                        row,
+                        {
+                            'task_count': 0,
+                            'estimated_hours': 0,
+                            'high_priority_count': 0
+                        },
+                        {}
+                    )
+                    employees.append(employee)
+                
+                workload = employee.current_workload
+                workload['task_count'] += task_count or 0
+                workload['estimated_hours'] += hours or 0
+                workload['high_priority_count'] += high_priority or 0
+                
+                if source and assignment_count:
+                    employee.task_history[source] = assignment_count
             
             return employees
             
@@ -129,36 +393,161 @@ class EmployeeMatcher:
             current_app.logger.error(f"Error getting available employees: {str(e)}")
             return []
     
-    def _calculate_current_workload(self, employee):
-        """Calculate current workload for an employee"""
+    def _plan_capacity(self, employees, estimated_hours=None, due_date=None):
+        """
+        Weigh candidates' booked hours against the task's due date.
+        
+        With the capacity timeline enabled, each candidate's workload gets
+        the share of their working hours until the due date that is already
+        reserved, including this task's estimated hours. In 'filter' mode
+        candidates the task no longer fits are dropped.
+        
+        Returns:
+            list: The candidates to score
+        """
+        if self.capacity_mode is None or not employees:
+            return employees
+        
         try:
-            # Count active assignments
-            active_assignments = TaskAssignment.query.filter(
-                and_(
-                    TaskAssignment.employee_id == employee.id,
-                    TaskAssignment.status.in_(['assigned', 'accepted'])
-                )
-            ).count()
+            return capacity_timeline.annotate(employees, estimated_hours, due_date, self.capacity_mode)
+        except Exception as e:
+            current_app.logger.error(f"Error planning candidate capacity: {str(e)}")
+            return employees
+    
+    def _score_employees(self, employees, task_type, priority, required_domain,
+                         estimated_hours=None, due_date=None, required_skills=None):
+        """
+        Score candidates with the configured scoring engine.
+        
+        Returns:
+            list: (employee, score) tuples with positive scores, in candidate order
+        """
+        if self.scoring_engine == 'numpy':
+            from utils.vectorized_scorer import VectorizedScorer
             
-            # Get total estimated hours for active tasks
-            active_tasks = db.session.query(func.sum(Task.estimated_hours)).join(
-                TaskAssignment, Task.id == TaskAssignment.task_id
-            ).filter(
-                and_(
-                    TaskAssignment.employee_id == employee.id,
-                    TaskAssignment.status.in_(['assigned', 'accepted']),
-                    Task.estimated_hours.isnot(None)
-                )
-            ).scalar() or 0
+            scores = VectorizedScorer(self).encode(employees).score(
+                task_type, priority, required_domain, required_skills
+            )
+            return [
+                (employee, float(score))
+                for employee, score in zip(employees, scores) if score > 0
+            ]
+        
+        if self.scoring_engine == 'tfidf':
+            from utils.skill_similarity import SemanticScorer
             
-            return {
-                'task_count': active_assignments,
-                'estimated_hours': active_tasks
-            }
+            scores = SemanticScorer(self, threshold=self.similarity_threshold).encode(employees).score(
+                task_type, priority, required_domain, required_skills
+            )
+            return [
+                (employee, float(score))
+                for employee, score in zip(employees, scores) if score > 0
+            ]
+        
+        scored_employees = []
+        for employee in employees:
+            score = self._calculate_employee_score(
+                employee, task_type, priority, required_domain,
+                estimated_hours, due_date, required_skills
+            )
             
-        except Exception as e:
-            current_app.logger.error(f"Error calculating workload for {employee.name}: {str(e)}")
-            return {'task_count': 0, 'estimated_hours': 0}
+            if score > 0:  # Only include employees with positive scores
+                scored_employees.append((employee, score))
+        
+        return scored_employees
+    
+    def _top_employees(self, employees, task_type, priority, required_domain, limit,
+                       estimated_hours=None, due_date=None, required_skills=None):
+        """
+        Get the `limit` highest-scoring candidates, highest first; every
+        candidate when `limit` is None, 0 or negative.
+        
+        The per-employee engine keeps a size-k heap and computes an upper
+        bound per candidate from the static components (domain, skills,
+        experience, department) plus the maximum the dynamic components can
+        add. Candidates are visited in bound order, and once a bound cannot
+        beat the current k-th score the remaining candidates are skipped
+        without computing their workload and priority components. The result is identical to
+        scoring everyone and sorting (ties keep candidate order).
+        
+        Large candidate lists are split across worker processes when sharded
+        scoring is configured, with the same result.
+        
+        Returns:
+            list: (employee, score) tuples
+        """
+        if not limit or limit < 0:
+            limit = None
+        
+        if (self.scoring_engine == 'python' and self.shard_workers > 1
+                and len(employees) >= self.shard_min_candidates):
+            from utils.sharded_scoring import sharded_top_employees
+            
+            return sharded_top_employees(
+                self, employees, task_type, priority, required_domain, limit,
+                self.shard_workers, self.shard_strategy, required_skills
+            )
+        
+        if self.scoring_engine != 'python' or limit is None:
+            scored_employees = self._score_employees(
+                employees, task_type, priority, required_domain,
+                estimated_hours, due_date, required_skills
+            )
+            scored_employees.sort(key=lambda x: x[1], reverse=True)
+            return scored_employees[:limit]
+        
+        # Most the workload (10) and priority (8 or 4) terms can add
+        dynamic_max = 10 + (8 if priority == 'high' else 0.5 * 8)
+        
+        candidates = []
+        for index, employee in enumerate(employees):
+            domain_score, department_score, experience_score = self._static_components(
+                employee, required_domain, task_type
+            )
+            skills_score = (self._calculate_skills_match_score(employee, required_skills)
+                            if required_skills else 0)
+            
+            bound = (10 + domain_score * 20 + skills_score * 15 + experience_score * 5
+                     + department_score * 3 + dynamic_max)
+            candidates.append((bound, index, employee, domain_score, skills_score,
+                               experience_score, department_score))
+        
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        
+        heap = []  # (score, -index, employee); root is the current k-th best
+        for (bound, index, employee, domain_score, skills_score,
+             experience_score, department_score) in candidates:
+            # Small tolerance for float rounding between the bound and the real sum
+            if len(heap) == limit and bound + 1e-6 < heap[0][0]:
+                break
+            
+            try:
+                # Same accumulation order as _calculate_employee_score
+                score = 0
+                score += 10
+                score += domain_score * 20
+                if required_skills:
+                    score += skills_score * 15
+                score += self._calculate_workload_score(employee) * 10
+                score += self._calculate_priority_handling_score(employee, priority, task_type) * 8
+                score += experience_score * 5
+                score += department_score * 3
+                score = max(0, score)
+            except Exception as e:
+                current_app.logger.error(f"Error calculating score for {employee.name}: {str(e)}")
+                score = 0
+            
+            if score <= 0:
+                continue
+            
+            entry = (score, -index, employee)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+        
+        heap.sort(key=lambda entry: (-entry[0], -entry[1]))
+        return [(employee, score) for score, _, employee in heap]
     
     def _calculate_employee_score(self, employee, task_type, priority, required_domain,
                                 estimated_hours=None, due_date=None, required_skills=None):
@@ -172,8 +561,13 @@ class EmployeeMatcher:
             # Base score for being available
             score += 10
             
+            # Domain expertise, department alignment and task type experience
+            # change rarely, so they come from the static score table
+            domain_score, department_score, experience_score = self._static_components(
+                employee, required_domain, task_type
+            )
+            
             # Domain expertise match
-            domain_score = self._calculate_domain_expertise_score(employee, required_domain)
             score += domain_score * 20  # Domain expertise is heavily weighted
             
             # Skills match
@@ -190,11 +584,9 @@ class EmployeeMatcher:
             score += priority_score * 8
             
             # Experience with task type
-            experience_score = self._calculate_task_type_experience_score(employee, task_type)
             score += experience_score * 5
             
             # Department alignment (bonus for matching department)
-            department_score = self._calculate_department_alignment_score(employee, required_domain)
             score += department_score * 3
             
             return max(0, score)  # Ensure non-negative score
@@ -209,8 +601,8 @@ class EmployeeMatcher:
             if not employee.skills:
                 return 0
             
-            # Parse employee skills
-            employee_skills = self._parse_skills(employee.skills)
+            # Parsed, lowercased skills (cached per employee version)
+            employee_skills = skill_cache.get(employee).skills
             
             # Get domain keywords
             domain_keywords = self.domain_expertise_map.get(required_domain.lower(), [])
@@ -218,13 +610,9 @@ class EmployeeMatcher:
             if not domain_keywords:
                 return 0.5  # Default score for unknown domains
             
-            # Count matching skills
-            matches = 0
-            for skill in employee_skills:
-                for keyword in domain_keywords:
-                    if keyword.lower() in skill.lower():
-                        matches += 1
-                        break
+            # Count skills containing at least one domain keyword
+            domain = required_domain.lower()
+            matches = sum(1 for skill in employee_skills if domain in self._skill_domains(skill))
             
             # Calculate score based on match percentage
             if len(domain_keywords) > 0:
@@ -236,20 +624,52 @@ class EmployeeMatcher:
             current_app.logger.error(f"Error calculating domain expertise: {str(e)}")
             return 0
     
+    def _static_components(self, employee, required_domain, task_type):
+        """
+        Get (domain expertise, department alignment, experience) scores.
+        
+        Looked up in the shared static score table when the matcher uses the
+        default domain maps, otherwise in a table of its own.
+        """
+        if self._static_table is None:
+            if (self.domain_expertise_map == DOMAIN_EXPERTISE_MAP
+                    and self.domain_department_map == DOMAIN_DEPARTMENT_MAP):
+                self._static_table = static_score_table
+            else:
+                self._static_table = StaticScoreTable()
+        
+        return self._static_table.components(self, employee, required_domain, task_type)
+    
+    def _skill_domains(self, skill):
+        """Get the domains with a keyword contained in a normalized skill"""
+        if self._domain_automaton is None:
+            if self.domain_expertise_map == DOMAIN_EXPERTISE_MAP:
+                self._domain_automaton = domain_expertise_automaton
+            else:
+                self._domain_automaton = KeywordAutomaton(self.domain_expertise_map)
+        
+        return self._domain_automaton.cached_categories(skill)
+    
     def _calculate_skills_match_score(self, employee, required_skills):
         """Calculate how well an employee's skills match the required skills"""
         try:
             if not employee.skills or not required_skills:
                 return 0
             
-            employee_skills = self._parse_skills(employee.skills)
+            parsed = skill_cache.get(employee)
             
             matches = 0
             for required_skill in required_skills:
-                for employee_skill in employee_skills:
-                    if required_skill.lower() in employee_skill.lower():
-                        matches += 1
-                        break
+                # Aliases match under their canonical name too ("k8s" and "kubernetes")
+                terms = skill_terms(required_skill)
+                
+                # Exact skill names hit the token set without scanning
+                if any(term in parsed.token_set for term in terms):
+                    matches += 1
+                    continue
+                
+                if any(term in employee_skill for term in terms for employee_skill in parsed.terms):
+                    matches += 1
             
             return min(1.0, matches / len(required_skills))
             
@@ -263,10 +683,14 @@ class EmployeeMatcher:
             workload = employee.current_workload
             
             # Score based on number of active tasks
-            task_count_score = max(0, 1.0 - (workload['task_count'] / 5.0))
+            task_count_score = max(0, 1.0 - (workload['task_count'] / MAX_ACTIVE_TASKS))
             
-            # Score based on estimated hours
-            hours_score = max(0, 1.0 - (workload['estimated_hours'] / 40.0))
+            # Score based on reserved hours until the due date when the capacity
+            # timeline planned this task, otherwise on active hours over a 40-hour week
+            if 'capacity_load' in workload:
+                hours_score = max(0, 1.0 - workload['capacity_load'])
+            else:
+                hours_score = max(0, 1.0 - (workload['estimated_hours'] / MAX_ACTIVE_HOURS))
             
             # Combine scores (weighted average)
             return (task_count_score * 0.6) + (hours_score * 0.4)
@@ -278,14 +702,8 @@ class EmployeeMatcher:
     def _calculate_priority_handling_score(self, employee, priority, task_type):
         """Calculate how well an employee can handle the priority level"""
         try:
-            # Get employee's current high-priority tasks
-            high_priority_tasks = TaskAssignment.query.join(Task).filter(
-                and_(
-                    TaskAssignment.employee_id == employee.id,
-                    TaskAssignment.status.in_(['assigned', 'accepted']),
-                    Task.priority == 'high'
-                )
-            ).count()
+            # Employee's current high-priority tasks (loaded with the candidates)
+            high_priority_tasks = employee.current_workload['high_priority_count']
             
             # If this is a high-priority task, prefer employees with fewer high-priority tasks
             if priority == 'high':
@@ -301,13 +719,12 @@ class EmployeeMatcher:
     def _calculate_task_type_experience_score(self, employee, task_type):
         """Calculate employee's experience with the specific task type"""
         try:
-            # Count previous tasks of the same type
-            task_type_count = db.session.query(Task).join(TaskAssignment).filter(
-                and_(
-                    TaskAssignment.employee_id == employee.id,
-                    Task.source.like(f'%{task_type}%')
-                )
-            ).count()
+            # Count previous tasks of the same type from the preloaded per-source history
+            task_type = task_type.lower()
+            task_type_count = sum(
+                count for source, count in employee.task_history.items()
+                if task_type in source.lower()
+            )
             
             # Score based on experience (more experience = higher score, but with diminishing returns)
             return min(1.0, task_type_count / 10.0)
@@ -322,19 +739,7 @@ class EmployeeMatcher:
             if not employee.department:
                 return 0
             
-            # Map domains to departments
-            domain_department_map = {
-                'frontend': ['engineering', 'development', 'frontend'],
-                'backend': ['engineering', 'development', 'backend'],
-                'devops': ['engineering', 'devops', 'infrastructure'],
-                'mobile': ['engineering', 'development', 'mobile'],
-                'data': ['data', 'analytics', 'engineering'],
-                'security': ['security', 'engineering'],
-                'qa': ['qa', 'testing', 'engineering'],
-                'design': ['design', 'ux', 'ui']
-            }
-            
-            expected_departments = domain_department_map.get(required_domain.lower(), [])
+            expected_departments = self.domain_department_map.get(required_domain.lower(), [])
             
             if not expected_departments:
                 return 0
@@ -352,31 +757,11 @@ class EmployeeMatcher:
     
     def _parse_skills(self, skills_string):
         """Parse skills string into a list of skills"""
-        try:
-            if not skills_string:
-                return []
-            
-            # Handle JSON format
-            if skills_string.startswith('[') or skills_string.startswith('{'):
-                try:
-                    skills_data = json.loads(skills_string)
-                    if isinstance(skills_data, list):
-                        return skills_data
-                    elif isinstance(skills_data, dict):
-                        return list(skills_data.keys())
-                except json.JSONDecodeError:
-                    pass
-            
-            # Handle comma-separated format
-            skills = [skill.strip() for skill in skills_string.split(',')]
-            return [skill for skill in skills if skill]
-            
-        except Exception as e:
-            current_app.logger.error(f"Error parsing skills: {str(e)}")
-            return []
+        return parse_skills(skills_string)
     
     def get_employee_recommendations(self, task_type, priority, required_domain, 
-                                   required_skills=None, limit=5):
+                                   required_skills=None, limit=5, constraints=None,
+                                   estimated_hours=None, due_date=None):
         """
         Get multiple employee recommendations for a task.
         
@@ -386,31 +771,99 @@ class EmployeeMatcher:
             required_domain (str): Required domain
             required_skills (list): Required skills
             limit (int): Maximum number of recommendations
+            constraints (dict): Hard candidate constraints (see find_best_employee)
+            estimated_hours (float): Estimated hours for the task
+            due_date (datetime): Task due date
             
         Returns:
-            list: List of (employee, score) tuples, sorted by score
+            list: List of (EmployeeSnapshot, score) tuples, sorted by score
         """
         try:
-            available_employees = self._get_available_employees()
-            
-            if not available_employees:
-                return []
-            
-            scored_employees = []
-            
-            for employee in available_employees:
-                score = self._calculate_employee_score(
-                    employee, task_type, priority, required_domain,
-                    required_skills=required_skills
-                )
-                
-                if score > 0:
-                    scored_employees.append((employee, score))
+            ranked = self._rank_in_daemon(
+                task_type, priority, required_domain, limit, estimated_hours, due_date,
+                required_skills=required_skills, constraints=constraints
+            )
+            if ranked is not None:
+                return self._load_ranked_snapshots(ranked)
             
-            # Sort by score and return top recommendations
-            scored_employees.sort(key=lambda x: x[1], reverse=True)
-            return scored_employees[:limit]
+            # Top recommendations, highest score first
+            return self._rank(
+                task_type, priority, required_domain, limit, estimated_hours, due_date,
+                required_skills=required_skills, constraints=constraints
+            )
             
         except Exception as e:
             current_app.logger.error(f"Error getting employee recommendations: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    def _rank(self, task_type, priority, required_domain, limit, estimated_hours=None,
+              due_date=None, required_skills=None, constraints=None):
+        """
+        Rank available candidates in this process.
+        
+        Returns:
+            list: (EmployeeSnapshot, score) tuples, highest score first
+        """
+        candidate_ids = self._get_candidate_ids(required_domain, required_skills, constraints)
+        available_employees = self._plan_capacity(
+            self._get_available_employees(candidate_ids), estimated_hours, due_date
+        )
+        
+        if not available_employees:
+            return []
+        
+        return self._top_employees(
+            available_employees, task_type, priority, required_domain, limit,
+            estimated_hours, due_date, required_skills
+        )
+    
+    def _rank_in_daemon(self, task_type, priority, required_domain, limit, estimated_hours=None,
+                        due_date=None, required_skills=None, constraints=None):
+        """
+        Rank candidates in the matcher daemon when one is configured.
+        
+        Matchers with customized domain maps always rank in-process, since
+        the daemon only knows the defaults, and so do limits too large for
+        the wire format.
+        
+        Returns:
+            list or None: (employee id, score) tuples, or None to rank in-process
+        """
+        if (not self.daemon_socket
+                or self.domain_expertise_map != DOMAIN_EXPERTISE_MAP
+                or self.domain_department_map != DOMAIN_DEPARTMENT_MAP):
+            return None
+        
+        from utils.matcher_daemon import get_client, MatcherDaemonError, MatcherDaemonDown, MAX_RANK_LIMIT
+        
+        if not limit or limit < 0:
+            limit = None
+        elif limit > MAX_RANK_LIMIT:
+            return None
+        
+        
+        try:
+            return get_client(self.daemon_socket, self.daemon_timeout).rank(
+                self.scoring_engine, task_type, priority, required_domain, limit,
+                estimated_hours, due_date, required_skills, constraints
+            )
+        except MatcherDaemonDown:
+            return None
+        except MatcherDaemonError as e:
+            current_app.logger.warning(f"Matcher daemon unavailable, matching in-process: {str(e)}")
+            return None
+    
+    def _load_ranked_snapshots(self, ranked):
+        """Load snapshots for (employee id, score) results, keeping their order"""
+        if not ranked:
+            return []
+        
+        rows = db.session.query(*SNAPSHOT_COLUMNS).filter(
+            Employee.id.in_([employee_id for employee_id, _ in ranked])
+        ).all()
+        snapshots = {row.id: EmployeeSnapshot.from_row(row) for row in rows}
+        
+        return [
+            (snapshots[employee_id], score)
+            for employee_id, score in ranked if employee_id in snapshots
+        ] 
\ No newline at end of file
@@ -0,0 +1,67 @@
+from models.database import Employee
+
+# Employee columns the matcher reads, in EmployeeSnapshot field order
+SNAPSHOT_COLUMNS = (
+    Employee.id,
+    Employee.name,
+    Employee.email,
+    Employee.skills,
+    Employee.level,
+    Employee.department,
+    Employee.updated_at
+)
+
+# Rows streamed per fetch when loading snapshots
+SNAPSHOT_YIELD_PER = 1000
+
+
+class EmployeeSnapshot:
+    """
+    Read-only view of an employee for scoring.
+
+    Holds only the projected columns plus the workload statistics the
+    scorers need, so matching thousands of candidates doesn't populate the
+    session's identity map or attach scoring state to ORM instances.
+    """
+
+    __slots__ = ('id', 'name', 'email', 'skills', 'level', 'department', 'updated_at',
+                 'current_workload', 'task_history', 'history_version')
+
+    def __init__(self, id, name, email, skills, level, department, updated_at,
+                 current_workload=None, task_history=None, history_version=None):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.skills = skills
+        self.level = level
+        self.department = department
+        self.updated_at = updated_at
+        self.current_workload = current_workload
+        self.task_history = task_history
+        # Workload ledger history version, None when the history came from SQL
+        self.history_version = history_version
+
+    @classmethod
+    def from_row(cls, row, current_workload=None, task_history=None, history_version=None):
+        """Build a snapshot from a row of SNAPSHOT_COLUMNS"""
+        return cls(*row[:len(SNAPSHOT_COLUMNS)], current_workload, task_history, history_version)
+
+    @classmethod
+    def from_employee(cls, employee):
+        """Copy the scored fields of any employee-like object"""
+        return cls(
+            employee.id, employee.name, getattr(employee, 'email', None), employee.skills,
+            getattr(employee, 'level', None), employee.department, employee.updated_at,
+            employee.current_workload, employee.task_history,
+            getattr(employee, 'history_version', None)
+        )
+
+    def __getstate__(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __setstate__(self, state):
+        for field, value in zip(self.__slots__, state):
+            setattr(self, field, value)
+
+    def __repr__(self):
+        return f'<EmployeeSnapshot {self.name}>'
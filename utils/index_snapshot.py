@@ -0,0 +1,268 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from flask import current_app
+from sqlalchemy import func
+
+# Bumped whenever the array layout or skill tokens change; older snapshots are ignored
+SNAPSHOT_FORMAT_VERSION = 2
+
+# File in the snapshot directory naming the current snapshot
+CURRENT_FILE = 'CURRENT'
+MANIFEST_FILE = 'manifest.json'
+
+# Snapshots kept on disk, including the current one
+SNAPSHOTS_KEPT = 2
+
+# Employees updated this long before the watermark are re-read too, covering
+# transactions that committed after the snapshot with an earlier timestamp
+WATERMARK_SLACK = timedelta(minutes=5)
+
+
+def maps_digest():
+    """Digest of the default domain maps and skill aliases the snapshot depends on"""
+    from utils.employee_matcher import DOMAIN_EXPERTISE_MAP, DOMAIN_DEPARTMENT_MAP
+    from utils.skills import SKILL_ALIASES
+
+    encoded = json.dumps([DOMAIN_EXPERTISE_MAP, DOMAIN_DEPARTMENT_MAP, SKILL_ALIASES], sort_keys=True)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def write_snapshot(directory):
+    """
+    Write the prepared matcher indexes to a new on-disk snapshot.
+
+    Saves the skill index postings, the candidate filter bitsets and id map,
+    and the static domain/department score matrix as .npy arrays, plus a
+    manifest with the format version, domain map digest and the database
+    watermark (latest employee updated_at) the snapshot reflects. The
+    snapshot is written to its own directory and made current by atomically
+    replacing the CURRENT pointer, so readers never see a partial snapshot.
+
+    Args:
+        directory (str): Snapshot root directory
+
+    Returns:
+        dict: The manifest written
+    """
+    from models.database import db, Employee
+    from utils.employee_matcher import EmployeeMatcher
+    from utils.employee_snapshot import EmployeeSnapshot, SNAPSHOT_COLUMNS, SNAPSHOT_YIELD_PER
+    from utils.skill_index import skill_index
+    from utils.candidate_filter import candidate_filter
+    from utils.static_scores import static_score_table
+
+    started = time.perf_counter()
+    os.makedirs(directory, exist_ok=True)
+
+    # Read the watermark first: anything committed later is replayed as a delta
+    watermark = db.session.query(func.max(Employee.updated_at)).scalar()
+
+    employees = [
+        EmployeeSnapshot.from_row(row)
+        for row in db.session.query(*SNAPSHOT_COLUMNS).order_by(Employee.id).yield_per(SNAPSHOT_YIELD_PER)
+    ]
+
+    skill_index.build_from_db()
+    candidate_filter.rebuild()
+
+    arrays = dict(skill_index.to_arrays())
+    filter_arrays, filter_names = candidate_filter.to_arrays()
+    arrays.update(filter_arrays)
+    static_arrays, domains = static_score_table.to_arrays(EmployeeMatcher(), employees)
+    arrays.update(static_arrays)
+
+    name = datetime.now().strftime('snapshot-%Y%m%dT%H%M%S%f')
+    staging = os.path.join(directory, f'.{name}.tmp')
+    os.makedirs(staging)
+    for key, array in arrays.items():
+        np.save(os.path.join(staging, f'{key}.npy'), np.ascontiguousarray(array), allow_pickle=False)
+
+    manifest = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'maps_digest': maps_digest(),
+        'created_at': datetime.now().isoformat(),
+        'watermark': watermark.isoformat() if watermark else None,
+        'employees': len(employees),
+        'arrays': sorted(arrays),
+        'filter_names': filter_names,
+        'domains': domains
+    }
+    with open(os.path.join(staging, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    os.rename(staging, os.path.join(directory, name))
+    pointer = os.path.join(directory, f'.{CURRENT_FILE}.tmp')
+    with open(pointer, 'w') as f:
+        f.write(name)
+    os.replace(pointer, os.path.join(directory, CURRENT_FILE))
+
+    _prune(directory, name)
+
+    current_app.logger.info(
+        f"Matcher index snapshot {name} written for {len(employees)} employees "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return manifest
+
+
+def load_snapshot(directory):
+    """
+    Load the current snapshot and apply the changes made since its watermark.
+
+    Arrays are memory-mapped rather than read, so loading costs little more
+    than building the id maps. Employees updated since the watermark (minus
+    WATERMARK_SLACK), added or deleted are then re-read from the database,
+    and active assignment counts are refreshed with one aggregate query.
+
+    Args:
+        directory (str): Snapshot root directory
+
+    Returns:
+        dict or None: The loaded manifest, or None when there is no usable snapshot
+    """
+    from utils.skill_index import skill_index
+    from utils.candidate_filter import candidate_filter
+    from utils.static_scores import static_score_table
+
+    started = time.perf_counter()
+
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            path = os.path.join(directory, f.read().strip())
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION or manifest.get('maps_digest') != maps_digest():
+        current_app.logger.info(f"Ignoring incompatible matcher index snapshot {path}")
+        return None
+
+    try:
+        arrays = {
+            # Copy-on-write, since the candidate filter updates its arrays in place
+            key: np.load(os.path.join(path, f'{key}.npy'), mmap_mode='c', allow_pickle=False)
+            for key in manifest['arrays']
+        }
+    except (OSError, ValueError) as e:
+        current_app.logger.error(f"Error loading matcher index snapshot: {str(e)}")
+        return None
+
+    try:
+        if not candidate_filter.load_arrays(arrays, manifest['filter_names']):
+            current_app.logger.info(f"Ignoring matcher index snapshot {path} with different keyword columns")
+            return None
+        skill_index.load_arrays(arrays['skill_tokens'], arrays['skill_offsets'], arrays['skill_employee_ids'])
+        static_score_table.load_arrays(arrays, manifest['domains'])
+
+        changed = apply_deltas(manifest, arrays['filter_ids'])
+    except Exception as e:
+        # Fall back to building everything from the database on first use
+        skill_index.is_built = False
+        candidate_filter.invalidate()
+        static_score_table.invalidate()
+        current_app.logger.error(f"Error applying matcher index snapshot: {str(e)}")
+        return None
+
+    current_app.logger.info(
+        f"Matcher index snapshot {os.path.basename(path)} loaded with {changed} changed employees "
+        f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+    )
+    return manifest
+
+
+def apply_deltas(manifest, snapshot_ids):
+    """
+    Bring freshly loaded indexes up to date with the database.
+
+    Returns:
+        int: Number of employees re-read or dropped
+    """
+    from models.database import db, Employee
+    from utils.skill_index import skill_index
+    from utils.candidate_filter import candidate_filter
+
+    query = db.session.query(Employee.id, Employee.skills)
+    watermark = manifest.get('watermark')
+    if watermark:
+        query = query.filter(Employee.updated_at >= datetime.fromisoformat(watermark) - WATERMARK_SLACK)
+    changed = dict(query.all())
+
+    # Additions and deletions don't necessarily move the watermark
+    current_ids = {employee_id for employee_id, in db.session.query(Employee.id)}
+    known_ids = set(snapshot_ids.tolist())
+    for employee_id, skills in db.session.query(Employee.id, Employee.skills).filter(
+            Employee.id.in_(current_ids - known_ids - set(changed))):
+        changed[employee_id] = skills
+    removed = known_ids - current_ids
+
+    for employee_id, skills in changed.items():
+        skill_index.update_employee(employee_id, skills)
+    for employee_id in removed:
+        skill_index.remove_employee(employee_id)
+
+    candidate_filter.invalidate(set(changed) | removed)
+    candidate_filter.refresh_task_counts()
+
+    return len(changed) + len(removed)
+
+
+def _prune(directory, current):
+    """Delete all but the newest SNAPSHOTS_KEPT snapshots"""
+    snapshots = sorted(
+        entry for entry in os.listdir(directory)
+        if entry.startswith('snapshot-') and os.path.isdir(os.path.join(directory, entry))
+    )
+    for entry in snapshots[:-SNAPSHOTS_KEPT]:
+        if entry != current:
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+
+def main():
+    """
+    Write or load a matcher index snapshot.
+
+    Usage:
+        python -m utils.index_snapshot write --dir var/matcher-index
+        python -m utils.index_snapshot load --dir var/matcher-index
+    """
+    from flask import Flask
+    from config.config import config
+    from models.database import db
+
+    parser = argparse.ArgumentParser(description="Write or load a matcher index snapshot")
+    parser.add_argument('action', choices=['write', 'load'])
+    parser.add_argument('--dir', help='Snapshot directory (defaults to MATCHER_INDEX_SNAPSHOT_DIR)')
+    parser.add_argument('--config', default='default', help='Configuration name')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(config[args.config])
+    db.init_app(app)
+
+    directory = args.dir or app.config.get('MATCHER_INDEX_SNAPSHOT_DIR')
+    if not directory:
+        parser.error("Set --dir or MATCHER_INDEX_SNAPSHOT_DIR")
+
+    with app.app_context():
+        if args.action == 'write':
+            manifest = write_snapshot(directory)
+            print(f"Wrote snapshot of {manifest['employees']} employees (watermark {manifest['watermark']})")
+        else:
+            started = time.perf_counter()
+            manifest = load_snapshot(directory)
+            if manifest is None:
+                print("No usable snapshot found")
+            else:
+                print(f"Loaded snapshot of {manifest['employees']} employees "
+                      f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+import re
+from collections import deque
+
+# Characters that continue a word for whole-word matching: ASCII letters,
+# digits, underscore and anything non-ASCII. Written as the complement of the
+# other ASCII characters; a class spanning all of Unicode compiles ~50x slower.
+_WORD_CHAR = r'[^\x00-/:-@\[-^`{-\x7f]'
+_NON_WORD_CHAR = r'[\x00-/:-@\[-^`{-\x7f]'
+
+
+def _is_word_char(char):
+    """Whether a character matches _WORD_CHAR"""
+    return not char.isascii() or char.isalnum() or char == '_'
+
+
+class KeywordAutomaton:
+    """
+    Multi-pattern keyword matcher.
+    
+    Keywords are registered under one or more categories. scan() reports
+    every keyword occurring as a substring (the same rule as
+    `keyword in text.lower()`). Below DFA_MIN_KEYWORDS keywords, which
+    covers the vocabularies shipped with the app, it does exactly that:
+    CPython's C-level substring search beats a Python-level walk over the
+    text. A larger vocabulary is compiled, on its first such scan, into a
+    byte-level Aho-Corasick automaton that walks the text once however many
+    keywords are registered.
+    
+    scan_words() reports whole-word occurrences only, so short keywords
+    such as "ui" don't match inside "build". A keyword registered as a
+    prefix only needs a word boundary before it ("deploy" then matches
+    "deployment"). It runs a trie-shaped regular expression compiled by
+    build(), whatever the vocabulary size.
+    """
+    
+    # Vocabulary size from which the automaton walk outperforms per-keyword
+    # substring checks (see benchmarks/bench_keyword_automaton.py)
+    DFA_MIN_KEYWORDS = 100
+    
+    # Bound on memoized cached_categories() results
+    MEMO_SIZE = 50000
+    
+    def __init__(self, keywords_by_category=None):
+        """
+        Args:
+            keywords_by_category (dict): category -> list of keywords. Category
+                order is kept and used by first_category().
+        """
+        self._categories = {}  # keyword -> list of categories
+        self._prefixes = set()
+        self._category_order = {}
+        self._keywords_by_category = {}
+        self._memo = {}
+        self._compiled = False
+        
+        for category, keywords in (keywords_by_category or {}).items():
+            for keyword in keywords:
+                self.add(keyword, category)
+    
+    def add(self, keyword, category, prefix=False):
+        """
+        Register a keyword under a category.
+        
+        Args:
+            keyword (str): Keyword, matched case-insensitively
+            category: Category reported for the keyword
+            prefix (bool): For scan_words(), match the keyword at the start
+                of longer words too
+        """
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        
+        if prefix:
+            self._prefixes.add(keyword)
+        self._category_order.setdefault(category, len(self._category_order))
+        categories = self._categories.setdefault(keyword, [])
+        if category not in categories:
+            categories.append(category)
+            self._keywords_by_category.setdefault(category, []).append(keyword)
+        self._compiled = False
+        self._memo = {}
+    
+    def build(self):
+        """Compile the whole-word expression (done lazily on the first scan)"""
+        keywords = list(self._categories)
+        self._dfa = None
+        self._word_pattern = self._compile_word_pattern(keywords)
+        self._boundary_pattern = None
+        self._separator_keywords = frozenset(
+            keyword for keyword in keywords if not _is_word_char(keyword[-1])
+        )
+        self._compiled = True
+    
+    def _build_dfa(self):
+        """
+        Compile the Aho-Corasick automaton for scan().
+        
+        Returns:
+            tuple: (byte translation, transition table, outputs by state)
+        """
+        keywords = list(self._categories)
+        
+        # Map each byte that occurs in a keyword to a compact alphabet code;
+        # every other byte maps to 0 and always returns to the root state
+        alphabet = sorted({byte for keyword in keywords for byte in keyword.encode('utf-8')})
+        translation = bytearray(256)
+        for code, byte in enumerate(alphabet, 1):
+            translation[byte] = code
+        stride = len(alphabet) + 1
+        
+        # Trie of keywords over alphabet codes
+        children = [{}]
+        terminal = [()]
+        for keyword in keywords:
+            state = 0
+            for byte in keyword.encode('utf-8'):
+                code = translation[byte]
+                next_state = children[state].get(code)
+                if next_state is None:
+                    next_state = len(children)
+                    children[state][code] = next_state
+                    children.append({})
+                    terminal.append(())
+                state = next_state
+            terminal[state] = (keyword,)
+        
+        # Breadth-first failure links, folded into a full transition table
+        # whose entries are premultiplied by the stride
+        state_count = len(children)
+        table = [0] * (state_count * stride)
+        fail = [0] * state_count
+        outputs = [()] * state_count
+        queue = deque()
+        
+        for code, child in children[0].items():
+            table[code] = child * stride
+            queue.append(child)
+        
+        while queue:
+            state = queue.popleft()
+            outputs[state] = terminal[state] + outputs[fail[state]]
+            
+            base = state * stride
+            fail_base = fail[state] * stride
+            table[base:base + stride] = table[fail_base:fail_base + stride]
+            for code, child in children[state].items():
+                fail[child] = table[fail_base + code] // stride
+                table[base + code] = child * stride
+                queue.append(child)
+        
+        return bytes(translation), table, {
+            state * stride: keywords_found
+            for state, keywords_found in enumerate(outputs) if keywords_found
+        }
+    
+    def scan(self, text):
+        """
+        Find every registered keyword occurring in the text.
+        
+        Returns:
+            dict: keyword -> list of its categories
+        """
+        if not self._compiled:
+            self.build()
+        if not text or not self._categories:
+            return {}
+        
+        if len(self._categories) < self.DFA_MIN_KEYWORDS:
+            text_lower = text.lower()
+            return {
+                keyword: categories
+                for keyword, categories in self._categories.items() if keyword in text_lower
+            }
+        
+        # Built once, on the first scan that needs it; a concurrent build
+        # produces the same automaton
+        if self._dfa is None:
+            self._dfa = self._build_dfa()
+        translation, table, outputs = self._dfa
+        hits = set()
+        
+        state = 0
+        for code in text.lower().encode('utf-8').translate(translation):
+            state = table[state + code]
+            if state in outputs:
+                hits.add(state)
+        
+        return {
+            keyword: self._categories[keyword]
+            for state in hits for keyword in outputs[state]
+        }
+    
+    def scan_words(self, text):
+        """
+        Find every registered keyword occurring as a whole word in the text.
+        
+        A keyword starting (ending) with a letter, digit or underscore must
+        not be preceded (followed) by one, so "ui" matches "new ui flow" but
+        not "build", while "c++" matches "c++11". Matches don't overlap: at
+        each position the longest keyword wins, so "react native" doesn't
+        also report "react".
+        
+        Returns:
+            dict: keyword -> list of its categories
+        """
+        return {keyword: self._categories[keyword] for keyword in self.find_words(text)}
+    
+    def find_words(self, text):
+        """
+        scan_words() without the categories.
+        
+        The keywords are compiled into one trie-shaped regular expression,
+        which walks the text once in C. Each keyword starting with a word
+        character is preceded in the expression by the separator before it,
+        so every alternative starts with a non-word character and the
+        regex engine skips from one to the next instead of trying the
+        keywords at every position. A keyword ending in a separator (such
+        as "c++") could take the separator the next keyword needs, so a
+        text where one matches is walked again with a lookbehind for the
+        word boundary instead.
+        
+        Returns:
+            set: Keywords found
+        """
+        if not self._compiled:
+            self.build()
+        if not text or not self._categories:
+            return set()
+        
+        text_lower = text.lower()
+        found = self._word_pattern.findall(' ' + text_lower)
+        if found and isinstance(found[0], tuple):
+            found = [other or word for other, word in found]
+        found = set(found)
+        
+        if self._separator_keywords.isdisjoint(found):
+            return found
+        
+        if self._boundary_pattern is None:
+            self._boundary_pattern = self._compile_word_pattern(self._categories, separators=False)
+        return set(self._boundary_pattern.findall(text_lower))
+    
+    def _compile_word_pattern(self, keywords, separators=True):
+        """
+        Compile the keywords into a trie-shaped regex for find_words().
+        
+        With separators, a keyword starting with a word character is matched
+        together with the non-word character before it and reported through
+        a group; texts need a separator prepended. Otherwise it is preceded
+        by a lookbehind for one and the whole match is the keyword.
+        """
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = keyword
+        
+        def branch(node):
+            # Longer keywords are tried before the keyword ending here
+            alternatives = [re.escape(char) + branch(child) for char, child in node.items() if char]
+            body = None
+            if alternatives:
+                body = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+            if '' not in node:
+                return body
+            
+            keyword = node['']
+            end = ''
+            if _is_word_char(keyword[-1]) and keyword not in self._prefixes:
+                end = f'(?!{_WORD_CHAR})'
+            if body is None:
+                return end
+            return f'(?:{body}|{end})'
+        
+        # Keywords starting with a word character need a word boundary before them
+        word_starts = []
+        other_starts = []
+        for char, child in trie.items():
+            start = re.escape(char) + (branch(child) or '')
+            (word_starts if _is_word_char(char) else other_starts).append(start)
+        
+        if not separators:
+            starts = other_starts
+            if word_starts:
+                starts.append(f"(?<!{_WORD_CHAR})(?:{'|'.join(word_starts)})")
+            return re.compile('|'.join(starts) if starts else '(?!)')
+        
+        if not word_starts:
+            return re.compile('|'.join(other_starts) if other_starts else '(?!)')
+        words = f"{_NON_WORD_CHAR}({'|'.join(word_starts)})"
+        if not other_starts:
+            return re.compile(words)
+        # Tried first at a separator, as the lookbehind form would
+        return re.compile(f"({'|'.join(other_starts)})|{words}")
+    
+    def categories(self, text):
+        """Get the set of categories with at least one keyword in the text"""
+        return {
+            category
+            for categories in self.scan(text).values() for category in categories
+        }
+    
+    def cached_categories(self, text):
+        """
+        Memoized categories() for short, frequently repeated strings such as
+        individual skill names.
+        
+        Returns:
+            frozenset: Categories with at least one keyword in the text
+        """
+        categories = self._memo.get(text)
+        if categories is None:
+            categories = frozenset(self.categories(text))
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo = {}
+            self._memo[text] = categories
+        return categories
+    
+    def first_category(self, text, default=None):
+        """Get the earliest-registered category matched by the text"""
+        if len(self._categories) < self.DFA_MIN_KEYWORDS:
+            # Check categories in order and stop at the first hit
+            text_lower = (text or '').lower()
+            for category, keywords in self._keywords_by_category.items():
+                if any(keyword in text_lower for keyword in keywords):
+                    return category
+            return default
+        
+        categories = self.categories(text)
+        if not categories:
+            return default
+        return min(categories, key=self._category_order.__getitem__)
+
+
+# Task type keywords, checked in this order
+TASK_TYPE_KEYWORDS = {
+    'bug': [
+        'bug', 'error', 'broken', 'not working', 'fails', 'crash', 'exception',
+        'issue', 'problem', 'defect', 'glitch', 'malfunction', 'doesn\'t work'
+    ],
+    'incident': [
+        'incident', 'outage', 'down', 'emergency', 'urgent', 'critical',
+        'alert', 'alarm', 'service down', 'system down', 'broken'
+    ],
+    'feature': [
+        'feature', 'new', 'add', 'implement', 'create', 'build', 'develop',
+        'enhancement', 'improvement', 'request', 'suggestion', 'idea'
+    ],
+    'task': [
+        'task', 'work', 'do', 'need to', 'have to', 'should', 'must',
+        'create', 'update', 'modify', 'change', 'fix', 'review', 'check'
+    ]
+}
+
+# Priority keywords, checked in this order
+PRIORITY_KEYWORDS = {
+    'high': ['urgent', 'asap', 'emergency', 'critical', 'blocker'],
+    'low': ['low priority', 'when possible', 'no rush', 'nice to have']
+}
+
+# Shared automata, built once at import
+task_type_automaton = KeywordAutomaton(TASK_TYPE_KEYWORDS)
+task_type_automaton.build()
+priority_automaton = KeywordAutomaton(PRIORITY_KEYWORDS)
+priority_automaton.build()
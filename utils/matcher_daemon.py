@@ -0,0 +1,579 @@
+import argparse
+import math
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from datetime import date
+from flask import current_app
+from sqlalchemy import event
+from utils.roster_events import touched_employee_ids, task_assignee_ids
+from utils.capacity_timeline import TIMELINE_TASK_COLUMNS, as_date
+from utils.workload_ledger import LEDGER_TASK_COLUMNS
+
+# Frame header: operation (request) or status (response) byte, payload length
+HEADER = struct.Struct('!BI')
+
+OP_PING = 1
+OP_RANK = 2
+OP_INVALIDATE = 3
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+# Largest payload either side accepts
+MAX_PAYLOAD = 1 << 24
+
+_COUNT = struct.Struct('!H')
+_ID = struct.Struct('!I')
+_VERSION = struct.Struct('!Q')
+# Estimated hours, due date ordinal (0 when unset), limit (0 for every candidate),
+# max active tasks (-1 when unset)
+_TASK = struct.Struct('!dIHi')
+
+# Largest limit a ranking request can carry
+MAX_RANK_LIMIT = 0xFFFF
+# Employee id, score
+_RESULT = struct.Struct('!Id')
+# Full rebuild flag, employee id count
+_INVALIDATE = struct.Struct('!?I')
+
+# Task columns whose edits change the daemon's view of the task's assignees
+DAEMON_TASK_COLUMNS = tuple(dict.fromkeys(LEDGER_TASK_COLUMNS + TIMELINE_TASK_COLUMNS))
+
+# Session.info keys for writes the daemon must hear about
+PENDING_IDS_KEY = 'matcher_daemon_pending_ids'
+PENDING_KEY = 'matcher_daemon_pending'
+
+
+class MatcherDaemonError(Exception):
+    """The matcher daemon is unreachable or failed to answer"""
+
+
+class MatcherDaemonDown(MatcherDaemonError):
+    """The daemon failed recently and isn't retried yet"""
+
+
+def _pack_string(buffer, value):
+    data = (value or '').encode('utf-8')
+    buffer += _COUNT.pack(len(data))
+    buffer += data
+
+
+def _pack_strings(buffer, values):
+    values = list(values or ())
+    buffer += _COUNT.pack(len(values))
+    for value in values:
+        _pack_string(buffer, value)
+
+
+class _Reader:
+    """Sequential reader over a payload"""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.offset = 0
+
+    def unpack(self, layout):
+        values = layout.unpack_from(self.payload, self.offset)
+        self.offset += layout.size
+        return values
+
+    def string(self):
+        length, = self.unpack(_COUNT)
+        value = self.payload[self.offset:self.offset + length].decode('utf-8')
+        self.offset += length
+        return value
+
+    def strings(self):
+        count, = self.unpack(_COUNT)
+        return [self.string() for _ in range(count)]
+
+
+def _due_ordinal(due_date):
+    """Due date as a proleptic Gregorian ordinal, 0 when unset or unparseable"""
+    due_on = as_date(due_date)
+    return due_on.toordinal() if due_on else 0
+
+
+def encode_rank_request(scoring_engine, task_type, priority, required_domain, limit,
+                        estimated_hours=None, due_date=None, required_skills=None,
+                        constraints=None):
+    """
+    Encode a ranking request payload.
+
+    A limit of None ranks every candidate. Raises ValueError for limits
+    below 1 or above MAX_RANK_LIMIT.
+    """
+    from utils.candidate_filter import normalize_constraints
+
+    if limit is not None and not 1 <= limit <= MAX_RANK_LIMIT:
+        raise ValueError(f"Ranking limit must be between 1 and {MAX_RANK_LIMIT}, got {limit}")
+
+    constraints = dict(normalize_constraints(constraints))
+    max_active_tasks = constraints.get('max_active_tasks')
+
+    payload = bytearray()
+    for value in (scoring_engine, task_type, priority, required_domain):
+        _pack_string(payload, value)
+    _pack_strings(payload, required_skills)
+    _pack_strings(payload, constraints.get('level'))
+    _pack_strings(payload, constraints.get('department'))
+    _pack_string(payload, constraints.get('domain'))
+    payload += _TASK.pack(
+        math.nan if estimated_hours is None else float(estimated_hours),
+        _due_ordinal(due_date),
+        0 if limit is None else limit,
+        -1 if max_active_tasks is None else max_active_tasks
+    )
+    return bytes(payload)
+
+
+def decode_rank_request(payload):
+    """
+    Decode a ranking request payload.
+
+    Returns:
+        dict: Keyword arguments for EmployeeMatcher._rank plus scoring_engine
+    """
+    reader = _Reader(payload)
+    scoring_engine, task_type, priority, required_domain = (reader.string() for _ in range(4))
+    required_skills = reader.strings()
+    levels = reader.strings()
+    departments = reader.strings()
+    domain = reader.string()
+    estimated_hours, due_ordinal, limit, max_active_tasks = reader.unpack(_TASK)
+
+    constraints = {}
+    if levels:
+        constraints['level'] = levels
+    if departments:
+        constraints['department'] = departments
+    if domain:
+        constraints['domain'] = domain
+    if max_active_tasks >= 0:
+        constraints['max_active_tasks'] = max_active_tasks
+
+    return {
+        'scoring_engine': scoring_engine,
+        'task_type': task_type,
+        'priority': priority,
+        'required_domain': required_domain,
+        'limit': limit or None,
+        'estimated_hours': None if math.isnan(estimated_hours) else estimated_hours,
+        'due_date': date.fromordinal(due_ordinal) if due_ordinal else None,
+        'required_skills': required_skills or None,
+        'constraints': constraints or None
+    }
+
+
+def _recv_exact(sock, size):
+    """Read exactly size bytes; None on a clean end of stream before the first byte"""
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            if remaining == size:
+                return None
+            raise ConnectionError("Connection closed mid-frame")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+class MatcherClient:
+    """
+    Client for the matcher daemon.
+
+    Each thread keeps one persistent connection. After a failure the daemon
+    is treated as down for `retry_interval` seconds, so callers fall back to
+    in-process matching without paying a connection timeout on every call.
+    """
+
+    def __init__(self, socket_path, timeout=2.0, retry_interval=5.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._local = threading.local()
+        self._down_until = 0.0
+
+    def rank(self, scoring_engine, task_type, priority, required_domain, limit,
+             estimated_hours=None, due_date=None, required_skills=None, constraints=None):
+        """
+        Rank candidates in the daemon.
+
+        Returns:
+            list: (employee id, score) tuples, highest score first
+        """
+        body = self._request(OP_RANK, encode_rank_request(
+            scoring_engine, task_type, priority, required_domain, limit,
+            estimated_hours, due_date, required_skills, constraints
+        ))
+        reader = _Reader(body)
+        count, = reader.unpack(_ID)
+        return [reader.unpack(_RESULT) for _ in range(count)]
+
+    def invalidate(self, employee_ids=(), full=False):
+        """Tell the daemon which employees changed; full=True reloads everything"""
+        employee_ids = list(employee_ids)
+        payload = _INVALIDATE.pack(full, len(employee_ids))
+        payload += b''.join(_ID.pack(employee_id) for employee_id in employee_ids)
+        self._request(OP_INVALIDATE, payload)
+
+    def ping(self):
+        """Get the daemon's roster version"""
+        version, = _VERSION.unpack(self._request(OP_PING, b''))
+        return version
+
+    def _request(self, op, payload):
+        if time.monotonic() < self._down_until:
+            raise MatcherDaemonDown("Matcher daemon marked down")
+
+        # A kept-alive connection may predate a daemon restart, so retry once on a fresh one
+        reused = getattr(self._local, 'sock', None) is not None
+        for attempt in range(2 if reused else 1):
+            try:
+                status, body = self._exchange(self._connection(), op, payload)
+                break
+            except (OSError, struct.error) as e:
+                self._close()
+                if attempt + 1 == (2 if reused else 1):
+                    self._down_until = time.monotonic() + self.retry_interval
+                    raise MatcherDaemonError(str(e)) from e
+
+        if status != STATUS_OK:
+            raise MatcherDaemonError(body.decode('utf-8', 'replace'))
+        return body
+
+    @staticmethod
+    def _exchange(sock, op, payload):
+        sock.sendall(HEADER.pack(op, len(payload)) + payload)
+        header = _recv_exact(sock, HEADER.size)
+        if header is None:
+            raise ConnectionError("Connection closed by daemon")
+        status, length = HEADER.unpack(header)
+        if length > MAX_PAYLOAD:
+            raise ConnectionError(f"Response of {length} bytes exceeds the frame limit")
+        body = _recv_exact(sock, length) if length else b''
+        if body is None:
+            raise ConnectionError("Connection closed by daemon")
+        return status, body
+
+    def _connection(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(socket_path, timeout=2.0):
+    """Get the shared client for a daemon socket"""
+    with _clients_lock:
+        client = _clients.get(socket_path)
+        if client is None:
+            client = _clients[socket_path] = MatcherClient(socket_path, timeout)
+        return client
+
+
+class DaemonNotifier:
+    """
+    Forwards committed roster writes from a web worker to the matcher daemon.
+
+    The daemon's own session never sees writes made by web workers, so the
+    ids of employees whose row or assignments were written, and the
+    assignees of tasks whose hours, due date, priority or source changed,
+    are sent as an invalidation once the transaction commits. Other
+    task-only writes send an empty invalidation, which only expires the
+    daemon's cached rankings.
+    """
+
+    def __init__(self):
+        self.client = None
+        self.is_listening = False
+
+    def init_app(self, app):
+        """Start forwarding commits when MATCHER_DAEMON_SOCKET is configured"""
+        from models.database import db
+
+        socket_path = app.config.get('MATCHER_DAEMON_SOCKET')
+        if not socket_path or self.is_listening:
+            return
+
+        self.client = get_client(socket_path, app.config.get('MATCHER_DAEMON_TIMEOUT', 2.0))
+        event.listen(db.session, 'after_flush', self._after_flush)
+        event.listen(db.session, 'after_commit', self._after_commit)
+        event.listen(db.session, 'after_rollback', self._after_rollback)
+        self.is_listening = True
+
+    def _after_flush(self, session, flush_context):
+        from models.database import Employee, Task, TaskAssignment
+
+        for objects in (session.new, session.dirty, session.deleted):
+            if any(isinstance(obj, (Employee, Task, TaskAssignment)) for obj in objects):
+                session.info[PENDING_KEY] = True
+                session.info.setdefault(PENDING_IDS_KEY, set()).update(
+                    touched_employee_ids(session) | task_assignee_ids(session, DAEMON_TASK_COLUMNS)
+                )
+                return
+
+    def _after_commit(self, session):
+        employee_ids = session.info.pop(PENDING_IDS_KEY, set())
+        if not session.info.pop(PENDING_KEY, False):
+            return
+
+        try:
+            self.client.invalidate(employee_ids)
+        except MatcherDaemonError as e:
+            # The daemon reloads on start and reconciles periodically
+            current_app.logger.debug(f"Matcher daemon not notified: {str(e)}")
+
+    def _after_rollback(self, session):
+        session.info.pop(PENDING_KEY, None)
+        session.info.pop(PENDING_IDS_KEY, None)
+
+
+# Shared notifier for the web app
+daemon_notifier = DaemonNotifier()
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Serves frames on one client connection until it closes"""
+
+    def handle(self):
+        while True:
+            try:
+                header = _recv_exact(self.request, HEADER.size)
+                if header is None:
+                    return
+                op, length = HEADER.unpack(header)
+                if length > MAX_PAYLOAD:
+                    return
+                payload = _recv_exact(self.request, length) if length else b''
+            except OSError:
+                return
+
+            status, body = self.server.dispatch(op, payload)
+            try:
+                self.request.sendall(HEADER.pack(status, len(body)) + body)
+            except OSError:
+                return
+
+
+class MatcherDaemon(socketserver.ThreadingUnixStreamServer):
+    """
+    Long-lived matcher process shared by every web worker.
+
+    Keeps the workload ledger, skill index, candidate filter, static score
+    table and ranking cache of one process warm, and answers ranking
+    requests over a Unix domain socket. Invalidations sent by the web
+    workers' DaemonNotifier are applied before the next ranking.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, app, socket_path):
+        self.app = app
+        self.socket_path = socket_path
+        self._pending_ids = set()
+        self._pending_full = False
+        self._pending = False
+        self._pending_lock = threading.Lock()
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+
+    def warm(self):
+        """Load every in-memory structure before serving"""
+        from utils.workload_ledger import workload_ledger
+        from utils.skill_index import skill_index
+        from utils.candidate_filter import candidate_filter
+        from utils.capacity_timeline import capacity_timeline
+
+        with self.app.app_context():
+            snapshot_dir = self.app.config.get('MATCHER_INDEX_SNAPSHOT_DIR')
+            if snapshot_dir:
+                from utils.index_snapshot import load_snapshot, write_snapshot
+
+                # Persist the indexes once so the next start only replays deltas
+                if load_snapshot(snapshot_dir) is None:
+                    write_snapshot(snapshot_dir)
+
+            workload_ledger.ensure_loaded()
+            skill_index.ensure_built()
+            candidate_filter.ensure_loaded()
+            capacity_timeline.ensure_loaded()
+
+    def dispatch(self, op, payload):
+        """Handle one request frame and return (status, body)"""
+        from utils.roster_events import roster_version
+
+        try:
+            with self.app.app_context():
+                if op == OP_PING:
+                    return STATUS_OK, _VERSION.pack(roster_version.value)
+                if op == OP_INVALIDATE:
+                    self._queue_invalidation(payload)
+                    return STATUS_OK, b''
+                if op == OP_RANK:
+                    self._apply_invalidations()
+                    return STATUS_OK, self._rank(decode_rank_request(payload))
+                return STATUS_ERROR, f"Unknown operation {op}".encode('utf-8')
+
+        except Exception as e:
+            with self.app.app_context():
+                current_app.logger.error(f"Error handling matcher daemon request: {str(e)}")
+            return STATUS_ERROR, str(e).encode('utf-8')
+
+    def _rank(self, request):
+        from utils.employee_matcher import EmployeeMatcher
+        from utils.ranking_cache import ranking_cache, ranking_signature, MISS
+        from utils.candidate_filter import normalize_constraints
+
+        matcher = EmployeeMatcher(scoring_engine=request.pop('scoring_engine') or None)
+
+        # Hours and due dates change the ranking only through the scorers that read them
+        cache_key = ranking_signature(
+            request['task_type'], request['priority'], request['required_domain'],
+            request['required_skills']
+        ) + ('daemon', matcher.scoring_engine, request['limit'], request['estimated_hours'],
+             request['due_date'], normalize_constraints(request['constraints']))
+        body = ranking_cache.get(cache_key)
+
+        if body is MISS:
+            version = ranking_cache.current_version()
+            ranked = matcher._rank(**request)
+            body = _ID.pack(len(ranked)) + b''.join(
+                _RESULT.pack(employee.id, score) for employee, score in ranked
+            )
+            ranking_cache.put(cache_key, body, version)
+        return body
+
+    def _queue_invalidation(self, payload):
+        reader = _Reader(payload)
+        full, count = reader.unpack(_INVALIDATE)
+        employee_ids = [reader.unpack(_ID)[0] for _ in range(count)]
+        with self._pending_lock:
+            self._pending = True
+            self._pending_full = self._pending_full or full
+            self._pending_ids.update(employee_ids)
+
+    def _apply_invalidations(self):
+        """Refresh what the queued invalidations touched"""
+        from models.database import db, Employee
+        from utils.workload_ledger import workload_ledger
+        from utils.skill_index import skill_index
+        from utils.candidate_filter import candidate_filter
+        from utils.capacity_timeline import capacity_timeline
+        from utils.roster_events import roster_version
+
+        with self._pending_lock:
+            if not self._pending:
+                return
+            employee_ids, full = self._pending_ids, self._pending_full
+            self._pending_ids, self._pending_full, self._pending = set(), False, False
+
+        if full:
+            skill_index.build_from_db()
+            candidate_filter.invalidate()
+            capacity_timeline.invalidate()
+            workload_ledger.reconcile()
+        elif employee_ids:
+            rows = dict(
+                db.session.query(Employee.id, Employee.skills).filter(Employee.id.in_(employee_ids)).all()
+            )
+            for employee_id in employee_ids:
+                if employee_id in rows:
+                    skill_index.update_employee(employee_id, rows[employee_id])
+                else:
+                    skill_index.remove_employee(employee_id)
+            candidate_filter.invalidate(employee_ids)
+            capacity_timeline.invalidate(employee_ids)
+            workload_ledger.refresh(employee_ids)
+
+        roster_version.bump()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def create_daemon_app(config_name='default'):
+    """Create the minimal Flask app the daemon matches in"""
+    from flask import Flask
+    from config.config import config
+    from models.database import db
+    from utils.workload_ledger import workload_ledger
+    from utils.roster_events import roster_version
+    from utils.ranking_cache import ranking_cache
+    from utils.skill_index import skill_index
+    from utils.candidate_filter import candidate_filter
+    from utils.capacity_timeline import capacity_timeline
+
+    app = Flask(__name__)
+    app.config.from_object(config[config_name])
+    # Matchers inside the daemon always score in-process
+    app.config['MATCHER_DAEMON_SOCKET'] = None
+
+    db.init_app(app)
+    workload_ledger.init_app(app)
+    roster_version.init_app(app)
+    ranking_cache.init_app(app)
+    skill_index.init_app(app)
+    candidate_filter.init_app(app)
+    capacity_timeline.init_app(app)
+    return app
+
+
+def main():
+    """
+    Run the matcher daemon.
+
+    Usage:
+        python -m utils.matcher_daemon --socket /tmp/matcher.sock
+    """
+    parser = argparse.ArgumentParser(description="Run the employee matcher daemon")
+    parser.add_argument('--socket', help='Unix socket path (defaults to MATCHER_DAEMON_SOCKET)')
+    parser.add_argument('--config', default='default', help='Configuration name')
+    args = parser.parse_args()
+
+    app = create_daemon_app(args.config)
+    from config.config import config
+    socket_path = args.socket or config[args.config].MATCHER_DAEMON_SOCKET
+    if not socket_path:
+        parser.error("Set --socket or MATCHER_DAEMON_SOCKET")
+
+    server = MatcherDaemon(app, socket_path)
+    server.warm()
+    print(f"Matcher daemon listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
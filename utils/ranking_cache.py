@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+from utils.roster_events import roster_version
+
+# Returned by RankingCache.get when there is no usable entry
+MISS = object()
+
+
+def ranking_signature(task_type, priority, required_domain, required_skills=None):
+    """
+    Normalize a matching request into a cache key.
+
+    Only differences the matcher ignores are normalized away: task type and
+    domain case, and the order of required skills (which are compared
+    lowercased). Priority stays as given because only 'high' is special.
+    Duplicate skills are kept since they change the skills match ratio.
+    """
+    skills = tuple(sorted(skill.lower() for skill in required_skills)) if required_skills else ()
+    return (
+        (task_type or '').lower(),
+        priority,
+        (required_domain or '').lower(),
+        skills
+    )
+
+
+class RankingCache:
+    """
+    TTL + LRU cache of formatted matcher results.
+
+    Entries are tagged with the roster version they were computed at. Any
+    committed employee, task or assignment write bumps the version, so a
+    stale ranking is never served; the TTL bounds staleness from writes the
+    session events can't see (bulk SQL, other processes). The cache only
+    serves entries while roster events are being tracked.
+
+    With versioned=False entries ignore the roster version and only expire
+    by TTL, for callers whose key already covers everything the value
+    depends on.
+    """
+
+    def __init__(self, max_size=1024, ttl=30, versioned=True):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.versioned = versioned
+        self.enabled = True
+        self._entries = OrderedDict()  # key -> (version, expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        """Apply the app's cache settings"""
+        self.enabled = app.config.get('RANKING_CACHE_ENABLED', self.enabled)
+        self.max_size = app.config.get('RANKING_CACHE_SIZE', self.max_size)
+        self.ttl = app.config.get('RANKING_CACHE_TTL_SECONDS', self.ttl)
+
+    @property
+    def is_active(self):
+        return self.enabled and (roster_version.is_listening or not self.versioned)
+
+    def current_version(self):
+        """Version to tag a result with; read it before computing the result"""
+        return roster_version.value if self.versioned else None
+
+    def get(self, key):
+        """
+        Get a cached result.
+
+        Returns:
+            The cached value, or MISS
+        """
+        if not self.is_active:
+            return MISS
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                version, expires_at, value = entry
+                if version == self.current_version() and expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            self.misses += 1
+            return MISS
+
+    def put(self, key, value, version=None):
+        """Store a result computed at roster `version`"""
+        if not self.is_active or version != self.current_version():
+            return
+
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'active': self.is_active,
+                'roster_version': self.current_version(),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+# Shared cache for the employee matching routes
+ranking_cache = RankingCache()
@@ -0,0 +1,105 @@
+import threading
+from sqlalchemy import event, inspect, select
+
+# Session.info key marking a transaction that wrote roster or workload rows
+CHANGED_KEY = 'roster_changed'
+
+
+def touched_employee_ids(session):
+    """
+    Get ids of employees whose row or assignments are in a flush.
+
+    Call from an after_flush handler. Reassigned assignments report both
+    the previous and the new employee.
+    """
+    from models.database import Employee, TaskAssignment
+
+    employee_ids = set()
+    for objects in (session.new, session.dirty, session.deleted):
+        for obj in objects:
+            if isinstance(obj, Employee):
+                employee_ids.add(obj.id)
+            elif isinstance(obj, TaskAssignment):
+                history = inspect(obj).attrs.employee_id.history
+                employee_ids.update(
+                    value for value in (obj.employee_id, *history.deleted) if value is not None
+                )
+    return employee_ids
+
+
+def task_assignee_ids(session, columns):
+    """
+    Get ids of employees assigned to flushed tasks whose given columns changed.
+
+    Call from an after_flush handler.
+    """
+    from models.database import Task, TaskAssignment
+
+    task_ids = [
+        obj.id for obj in session.dirty
+        if isinstance(obj, Task) and any(
+            inspect(obj).attrs[column].history.has_changes() for column in columns
+        )
+    ]
+    if not task_ids:
+        return set()
+
+    return set(session.connection().execute(
+        select(TaskAssignment.employee_id).where(TaskAssignment.task_id.in_(task_ids))
+    ).scalars())
+
+
+class RosterVersion:
+    """
+    Global version number for the employee roster and workload.
+
+    Bumped whenever a transaction that inserted, updated or deleted an
+    Employee, Task or TaskAssignment row commits, so caches derived from the
+    roster can tag their entries with the version they were computed at and
+    treat any entry with an older version as stale.
+    """
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+        self.is_listening = False
+
+    def init_app(self, app):
+        """Start bumping the version on commits made through the app's session"""
+        from models.database import db
+
+        if self.is_listening:
+            return
+
+        event.listen(db.session, 'after_flush', self._after_flush)
+        event.listen(db.session, 'after_commit', self._after_commit)
+        event.listen(db.session, 'after_rollback', self._after_rollback)
+        self.is_listening = True
+
+    def bump(self):
+        """Invalidate everything derived from the current roster"""
+        with self._lock:
+            self.value += 1
+            return self.value
+
+    def _after_flush(self, session, flush_context):
+        from models.database import Employee, Task, TaskAssignment
+
+        if session.info.get(CHANGED_KEY):
+            return
+
+        for objects in (session.new, session.dirty, session.deleted):
+            if any(isinstance(obj, (Employee, Task, TaskAssignment)) for obj in objects):
+                session.info[CHANGED_KEY] = True
+                return
+
+    def _after_commit(self, session):
+        if session.info.pop(CHANGED_KEY, False):
+            self.bump()
+
+    def _after_rollback(self, session):
+        session.info.pop(CHANGED_KEY, None)
+
+
+# Shared version used by the matcher caches
+roster_version = RosterVersion()
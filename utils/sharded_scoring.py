@@ -0,0 +1,130 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from utils.employee_snapshot import EmployeeSnapshot
+
+SHARD_STRATEGIES = ('hash', 'department')
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _snapshot(employee):
+    """Picklable copy of the fields the scorers read"""
+    if isinstance(employee, EmployeeSnapshot):
+        return employee
+    return EmployeeSnapshot.from_employee(employee)
+
+
+def partition(employees, shards, strategy='hash'):
+    """
+    Split candidate positions into shards.
+
+    'hash' spreads employees by id. 'department' keeps each department in
+    one shard and packs departments largest-first onto the lightest shard,
+    so employees that score alike stay together.
+
+    Returns:
+        list: One list of candidate positions per non-empty shard
+    """
+    if strategy not in SHARD_STRATEGIES:
+        raise ValueError(f"Shard strategy must be one of: {', '.join(SHARD_STRATEGIES)}")
+
+    buckets = [[] for _ in range(shards)]
+
+    if strategy == 'hash':
+        for index, employee in enumerate(employees):
+            buckets[employee.id % shards].append(index)
+    else:
+        departments = {}
+        for index, employee in enumerate(employees):
+            departments.setdefault(employee.department or '', []).append(index)
+
+        for department in sorted(departments, key=lambda d: (-len(departments[d]), d)):
+            lightest = min(buckets, key=len)
+            lightest.extend(departments[department])
+
+        # Positions stay ascending so ties resolve in candidate order
+        for bucket in buckets:
+            bucket.sort()
+
+    return [bucket for bucket in buckets if bucket]
+
+
+def _score_shard(payload):
+    """Score one shard in a worker and return its local top-k"""
+    from utils.employee_matcher import EmployeeMatcher
+
+    (positions, employees, domain_expertise_map, domain_department_map,
+     task_type, priority, required_domain, limit, required_skills) = payload
+
+    matcher = EmployeeMatcher(scoring_engine='python')
+    matcher.domain_expertise_map = domain_expertise_map
+    matcher.domain_department_map = domain_department_map
+
+    position_of = {id(employee): position for employee, position in zip(employees, positions)}
+
+    top = matcher._top_employees(
+        employees, task_type, priority, required_domain, limit,
+        required_skills=required_skills
+    )
+    return [(position_of[id(employee)], score) for employee, score in top]
+
+
+def get_pool(workers):
+    """Get the shared process pool for a worker count, starting it on first use"""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # Spawned workers don't inherit the parent's locks, sessions or sockets
+            pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+            )
+            _pools[workers] = pool
+        return pool
+
+
+def shutdown_pools():
+    """Stop every worker pool"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+        _pools.clear()
+
+
+atexit.register(shutdown_pools)
+
+
+def sharded_top_employees(matcher, employees, task_type, priority, required_domain, limit,
+                          workers, strategy='hash', required_skills=None):
+    """
+    Score candidates across a process pool and merge the shards' top-k.
+
+    Each shard returns its own top `limit` with candidate positions; the
+    global top `limit` is always among them, and merging on (score,
+    position) reproduces the single-process ranking exactly.
+
+    Returns:
+        list: (employee, score) tuples, highest score first
+    """
+    shards = partition(employees, workers, strategy)
+
+    payloads = [
+        (
+            positions, [_snapshot(employees[position]) for position in positions],
+            matcher.domain_expertise_map, matcher.domain_department_map,
+            task_type, priority, required_domain, limit, required_skills
+        )
+        for positions in shards
+    ]
+
+    merged = []
+    for shard_top in get_pool(workers).map(_score_shard, payloads):
+        merged.extend(shard_top)
+
+    merged.sort(key=lambda item: (-item[1], item[0]))
+    if limit:
+        merged = merged[:limit]
+
+    return [(employees[position], score) for position, score in merged]
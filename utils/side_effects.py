@@ -0,0 +1,479 @@
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event, update, and_, or_, func
+from sqlalchemy.exc import IntegrityError
+
+# Session.info key marking a transaction that enqueued jobs
+ENQUEUED_KEY = 'side_effect_jobs_enqueued'
+
+JOB_STATUSES = ('pending', 'running', 'succeeded', 'failed')
+
+# Job kind -> handler(payload) returning a JSON-serializable result
+JOB_HANDLERS = {}
+
+
+class SideEffectError(Exception):
+    """A side effect didn't happen and the job should be retried"""
+
+
+def job_handler(kind):
+    """Register the handler that performs jobs of a kind"""
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+
+def enqueue(kind, payload, idempotency_key=None, max_attempts=None):
+    """
+    Add a side-effect job to the current transaction.
+
+    The job becomes visible to workers only when the caller commits, so the
+    side effect runs if and only if the change it belongs to is persisted.
+    A job whose idempotency key was already enqueued is not added again.
+    Keyed jobs are inserted in a savepoint, so losing a race with a
+    concurrent enqueue of the same key doesn't roll back the caller's
+    transaction.
+
+    Args:
+        kind (str): Registered job kind
+        payload (dict): JSON-serializable handler arguments
+        idempotency_key (str): Key identifying the side effect
+        max_attempts (int): Attempts before the job is marked failed
+            (defaults to SIDE_EFFECT_MAX_ATTEMPTS)
+
+    Returns:
+        SideEffectJob: The new or previously enqueued job
+    """
+    from models.database import db, SideEffectJob
+
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown side-effect job kind: {kind}")
+
+    if idempotency_key:
+        existing = job_for_key(idempotency_key)
+        if existing is not None:
+            return existing
+
+    job = SideEffectJob(
+        kind=kind,
+        idempotency_key=idempotency_key,
+        payload=json.dumps(payload),
+        status='pending',
+        attempts=0,
+        max_attempts=max_attempts or side_effect_queue.max_attempts,
+        run_after=datetime.now()
+    )
+    if idempotency_key:
+        try:
+            with db.session.begin_nested():
+                db.session.add(job)
+        except IntegrityError:
+            # Another transaction enqueued the same key since the check above
+            return job_for_key(idempotency_key)
+    else:
+        db.session.add(job)
+    db.session.info[ENQUEUED_KEY] = True
+    return job
+
+
+def assignment_email_key(assignment_id):
+    """Idempotency key of an assignment's notification email"""
+    return f'assignment_email:{assignment_id}'
+
+
+def enqueue_assignment_email(assignment, employee_email, task_title, task_description, jira_url=None):
+    """Queue the notification email for an assignment in the current transaction"""
+    from models.database import db
+
+    if assignment.id is None:
+        db.session.flush()
+
+    return enqueue('assignment_email', {
+        'employee_email': employee_email,
+        'task_title': task_title,
+        'task_description': task_description,
+        'jira_url': jira_url
+    }, idempotency_key=assignment_email_key(assignment.id))
+
+
+def job_for_key(idempotency_key):
+    """Get the job enqueued under an idempotency key, if any"""
+    from models.database import SideEffectJob
+
+    return SideEffectJob.query.filter_by(idempotency_key=idempotency_key).first()
+
+
+class SideEffectQueue:
+    """
+    Worker pool draining the side_effect_jobs table.
+
+    Jobs are claimed with a conditional UPDATE, so any number of threads
+    and processes can share the table: a claim only succeeds on a pending
+    job that is due, or on a running job whose lease expired because its
+    worker died. Failed attempts are retried with exponential backoff and
+    jitter until `max_attempts`, then the job is marked failed. Handlers run
+    at least once, so they must tolerate a repeat after a crash.
+
+    Workers sleep until a commit that enqueued jobs wakes them, polling
+    every `poll_interval` seconds for retries and jobs from other processes.
+    They start on the first request a process serves or the first commit
+    that enqueues jobs, so CLI commands and migrations that do neither run
+    none. With `workers=0` nothing runs in the web process and jobs are left
+    to `python -m utils.side_effects`.
+    """
+
+    def __init__(self, workers=2, max_attempts=5, backoff_base=2.0, backoff_max=300.0,
+                 poll_interval=5.0, lease_seconds=300):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.app = None
+        self.is_listening = False
+        self._condition = threading.Condition()
+        self._wakeups = 0
+        self._threads = []
+        self._pid = None
+        self._stopping = False
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+
+    def init_app(self, app):
+        """Configure the worker pool and start it when the app first serves or enqueues"""
+        from models.database import db
+
+        self.app = app
+        self.workers = app.config.get('SIDE_EFFECT_WORKERS', self.workers)
+        self.max_attempts = app.config.get('SIDE_EFFECT_MAX_ATTEMPTS', self.max_attempts)
+        self.backoff_base = app.config.get('SIDE_EFFECT_BACKOFF_SECONDS', self.backoff_base)
+        self.backoff_max = app.config.get('SIDE_EFFECT_BACKOFF_MAX_SECONDS', self.backoff_max)
+        self.poll_interval = app.config.get('SIDE_EFFECT_POLL_SECONDS', self.poll_interval)
+        self.lease_seconds = app.config.get('SIDE_EFFECT_LEASE_SECONDS', self.lease_seconds)
+
+        if not self.is_listening:
+            event.listen(db.session, 'after_commit', self._after_commit)
+            event.listen(db.session, 'after_rollback', self._after_rollback)
+            self.is_listening = True
+
+        app.before_request(self._before_request)
+
+    def start(self):
+        """Start the worker threads in this process, once"""
+        with self._condition:
+            # Threads don't survive a fork, so a forked worker process starts its own
+            if self.workers <= 0 or self.app is None or self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping = False
+            self._threads = [
+                threading.Thread(target=self._work, name=f'side-effects-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=None):
+        """Ask the worker threads to exit after their current job and wait for them"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        with self._condition:
+            self._threads = []
+            self._pid = None
+
+    def wake(self):
+        """Make idle workers look for due jobs now"""
+        with self._condition:
+            self._wakeups += 1
+            self._condition.notify_all()
+
+    def run_pending(self, limit=None):
+        """
+        Claim and run due jobs until none are left.
+
+        Call inside an app context.
+
+        Args:
+            limit (int): Stop after this many jobs
+
+        Returns:
+            int: Number of jobs run
+        """
+        from models.database import db, SideEffectJob
+
+        ran = 0
+        while limit is None or ran < limit:
+            now = datetime.now()
+            due_ids = [job_id for job_id, in db.session.query(SideEffectJob.id).filter(
+                self._claimable(now)
+            ).order_by(SideEffectJob.run_after, SideEffectJob.id).limit(20)]
+            db.session.commit()
+            if not due_ids:
+                return ran
+
+            for job_id in due_ids:
+                if self._claim(job_id):
+                    self._run(job_id)
+                    ran += 1
+                    if limit is not None and ran >= limit:
+                        return ran
+        return ran
+
+    def backoff(self, attempts):
+        """Seconds to wait before retrying after the given number of attempts"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def retry(self, job_id):
+        """
+        Put a failed job back in the queue with a fresh set of attempts.
+
+        Returns:
+            SideEffectJob or None: The job, or None when it doesn't exist
+        """
+        from models.database import db, SideEffectJob
+
+        job = db.session.get(SideEffectJob, job_id)
+        if job is None:
+            return None
+        if job.status == 'failed':
+            job.status = 'pending'
+            job.attempts = 0
+            job.run_after = datetime.now()
+            job.finished_at = None
+            db.session.info[ENQUEUED_KEY] = True
+            db.session.commit()
+        return job
+
+    def stats(self):
+        """Get job counts per status and this process's worker counters"""
+        from models.database import db, SideEffectJob
+
+        counts = dict(
+            db.session.query(SideEffectJob.status, func.count(SideEffectJob.id))
+            .group_by(SideEffectJob.status).all()
+        )
+        return {
+            'jobs': {status: counts.get(status, 0) for status in JOB_STATUSES},
+            'workers': sum(thread.is_alive() for thread in self._threads),
+            'succeeded': self.succeeded,
+            'retried': self.retried,
+            'failed': self.failed
+        }
+
+    def _claimable(self, now):
+        from models.database import SideEffectJob
+
+        return or_(
+            and_(SideEffectJob.status == 'pending', SideEffectJob.run_after <= now),
+            and_(SideEffectJob.status == 'running', SideEffectJob.locked_until < now)
+        )
+
+    def _claim(self, job_id):
+        """Take a due job for this worker; False when someone else got it first"""
+        from models.database import db, SideEffectJob
+
+        now = datetime.now()
+        claimed = db.session.execute(
+            update(SideEffectJob).where(
+                SideEffectJob.id == job_id, self._claimable(now)
+            ).values(
+                status='running',
+                attempts=SideEffectJob.attempts + 1,
+                locked_until=now + timedelta(seconds=self.lease_seconds),
+                updated_at=now
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        return claimed == 1
+
+    def _run(self, job_id):
+        """Run a claimed job and record the outcome"""
+        from models.database import db, SideEffectJob
+
+        job = db.session.get(SideEffectJob, job_id)
+        kind, payload = job.kind, json.loads(job.payload)
+
+        try:
+            handler = JOB_HANDLERS.get(kind)
+            if handler is None:
+                raise SideEffectError(f"No handler registered for {kind}")
+            result = handler(payload)
+            error = None
+        except Exception as e:
+            db.session.rollback()
+            result, error = None, f"{type(e).__name__}: {e}"
+
+        job = db.session.get(SideEffectJob, job_id)
+        now = datetime.now()
+        job.locked_until = None
+        if error is None:
+            job.status = 'succeeded'
+            job.result = json.dumps(result)
+            job.last_error = None
+            job.finished_at = now
+            self.succeeded += 1
+        elif job.attempts >= job.max_attempts or kind not in JOB_HANDLERS:
+            job.status = 'failed'
+            job.last_error = error
+            job.finished_at = now
+            self.failed += 1
+            current_app.logger.error(f"Side-effect job {job_id} ({kind}) failed for good: {error}")
+        else:
+            job.status = 'pending'
+            job.last_error = error
+            job.run_after = now + timedelta(seconds=self.backoff(job.attempts))
+            self.retried += 1
+            current_app.logger.warning(
+                f"Side-effect job {job_id} ({kind}) attempt {job.attempts} failed, "
+                f"retrying at {job.run_after:%H:%M:%S}: {error}"
+            )
+        db.session.commit()
+
+    def _work(self):
+        from models.database import db
+
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                wakeups = self._wakeups
+
+            try:
+                with self.app.app_context():
+                    try:
+                        self.run_pending()
+                    finally:
+                        db.session.remove()
+            except Exception as e:
+                with self.app.app_context():
+                    current_app.logger.error(f"Side-effect worker error: {str(e)}")
+
+            with self._condition:
+                if not self._stopping and self._wakeups == wakeups:
+                    self._condition.wait(self.poll_interval)
+
+    def _before_request(self):
+        if self._pid != os.getpid():
+            self.start()
+
+    def _after_commit(self, session):
+        if session.info.pop(ENQUEUED_KEY, False):
+            self.start()
+            self.wake()
+
+    def _after_rollback(self, session):
+        session.info.pop(ENQUEUED_KEY, None)
+
+
+# Process-wide worker pool
+side_effect_queue = SideEffectQueue()
+
+
+@job_handler('assignment_email')
+def send_assignment_email_job(payload):
+    """Email an employee about a new assignment"""
+    from utils.email_service import EmailService
+
+    sent = EmailService().send_task_assignment_notification(
+        payload['employee_email'],
+        payload['task_title'],
+        payload['task_description'],
+        payload.get('jira_url')
+    )
+    if not sent:
+        raise SideEffectError(f"Assignment email to {payload['employee_email']} was not sent")
+    return {'sent': True}
+
+
+@job_handler('jira_ticket')
+def create_jira_ticket_job(payload):
+    """Create the Jira ticket for a task, then confirm it in Slack"""
+    from models.database import db
+    from utils.jira_service import JiraService
+
+    jira_key = JiraService().create_issue(
+        summary=payload['title'],
+        description=payload['description'],
+        issue_type=payload['issue_type'],
+        priority=payload['priority']
+    )
+    if not jira_key:
+        raise SideEffectError(f"Jira ticket for task {payload['task_id']} was not created")
+
+    # A separate job, so a Slack outage doesn't create the ticket again
+    if payload.get('slack_channel'):
+        enqueue('slack_message', {
+            'channel': payload['slack_channel'],
+            'user': payload.get('slack_user'),
+            'text': f"🔗 Jira: {jira_key} created for *{payload['title']}*"
+        }, idempotency_key=f"slack_message:jira_ticket:{payload['task_id']}")
+        db.session.commit()
+
+    return {'jira_key': jira_key}
+
+
+@job_handler('slack_message')
+def send_slack_message_job(payload):
+    """Post a Slack message, ephemeral when it names a user"""
+    from slack_sdk import WebClient
+
+    client = WebClient(token=current_app.config['SLACK_BOT_TOKEN'])
+    if payload.get('user'):
+        client.chat_postEphemeral(channel=payload['channel'], user=payload['user'], text=payload['text'])
+    else:
+        client.chat_postMessage(channel=payload['channel'], text=payload['text'])
+    return {'posted': True}
+
+
+def main():
+    """
+    Run side-effect workers outside the web processes.
+
+    Usage:
+        python -m utils.side_effects --workers 4
+        python -m utils.side_effects --once
+    """
+    from flask import Flask
+    from config.config import config
+    from models.database import db
+
+    parser = argparse.ArgumentParser(description="Run side-effect job workers")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--once', action='store_true', help='Run the due jobs, then exit')
+    parser.add_argument('--config', default='default', help='Configuration name')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(config[args.config])
+    app.config['SIDE_EFFECT_WORKERS'] = 0 if args.once else args.workers
+    db.init_app(app)
+    side_effect_queue.init_app(app)
+
+    if args.once:
+        with app.app_context():
+            print(f"Ran {side_effect_queue.run_pending()} jobs")
+        return
+
+    side_effect_queue.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        side_effect_queue.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import threading
+import time
+from flask import current_app
+from utils.keyword_automaton import KeywordAutomaton
+from utils.roster_events import roster_version
+from utils.skills import SKILL_ALIASES, canonical_skill, normalize_skill, parse_skills
+
+# Skills and aliases that are also everyday words or abbreviations; they are
+# only found through an unambiguous spelling ('golang' for go)
+AMBIGUOUS_SKILLS = frozenset({
+    'go', 'r', 'c', 'd', 'rest', 'less', 'make', 'ant', 'express', 'node', 'rn', 'dl'
+})
+
+# Roster entries longer than this are free text rather than a skill name
+MAX_SKILL_WORDS = 4
+MAX_SKILL_LENGTH = 40
+
+
+def is_extractable(phrase):
+    """Whether a normalized skill phrase is specific enough to look for in task text"""
+    return (
+        2 <= len(phrase) <= MAX_SKILL_LENGTH
+        and phrase not in AMBIGUOUS_SKILLS
+        and len(phrase.split()) <= MAX_SKILL_WORDS
+        and any(char.isalnum() for char in phrase)
+    )
+
+
+class SkillExtractor:
+    """
+    Finds the skills a task needs in its title and description.
+
+    The vocabulary is every skill listed in the roster and SKILL_ALIASES,
+    compiled into one KeywordAutomaton. Domain keywords are left out: words
+    like "design" or "api" in a task say which domain it belongs to (see
+    DomainClassifier), not which skill it needs. A task's
+    text is scanned once for whole-word matches, so "ui" doesn't fire on
+    "build", and each match is reported under its canonical skill ("k8s"
+    and "kubernetes" both give kubernetes). Nothing leaves the process.
+
+    The compiled vocabulary is tagged with the roster version it was loaded
+    at. Since every assignment bumps the version, a newer version only
+    triggers a re-read of the roster's distinct skills once `refresh_interval`
+    seconds have passed, and the automaton is only recompiled when the
+    vocabulary actually changed. One thread refreshes while the others keep
+    scanning with the previous vocabulary.
+    """
+
+    def __init__(self, refresh_interval=5.0):
+        self._lock = threading.Lock()
+        self._automaton = None
+        self._vocabulary = None  # frozenset of (phrase, canonical skill)
+        self._version = None
+        self._last_checked = 0.0
+        self.enabled = True
+        self.refresh_interval = refresh_interval
+        self.refreshes = 0
+        self.rebuilds = 0
+
+    def init_app(self, app):
+        """Apply the app's extraction settings"""
+        self.enabled = app.config.get('SKILL_EXTRACTION_ENABLED', self.enabled)
+        self.refresh_interval = app.config.get('SKILL_EXTRACTION_REFRESH_SECONDS', self.refresh_interval)
+
+    def extract(self, title, description=''):
+        """
+        Get the canonical skills mentioned in a task's title or description.
+
+        Returns:
+            list: Sorted canonical skill names; empty when extraction is off
+        """
+        if not self.enabled:
+            return []
+
+        automaton = self._current_automaton()
+        found = automaton.scan_words(f"{title or ''}\n{description or ''}")
+        return sorted({skill for skills in found.values() for skill in skills})
+
+    def stats(self):
+        """Get the vocabulary size and refresh counters"""
+        vocabulary = self._vocabulary
+        return {
+            'enabled': self.enabled,
+            'keywords': len(vocabulary) if vocabulary else 0,
+            'skills': len({skill for _, skill in vocabulary}) if vocabulary else 0,
+            'roster_version': self._version,
+            'refreshes': self.refreshes,
+            'rebuilds': self.rebuilds
+        }
+
+    def _current_automaton(self):
+        """Get the compiled vocabulary, re-reading the roster when it may have changed"""
+        if self._is_fresh():
+            return self._automaton
+
+        # While one thread re-reads the roster, the others keep the current vocabulary
+        if not self._lock.acquire(blocking=self._automaton is None):
+            return self._automaton
+
+        try:
+            if self._is_fresh():
+                return self._automaton
+
+            # Read before loading, so a write during the load is seen next time
+            version = roster_version.value
+            self._last_checked = time.monotonic()
+            try:
+                vocabulary = self._load_vocabulary()
+                self._version = version
+                self.refreshes += 1
+                if vocabulary != self._vocabulary:
+                    automaton = KeywordAutomaton()
+                    for phrase, skill in vocabulary:
+                        automaton.add(phrase, skill)
+                    automaton.build()
+                    self._automaton = automaton
+                    self._vocabulary = vocabulary
+                    self.rebuilds += 1
+            except Exception as e:
+                current_app.logger.error(f"Error loading the skill vocabulary: {str(e)}")
+                if self._automaton is None:
+                    self._automaton = KeywordAutomaton()
+                    self._vocabulary = frozenset()
+
+            return self._automaton
+        finally:
+            self._lock.release()
+
+    def _is_fresh(self):
+        if self._automaton is None:
+            return False
+        if roster_version.is_listening and roster_version.value == self._version:
+            return True
+        return time.monotonic() - self._last_checked < self.refresh_interval
+
+    def _load_vocabulary(self):
+        """
+        Collect the skill phrases to look for.
+
+        Returns:
+            frozenset: (phrase, canonical skill) pairs
+        """
+        from models.database import db, Employee
+
+        phrases = set()
+        rows = db.session.query(Employee.skills).filter(Employee.skills.isnot(None)).distinct()
+        for (skills_string,) in rows:
+            phrases.update(normalize_skill(skill) for skill in parse_skills(skills_string))
+        phrases.update(SKILL_ALIASES)
+        phrases.update(SKILL_ALIASES.values())
+
+        return frozenset(
+            (phrase, canonical_skill(phrase)) for phrase in phrases if is_extractable(phrase)
+        )
+
+
+# Process-wide extractor used by the task assignment agent
+skill_extractor = SkillExtractor()
@@ -0,0 +1,258 @@
+import threading
+import time
+import numpy as np
+from flask import current_app
+from sqlalchemy import event
+from utils.skills import parse_skills, skill_terms
+
+# Session.info key for employee ids whose skills may have changed in the current transaction
+PENDING_KEY = 'skill_index_pending'
+
+
+class SkillIndex:
+    """
+    Inverted index from normalized skill token to employee ids.
+    
+    Keyword lookups keep the matcher's substring semantics: a keyword matches
+    every indexed skill token that contains it, so pruning with the index
+    never drops an employee the domain or skills scorers would have matched.
+    
+    Employee writes are recorded at flush and the touched employees are
+    re-read on the first lookup after the transaction commits. Writes the
+    session can't see (bulk SQL, other processes) are picked up by a full
+    rebuild every `rebuild_interval` seconds.
+    """
+    
+    def __init__(self, rebuild_interval=300):
+        self._postings = {}         # skill token -> set of employee ids
+        self._employee_tokens = {}  # employee id -> frozenset of skill tokens
+        self._keyword_tokens = {}   # keyword -> tuple of tokens containing it
+        self._stale = set()         # committed employee ids awaiting a refresh
+        self._lock = threading.RLock()
+        self.rebuild_interval = rebuild_interval
+        self.is_built = False
+        self.is_listening = False
+        self.last_rebuilt = 0.0
+        self.rebuilds = 0
+        self.refreshes = 0
+    
+    def init_app(self, app):
+        """Start tracking employee writes made through the app's session"""
+        from models.database import db
+        
+        self.rebuild_interval = app.config.get('SKILL_INDEX_REBUILD_SECONDS', self.rebuild_interval)
+        
+        if self.is_listening:
+            return
+        
+        event.listen(db.session, 'after_flush', self._after_flush)
+        event.listen(db.session, 'after_commit', self._after_commit)
+        event.listen(db.session, 'after_rollback', self._after_rollback)
+        self.is_listening = True
+    
+    def build(self, employees):
+        """
+        Build the index from scratch.
+        
+        Args:
+            employees (iterable): (employee_id, skills_string) pairs
+        """
+        with self._lock:
+            self._postings = {}
+            self._employee_tokens = {}
+            self._keyword_tokens = {}
+            self._stale = set()
+            for employee_id, skills_string in employees:
+                self._add(employee_id, skills_string)
+            self.is_built = True
+            self.last_rebuilt = time.monotonic()
+            self.rebuilds += 1
+    
+    def build_from_db(self):
+        """Build the index from every employee row in the database"""
+        from models.database import db, Employee
+        
+        try:
+            rows = db.session.query(Employee.id, Employee.skills).all()
+            self.build(rows)
+            current_app.logger.info(f"Skill index built for {len(rows)} employees")
+        except Exception as e:
+            current_app.logger.error(f"Error building skill index: {str(e)}")
+    
+    def ensure_built(self):
+        """Build the index on first use and when due, otherwise refresh employees written since the last lookup"""
+        if not self.is_built or time.monotonic() - self.last_rebuilt >= self.rebuild_interval:
+            with self._lock:
+                if not self.is_built or time.monotonic() - self.last_rebuilt >= self.rebuild_interval:
+                    self.build_from_db()
+            return
+        
+        if self._stale:
+            with self._lock:
+                stale, self._stale = self._stale, set()
+            if stale:
+                self.refresh_from_db(stale)
+    
+    def refresh_from_db(self, employee_ids):
+        """Re-read the skills of the given employees, dropping those that no longer exist"""
+        from models.database import db, Employee
+        
+        try:
+            rows = dict(
+                db.session.query(Employee.id, Employee.skills).filter(Employee.id.in_(employee_ids)).all()
+            )
+            with self._lock:
+                for employee_id in employee_ids:
+                    self._remove(employee_id)
+                    if employee_id in rows:
+                        self._add(employee_id, rows[employee_id])
+                self.refreshes += 1
+        except Exception as e:
+            current_app.logger.error(f"Error refreshing skill index: {str(e)}")
+    
+    def update_employee(self, employee_id, skills_string):
+        """Re-index a single employee after their skills were created or changed"""
+        with self._lock:
+            # An unbuilt index picks the change up when it is built from the database
+            if not self.is_built:
+                return
+            self._remove(employee_id)
+            self._add(employee_id, skills_string)
+    
+    def remove_employee(self, employee_id):
+        """Drop an employee from the index"""
+        with self._lock:
+            if self.is_built:
+                self._remove(employee_id)
+    
+    def lookup(self, keywords):
+        """
+        Get ids of employees with at least one skill containing any keyword.
+        
+        Args:
+            keywords (iterable): Domain keywords and/or required skills
+            
+        Returns:
+            set: Union of the postings for every matching skill token
+        """
+        with self._lock:
+            employee_ids = set()
+            for keyword in keywords:
+                for term in skill_terms(keyword):
+                    for token in self._tokens_containing(term):
+                        employee_ids.update(self._postings[token])
+            return employee_ids
+    
+    def to_arrays(self):
+        """
+        Export the postings for an index snapshot.
+        
+        Returns:
+            dict: Sorted tokens with CSR offsets into the concatenated,
+                sorted employee id postings
+        """
+        with self._lock:
+            tokens = sorted(self._postings)
+            offsets = np.zeros(len(tokens) + 1, dtype=np.int64)
+            employee_ids = []
+            for position, token in enumerate(tokens):
+                employee_ids.extend(sorted(self._postings[token]))
+                offsets[position + 1] = len(employee_ids)
+            
+            return {
+                'skill_tokens': np.array(tokens, dtype=str),
+                'skill_offsets': offsets,
+                'skill_employee_ids': np.array(employee_ids, dtype=np.int64)
+            }
+    
+    def load_arrays(self, tokens, offsets, employee_ids):
+        """Replace the index with postings exported by to_arrays"""
+        bounds = offsets.tolist()
+        ids = employee_ids.tolist()
+        
+        postings = {}
+        employee_tokens = {}
+        for position, token in enumerate(tokens.tolist()):
+            members = set(ids[bounds[position]:bounds[position + 1]])
+            postings[token] = members
+            for employee_id in members:
+                employee_tokens.setdefault(employee_id, []).append(token)
+        
+        with self._lock:
+            self._postings = postings
+            self._employee_tokens = {
+                employee_id: frozenset(employee_token_list)
+                for employee_id, employee_token_list in employee_tokens.items()
+            }
+            self._keyword_tokens = {}
+            self._stale = set()
+            self.is_built = True
+            self.last_rebuilt = time.monotonic()
+    
+    def stats(self):
+        """Get index size and rebuild counters"""
+        with self._lock:
+            return {
+                'employees': len(self._employee_tokens),
+                'tokens': len(self._postings),
+                'built': self.is_built,
+                'listening': self.is_listening,
+                'rebuilds': self.rebuilds,
+                'refreshes': self.refreshes
+            }
+    
+    def _tokens_containing(self, keyword):
+        """Get indexed tokens containing a keyword (cached until the vocabulary changes)"""
+        tokens = self._keyword_tokens.get(keyword)
+        if tokens is None:
+            tokens = tuple(token for token in self._postings if keyword in token)
+            self._keyword_tokens[keyword] = tokens
+        return tokens
+    
+    def _add(self, employee_id, skills_string):
+        tokens = frozenset(term for skill in parse_skills(skills_string) for term in skill_terms(skill))
+        tokens = frozenset(token for token in tokens if token)
+        if not tokens:
+            return
+        
+        self._employee_tokens[employee_id] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = postings = set()
+                self._keyword_tokens = {}  # New vocabulary entry
+            postings.add(employee_id)
+    
+    def _remove(self, employee_id):
+        tokens = self._employee_tokens.pop(employee_id, ())
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(employee_id)
+            if not postings:
+                del self._postings[token]
+                self._keyword_tokens = {}  # Vocabulary entry removed
+    
+    def _after_flush(self, session, flush_context):
+        from models.database import Employee
+        
+        employee_ids = {
+            obj.id for objects in (session.new, session.dirty, session.deleted)
+            for obj in objects if isinstance(obj, Employee)
+        }
+        if employee_ids:
+            session.info.setdefault(PENDING_KEY, set()).update(employee_ids)
+    
+    def _after_commit(self, session):
+        pending = session.info.pop(PENDING_KEY, None)
+        if pending:
+            with self._lock:
+                self._stale.update(pending)
+    
+    def _after_rollback(self, session):
+        session.info.pop(PENDING_KEY, None)
+
+
+# Process-wide index shared by all matchers
+skill_index = SkillIndex()
@@ -0,0 +1,200 @@
+import threading
+import numpy as np
+from scipy import sparse
+from utils.skills import canonical_skill
+from utils.vectorized_scorer import VectorizedScorer
+
+# Character n-gram sizes used for skill vectors
+NGRAM_SIZES = (2, 3, 4)
+
+# Cosine similarity at which two skills count as the same
+DEFAULT_SIMILARITY_THRESHOLD = 0.5
+
+
+def char_ngrams(text, sizes=NGRAM_SIZES):
+    """Character n-grams of a skill, padded so word edges form their own grams"""
+    padded = f' {text} '
+    return [padded[i:i + size] for size in sizes for i in range(len(padded) - size + 1)]
+
+
+class _Vocabulary:
+    """One immutable build of the skill vocabulary and its TF-IDF vectors"""
+
+    def __init__(self, skills):
+        self.skills = list(skills)
+        self.columns = {skill: column for column, skill in enumerate(self.skills)}
+        self.features = {}
+
+        rows, cols, counts = [], [], []
+        for row, skill in enumerate(self.skills):
+            grams = {}
+            for gram in char_ngrams(skill):
+                grams[gram] = grams.get(gram, 0) + 1
+            for gram, count in grams.items():
+                rows.append(row)
+                cols.append(self.features.setdefault(gram, len(self.features)))
+                counts.append(count)
+
+        # Smoothed inverse document frequency over the vocabulary
+        document_frequency = np.bincount(cols, minlength=len(self.features)) if cols else np.zeros(0)
+        self.idf = np.log((1 + len(self.skills)) / (1 + document_frequency)) + 1
+
+        self.vectors = self._normalize(sparse.csr_matrix(
+            (np.asarray(counts, dtype=float) * self.idf[cols] if cols else [], (rows, cols)),
+            shape=(len(self.skills), len(self.features))
+        ))
+
+        self.masks = {}         # (canonical query skill, threshold) -> bool mask over the vocabulary
+        self.domain_masks = {}  # (domain, keywords, threshold) -> bool mask over the vocabulary
+
+    def vectorize(self, text):
+        """TF-IDF vector of a query; n-grams unseen in the vocabulary are dropped"""
+        grams = {}
+        for gram in char_ngrams(text):
+            column = self.features.get(gram)
+            if column is not None:
+                grams[column] = grams.get(column, 0) + 1
+
+        cols = list(grams)
+        data = np.array([grams[column] for column in cols], dtype=float) * self.idf[cols]
+        return self._normalize(sparse.csr_matrix(
+            (data, ([0] * len(cols), cols)), shape=(1, len(self.features))
+        ))
+
+    @staticmethod
+    def _normalize(matrix):
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ matrix
+
+
+class SkillSimilarityIndex:
+    """
+    Offline skill similarity over character n-gram TF-IDF vectors.
+
+    Every distinct canonical employee skill is vectorized once. A query
+    skill matches the vocabulary entries that contain it (the substring rule
+    of the default scorer) or whose cosine similarity to it reaches the
+    threshold, so "reactjs" finds "react" and typos like "kubernets" still
+    match; abbreviations with no shared n-grams ("k8s") are resolved by
+    SKILL_ALIASES first. Similarities are computed as one sparse product per
+    query skill and cached until the vocabulary grows.
+    """
+
+    def __init__(self, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._vocabulary = _Vocabulary([])
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def vocabulary(self, skills):
+        """
+        Get a vocabulary build containing every given canonical skill.
+
+        New skills trigger a rebuild over the union, which also resets the
+        cached similarity masks.
+        """
+        vocabulary = self._vocabulary
+        if all(skill in vocabulary.columns for skill in skills):
+            return vocabulary
+
+        with self._lock:
+            vocabulary = self._vocabulary
+            missing = [skill for skill in dict.fromkeys(skills) if skill not in vocabulary.columns]
+            if missing:
+                vocabulary = _Vocabulary(vocabulary.skills + missing)
+                self._vocabulary = vocabulary
+                self.rebuilds += 1
+            return vocabulary
+
+    def similar_mask(self, vocabulary, skill, threshold=None):
+        """Bool mask of the vocabulary entries matching a canonical skill"""
+        threshold = self.threshold if threshold is None else threshold
+        mask = vocabulary.masks.get((skill, threshold))
+        if mask is None:
+            similarity = (vocabulary.vectorize(skill) @ vocabulary.vectors.T).toarray().ravel()
+            mask = similarity >= threshold
+            mask |= np.fromiter(
+                (skill in entry for entry in vocabulary.skills), dtype=bool, count=len(vocabulary.skills)
+            )
+            vocabulary.masks[(skill, threshold)] = mask
+        return mask
+
+    def domain_mask(self, vocabulary, domain, keywords, threshold=None):
+        """Bool mask of the vocabulary entries matching any of a domain's keywords"""
+        threshold = self.threshold if threshold is None else threshold
+        key = (domain, tuple(keywords), threshold)
+        mask = vocabulary.domain_masks.get(key)
+        if mask is None:
+            mask = np.zeros(len(vocabulary.skills), dtype=bool)
+            for keyword in keywords:
+                mask |= self.similar_mask(vocabulary, canonical_skill(keyword), threshold)
+            vocabulary.domain_masks[key] = mask
+        return mask
+
+    def stats(self):
+        vocabulary = self._vocabulary
+        return {
+            'skills': len(vocabulary.skills),
+            'features': len(vocabulary.features),
+            'cached_queries': len(vocabulary.masks),
+            'rebuilds': self.rebuilds,
+            'threshold': self.threshold
+        }
+
+
+# Shared index used by the 'tfidf' scoring engine
+skill_similarity_index = SkillSimilarityIndex()
+
+
+class SemanticScorer(VectorizedScorer):
+    """
+    Vectorized scorer with TF-IDF skill similarity.
+
+    Identical to VectorizedScorer except for the two skill terms: domain
+    expertise counts the skills similar to a domain keyword, and a required
+    skill is matched by any similar employee skill. Workload, priority,
+    experience and department terms and all weights are unchanged.
+    """
+
+    def __init__(self, matcher, index=None, threshold=None):
+        super().__init__(matcher)
+        self.index = index or skill_similarity_index
+        self.threshold = threshold
+
+    def _encode_domain_scores(self, skill_rows):
+        # Employee x vocabulary skill counts over canonical skill names
+        canonical_rows = [[canonical_skill(skill) for skill in skills] for skills in skill_rows]
+        self.skill_vocabulary = self.index.vocabulary(
+            [skill for skills in canonical_rows for skill in skills]
+        )
+
+        rows, cols = [], []
+        for row, skills in enumerate(canonical_rows):
+            for skill in skills:
+                rows.append(row)
+                cols.append(self.skill_vocabulary.columns[skill])
+        self.profile_matrix = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(canonical_rows), len(self.skill_vocabulary.skills))
+        )
+
+        for domain, column in self.domain_index.items():
+            keywords = self.matcher.domain_expertise_map[domain]
+            if not keywords:
+                continue
+            mask = self.index.domain_mask(self.skill_vocabulary, domain, keywords, self.threshold)
+            matches = self.profile_matrix @ mask.astype(float)
+            self.domain_scores[:, column] = np.minimum(1.0, matches / len(keywords))
+
+    def _skills_match_score(self, required_skills):
+        """Fraction of required skills similar to one of each employee's skills"""
+        matches = np.zeros(len(self.employees))
+        for required_skill in required_skills:
+            mask = self.index.similar_mask(
+                self.skill_vocabulary, canonical_skill(required_skill), self.threshold
+            )
+            if mask.any():
+                matches += (self.profile_matrix @ mask.astype(float)) > 0
+
+        return np.where(self.has_skills, np.minimum(1.0, matches / len(required_skills)), 0.0)
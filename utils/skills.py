@@ -0,0 +1,186 @@
+import json
+import threading
+from collections import OrderedDict, namedtuple
+from flask import current_app
+
+
+# Pre-normalized skills of one employee: ordered tuple, plus the skills and
+# their canonical names (see skill_terms) as a tuple to scan and a set for
+# membership tests
+ParsedSkills = namedtuple('ParsedSkills', ['skills', 'token_set', 'terms'])
+
+EMPTY_SKILLS = ParsedSkills((), frozenset(), ())
+
+
+def parse_skills(skills_string):
+    """
+    Parse an employee skills string into a list of skills.
+    
+    Args:
+        skills_string (str): JSON list/object or comma-separated skills
+        
+    Returns:
+        list: List of skills in their original spelling
+    """
+    try:
+        if not skills_string:
+            return []
+        
+        # Handle JSON format
+        if skills_string.startswith('[') or skills_string.startswith('{'):
+            try:
+                skills_data = json.loads(skills_string)
+                if isinstance(skills_data, list):
+                    return skills_data
+                elif isinstance(skills_data, dict):
+                    return list(skills_data.keys())
+            except json.JSONDecodeError:
+                pass
+        
+        # Handle comma-separated format
+        skills = [skill.strip() for skill in skills_string.split(',')]
+        return [skill for skill in skills if skill]
+        
+    except Exception as e:
+        current_app.logger.error(f"Error parsing skills: {str(e)}")
+        return []
+
+
+def normalize_skill(skill):
+    """Normalize a single skill into the lowercase token used for matching"""
+    return str(skill).strip().lower()
+
+
+# Common abbreviations and spellings mapped to one canonical skill name
+SKILL_ALIASES = {
+    'k8s': 'kubernetes',
+    'kube': 'kubernetes',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'react js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'angularjs': 'angular',
+    'angular.js': 'angular',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'js': 'javascript',
+    'ecmascript': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'python3': 'python',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'mssql': 'sql server',
+    'ml': 'machine learning',
+    'dl': 'deep learning',
+    'ai/ml': 'machine learning',
+    'amazon web services': 'aws',
+    'gcp': 'google cloud',
+    'ci-cd': 'ci/cd',
+    'cicd': 'ci/cd',
+    'continuous integration': 'ci/cd',
+    'rn': 'react native',
+    'ux design': 'ux',
+    'ui design': 'ui',
+    'pentest': 'penetration testing',
+    'pen testing': 'penetration testing',
+    'qa automation': 'automation',
+    'test automation': 'automation',
+}
+
+
+def canonical_skill(skill):
+    """Normalize a skill and resolve it through SKILL_ALIASES"""
+    skill = normalize_skill(skill)
+    return SKILL_ALIASES.get(skill, skill)
+
+
+def skill_terms(skill):
+    """
+    Get the spellings a skill is matched under.
+    
+    Returns:
+        tuple: The normalized skill, followed by its canonical name when it
+            is an alias, so "k8s" and "kubernetes" match each other
+    """
+    skill = normalize_skill(skill)
+    canonical = SKILL_ALIASES.get(skill, skill)
+    return (skill,) if canonical == skill else (skill, canonical)
+
+
+class ParsedSkillCache:
+    """
+    Bounded LRU cache of parsed, normalized employee skills.
+    
+    Entries are keyed by employee id and stamped with the employee's
+    updated_at, so a changed row is a miss and is re-parsed automatically.
+    """
+    
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # employee id -> (updated_at, ParsedSkills)
+        self._lock = threading.Lock()
+    
+    def get(self, employee):
+        """
+        Get the parsed skills of an employee.
+        
+        Args:
+            employee: Object with id, updated_at and skills attributes
+            
+        Returns:
+            ParsedSkills: Normalized skills tuple and token set
+        """
+        version = employee.updated_at
+        
+        with self._lock:
+            entry = self._entries.get(employee.id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(employee.id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        parsed = self._parse(employee.skills)
+        
+        with self._lock:
+            self._entries[employee.id] = (version, parsed)
+            self._entries.move_to_end(employee.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        
+        return parsed
+    
+    def invalidate(self, employee_id=None):
+        """Drop one employee's entry, or every entry when no id is given"""
+        with self._lock:
+            if employee_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(employee_id, None)
+    
+    def stats(self):
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+    
+    def _parse(self, skills_string):
+        if not skills_string:
+            return EMPTY_SKILLS
+        
+        skills = tuple(normalize_skill(skill) for skill in parse_skills(skills_string))
+        terms = tuple(dict.fromkeys(term for skill in skills for term in skill_terms(skill)))
+        return ParsedSkills(skills, frozenset(terms), terms)
+
+
+# Process-wide cache shared by all matchers
+skill_cache = ParsedSkillCache()
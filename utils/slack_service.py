@@ -4,7 +4,8 @@ from flask import current_app, request
 import re
 import json
 from utils.task_intent_detector import TaskIntentDetector
-from utils.jira_service import JiraService
+from utils.side_effects import enqueue
+from utils.keyword_automaton import priority_automaton
 from models.database import db, Task, Employee
 from datetime import datetime
 
@@ -19,7 +20,6 @@ class SlackService:
         )
         self.handler = SlackRequestHandler(self.app)
         self.intent_detector = TaskIntentDetector()
-        self.jira_service = JiraService()
         
         # Register event handlers
         self._register_handlers()
@@ -213,15 +213,15 @@ class SlackService:
                 created_by=user_id
             )
             db.session.add(task)
-            db.session.commit()
             
-            # Create Jira ticket
-            jira_key = self._create_jira_ticket(title, text, ticket_type)
+            # The Jira ticket is created after the commit, and its key is
+            # posted back by the job
+            self._queue_jira_ticket(task, ticket_type, channel_id, user_id if command else None)
+            db.session.commit()
             
             # Send confirmation
             message = f"✅ Created {ticket_type}: *{title}*"
-            if jira_key:
-                message += f"\n🔗 Jira: {jira_key}"
+            message += "\n🔗 Jira ticket on its way"
             message += f"\n📝 Description: {text[:100]}{'...' if len(text) > 100 else ''}"
             
             if command:
@@ -254,15 +254,13 @@ class SlackService:
                 created_by=user_id
             )
             db.session.add(task)
-            db.session.commit()
             
-            # Create Jira ticket
-            jira_key = self._create_jira_ticket(title, description, task_type)
+            self._queue_jira_ticket(task, task_type, channel_id)
+            db.session.commit()
             
             # Send confirmation
             message = f"🤖 AI detected {task_type}: *{title}*"
-            if jira_key:
-                message += f"\n🔗 Jira: {jira_key}"
+            message += "\n🔗 Jira ticket on its way"
             message += f"\n📝 Description: {description[:100]}{'...' if len(description) > 100 else ''}"
             
             say(message)
@@ -286,40 +284,37 @@ class SlackService:
     
     def _extract_priority(self, text):
         """Extract priority from text"""
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['urgent', 'asap', 'emergency', 'critical', 'blocker']):
-            return 'high'
-        elif any(word in text_lower for word in ['low priority', 'when possible', 'no rush', 'nice to have']):
-            return 'low'
-        else:
-            return 'medium'
+        # High-priority keywords win over low-priority ones
+        return priority_automaton.first_category(text, 'medium')
     
-    def _create_jira_ticket(self, title, description, issue_type):
-        """Create Jira ticket and return the key"""
-        try:
-            # Map task types to Jira issue types
-            jira_issue_type = {
-                'bug': 'Bug',
-                'story': 'Story',
-                'task': 'Task',
-                'incident': 'Incident',
-                'feature': 'New Feature'
-            }.get(issue_type, 'Task')
-            
-            # Create Jira issue
-            jira_key = self.jira_service.create_issue(
-                summary=title,
-                description=description,
-                issue_type=jira_issue_type,
-                priority=self._map_priority_to_jira(self._extract_priority(description))
-            )
-            
-            return jira_key
-            
-        except Exception as e:
-            current_app.logger.error(f"Failed to create Jira ticket: {str(e)}")
-            return None
+    def _queue_jira_ticket(self, task, issue_type, channel_id, user_id=None):
+        """
+        Queue the Jira ticket for a task in the current transaction.
+        
+        The job posts the ticket key to the channel, or only to `user_id`
+        when given.
+        """
+        # Map task types to Jira issue types
+        jira_issue_type = {
+            'bug': 'Bug',
+            'story': 'Story',
+            'task': 'Task',
+            'incident': 'Incident',
+            'feature': 'New Feature'
+        }.get(issue_type, 'Task')
+        
+        if task.id is None:
+            db.session.flush()
+        
+        return enqueue('jira_ticket', {
+            'task_id': task.id,
+            'title': task.title,
+            'description': task.description,
+            'issue_type': jira_issue_type,
+            'priority': self._map_priority_to_jira(self._extract_priority(task.description)),
+            'slack_channel': channel_id,
+            'slack_user': user_id
+        }, idempotency_key=f'jira_ticket:task:{task.id}')
     
     def _map_priority_to_jira(self, priority):
         """Map internal priority to Jira priority"""
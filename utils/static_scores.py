@@ -0,0 +1,180 @@
+import numpy as np
+
+
+class _StaticRow:
+    """Static score components of one employee version"""
+
+    __slots__ = ('version', 'domains', 'history_version', 'experience')
+
+    def __init__(self, version):
+        self.version = version
+        self.domains = {}           # domain -> (domain expertise score, department alignment score)
+        self.history_version = None
+        self.experience = {}        # task type -> experience score
+
+
+class _SnapshotMatrix:
+    """Domain and department scores loaded from an index snapshot"""
+
+    __slots__ = ('slots', 'versions', 'columns', 'domain_scores', 'department_scores')
+
+    def __init__(self, employee_ids, versions, domains, domain_scores, department_scores):
+        self.slots = {employee_id: slot for slot, employee_id in enumerate(employee_ids.tolist())}
+        self.versions = versions
+        self.columns = {domain: column for column, domain in enumerate(domains)}
+        self.domain_scores = domain_scores
+        self.department_scores = department_scores
+
+
+class StaticScoreTable:
+    """
+    Per-(employee, domain, task_type) table of the slow-changing score terms.
+
+    Domain expertise and department alignment depend only on an employee's
+    skills and department, so they are stored per domain and refreshed when
+    the employee's updated_at changes. Task-type experience depends on the
+    employee's assignment history and is stored per task type under the
+    workload ledger's history version; without a version (no ledger) it is
+    computed on every call. Rows fill in lazily per employee and domain, so
+    an edit only recomputes the employee it touched. A matrix loaded from an
+    index snapshot answers domain misses for employees unchanged since.
+
+    Components are returned separately rather than pre-summed, so callers
+    keep the original accumulation order and produce identical scores.
+    Plain dict updates are atomic, and a race only costs a recomputation,
+    so the table takes no lock.
+    """
+
+    def __init__(self):
+        self._rows = {}  # employee id -> _StaticRow
+        self._snapshot = None
+        self.hits = 0
+        self.misses = 0
+        self.snapshot_hits = 0
+
+    def components(self, matcher, employee, required_domain, task_type):
+        """
+        Get the static score components for an employee and task.
+
+        Args:
+            matcher (EmployeeMatcher): Matcher whose scorers fill missing entries
+            employee: Candidate with id, updated_at, skills, department and task_history
+            required_domain (str): Required domain
+            task_type (str): Task type
+
+        Returns:
+            tuple: (domain expertise score, department alignment score, experience score)
+        """
+        row = self._rows.get(employee.id)
+        if row is None or row.version != employee.updated_at:
+            row = _StaticRow(employee.updated_at)
+            self._rows[employee.id] = row
+
+        # Only known domains are stored, so free-form domains can't grow rows
+        domain = required_domain.lower()
+        if domain in matcher.domain_expertise_map:
+            scores = row.domains.get(domain)
+            if scores is None:
+                scores = self._snapshot_scores(employee, domain)
+                if scores is None:
+                    self.misses += 1
+                    scores = (
+                        matcher._calculate_domain_expertise_score(employee, required_domain),
+                        matcher._calculate_department_alignment_score(employee, required_domain)
+                    )
+                else:
+                    self.snapshot_hits += 1
+                row.domains[domain] = scores
+            else:
+                self.hits += 1
+            domain_score, department_score = scores
+        else:
+            domain_score = matcher._calculate_domain_expertise_score(employee, required_domain)
+            department_score = matcher._calculate_department_alignment_score(employee, required_domain)
+
+        history_version = getattr(employee, 'history_version', None)
+        task_type_key = task_type.lower()
+        if history_version is None or task_type_key not in matcher.task_type_weights:
+            experience_score = matcher._calculate_task_type_experience_score(employee, task_type)
+        else:
+            if row.history_version != history_version:
+                row.history_version = history_version
+                row.experience = {}
+            experience_score = row.experience.get(task_type_key)
+            if experience_score is None:
+                experience_score = matcher._calculate_task_type_experience_score(employee, task_type)
+                row.experience[task_type_key] = experience_score
+
+        return domain_score, department_score, experience_score
+
+    def to_arrays(self, matcher, employees):
+        """
+        Compute the domain and department scores of every employee for a snapshot.
+
+        Args:
+            matcher (EmployeeMatcher): Matcher with the default domain maps
+            employees (list): Snapshots with id, updated_at, skills and department
+
+        Returns:
+            tuple: (dict of arrays, list of domains in column order)
+        """
+        domains = list(matcher.domain_expertise_map)
+        domain_scores = np.zeros((len(employees), len(domains)))
+        department_scores = np.zeros((len(employees), len(domains)))
+
+        for row, employee in enumerate(employees):
+            for column, domain in enumerate(domains):
+                domain_scores[row, column] = matcher._calculate_domain_expertise_score(employee, domain)
+                department_scores[row, column] = matcher._calculate_department_alignment_score(employee, domain)
+
+        arrays = {
+            'static_ids': np.array([employee.id for employee in employees], dtype=np.int64),
+            'static_versions': np.array([employee.updated_at for employee in employees], dtype='datetime64[us]'),
+            'static_domain_scores': domain_scores,
+            'static_department_scores': department_scores
+        }
+        return arrays, domains
+
+    def load_arrays(self, arrays, domains):
+        """Answer future domain misses from a snapshot's score matrices"""
+        self._snapshot = _SnapshotMatrix(
+            arrays['static_ids'], arrays['static_versions'], domains,
+            arrays['static_domain_scores'], arrays['static_department_scores']
+        )
+
+    def _snapshot_scores(self, employee, domain):
+        """Snapshot scores for an employee unchanged since the snapshot, else None"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+
+        slot = snapshot.slots.get(employee.id)
+        column = snapshot.columns.get(domain)
+        if slot is None or column is None or snapshot.versions[slot].item() != employee.updated_at:
+            return None
+
+        return (
+            float(snapshot.domain_scores[slot, column]),
+            float(snapshot.department_scores[slot, column])
+        )
+
+    def invalidate(self, employee_id=None):
+        """Drop one employee's row, or every row and the snapshot matrix"""
+        if employee_id is None:
+            self._rows = {}
+            self._snapshot = None
+        else:
+            self._rows.pop(employee_id, None)
+
+    def stats(self):
+        """Get table size and hit/miss counters"""
+        return {
+            'employees': len(self._rows),
+            'hits': self.hits,
+            'misses': self.misses,
+            'snapshot_hits': self.snapshot_hits
+        }
+
+
+# Shared table for matchers using the default domain maps
+static_score_table = StaticScoreTable()
@@ -1,5 +1,6 @@
 import openai
 from flask import current_app
+from utils.keyword_automaton import task_type_automaton
 import re
 
 
@@ -30,43 +31,9 @@ class TaskIntentDetector:
     
     def _simple_task_type_detection(self, text):
         """Simple keyword-based task type detection"""
-        text_lower = text.lower()
-        
-        # Bug-related keywords
-        bug_keywords = [
-            'bug', 'error', 'broken', 'not working', 'fails', 'crash', 'exception',
-            'issue', 'problem', 'defect', 'glitch', 'malfunction', 'doesn\'t work'
-        ]
-        
-        # Feature request keywords
-        feature_keywords = [
-            'feature', 'new', 'add', 'implement', 'create', 'build', 'develop',
-            'enhancement', 'improvement', 'request', 'suggestion', 'idea'
-        ]
-        
-        # Story/task keywords
-        story_keywords = [
-            'task', 'work', 'do', 'need to', 'have to', 'should', 'must',
-            'create', 'update', 'modify', 'change', 'fix', 'review', 'check'
-        ]
-        
-        # Incident keywords
-        incident_keywords = [
-            'incident', 'outage', 'down', 'emergency', 'urgent', 'critical',
-            'alert', 'alarm', 'service down', 'system down', 'broken'
-        ]
-        
-        # Check for specific types
-        if any(keyword in text_lower for keyword in bug_keywords):
-            return 'bug'
-        elif any(keyword in text_lower for keyword in incident_keywords):
-            return 'incident'
-        elif any(keyword in text_lower for keyword in feature_keywords):
-            return 'feature'
-        elif any(keyword in text_lower for keyword in story_keywords):
-            return 'task'
-        
-        return None
+        # Bug, incident, feature and task keywords are checked in that order,
+        # all found in one scan of the text
+        return task_type_automaton.first_category(text)
     
     def _gpt_task_type_detection(self, text):
         """Use GPT to detect task type"""
@@ -0,0 +1,207 @@
+import numpy as np
+from utils.employee_matcher import MAX_ACTIVE_TASKS, MAX_ACTIVE_HOURS
+from utils.skills import skill_cache, skill_terms
+
+
+class VectorizedScorer:
+    """
+    Matrix-based scoring engine for employee-task matching.
+    
+    Encodes a candidate list once into skill/domain indicator matrices and
+    workload vectors, then computes the same components and weights as
+    EmployeeMatcher._calculate_employee_score with a few array operations.
+    Components are accumulated in the same order as the per-employee scorer,
+    so scores (and therefore rankings) are identical.
+    """
+    
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.employees = []
+    
+    def encode(self, employees):
+        """
+        Encode candidates into matrices.
+        
+        Args:
+            employees (list): Candidates loaded by EmployeeMatcher._get_available_employees
+        """
+        self.employees = list(employees)
+        count = len(self.employees)
+        
+        domains = list(self.matcher.domain_expertise_map)
+        departments = list(self.matcher.domain_department_map)
+        self.domain_index = {domain: i for i, domain in enumerate(domains)}
+        self.department_index = {domain: i for i, domain in enumerate(departments)}
+        
+        self.has_skills = np.zeros(count, dtype=bool)
+        self.domain_scores = np.zeros((count, len(domains)))
+        self.department_scores = np.zeros((count, len(departments)))
+        self.task_count = np.zeros(count)
+        self.estimated_hours = np.zeros(count)
+        self.hours_load = np.zeros(count)
+        self.high_priority_count = np.zeros(count)
+        
+        vocabulary = {}
+        sources = {}
+        skill_cells = []
+        history_cells = []
+        skill_rows = []
+        
+        for row, employee in enumerate(self.employees):
+            workload = employee.current_workload
+            self.task_count[row] = workload['task_count']
+            self.estimated_hours[row] = workload['estimated_hours']
+            if 'capacity_load' in workload:
+                self.hours_load[row] = workload['capacity_load']
+            else:
+                self.hours_load[row] = workload['estimated_hours'] / MAX_ACTIVE_HOURS
+            self.high_priority_count[row] = workload['high_priority_count']
+            
+            for source, task_count in employee.task_history.items():
+                column = sources.setdefault(source.lower(), len(sources))
+                history_cells.append((row, column, task_count))
+            
+            if employee.department:
+                employee_dept = employee.department.lower()
+                for domain, column in self.department_index.items():
+                    if any(dept in employee_dept for dept in self.matcher.domain_department_map[domain]):
+                        self.department_scores[row, column] = 1.0
+            
+            if not employee.skills:
+                skill_rows.append(())
+                continue
+            self.has_skills[row] = True
+            
+            parsed = skill_cache.get(employee)
+            for term in parsed.terms:
+                skill_cells.append((row, vocabulary.setdefault(term, len(vocabulary))))
+            skill_rows.append(parsed.skills)
+        
+        self._encode_domain_scores(skill_rows)
+        
+        # Employee x skill-vocabulary indicator matrix
+        self.vocabulary = list(vocabulary)
+        self.skill_matrix = np.zeros((count, len(self.vocabulary)), dtype=bool)
+        for row, column in skill_cells:
+            self.skill_matrix[row, column] = True
+        
+        # Employee x task-source history counts
+        self.sources = list(sources)
+        self.history_matrix = np.zeros((count, len(self.sources)))
+        for row, column, task_count in history_cells:
+            self.history_matrix[row, column] = task_count
+        
+        return self
+    
+    def _encode_domain_scores(self, skill_rows):
+        """Fill domain_scores from each candidate's normalized skills"""
+        for row, skills in enumerate(skill_rows):
+            if not skills:
+                continue
+            
+            skill_domains = [self.matcher._skill_domains(skill) for skill in skills]
+            for domain, column in self.domain_index.items():
+                keywords = self.matcher.domain_expertise_map[domain]
+                if not keywords:
+                    continue
+                matches = sum(1 for domains in skill_domains if domain in domains)
+                self.domain_scores[row, column] = min(1.0, matches / len(keywords))
+    
+    def score(self, task_type, priority, required_domain, required_skills=None):
+        """
+        Score every encoded candidate for one task.
+        
+        Returns:
+            numpy.ndarray: Scores aligned with the encoded employee order
+        """
+        count = len(self.employees)
+        domain = required_domain.lower()
+        
+        # Domain expertise match (unknown domains get the default 0.5)
+        if domain in self.domain_index and self.matcher.domain_expertise_map[domain]:
+            domain_score = self.domain_scores[:, self.domain_index[domain]]
+        else:
+            domain_score = np.where(self.has_skills, 0.5, 0.0)
+        
+        # Workload balance
+        task_count_score = np.maximum(0, 1.0 - (self.task_count / MAX_ACTIVE_TASKS))
+        hours_score = np.maximum(0, 1.0 - self.hours_load)
+        workload_score = (task_count_score * 0.6) + (hours_score * 0.4)
+        
+        # Priority handling capability
+        if priority == 'high':
+            priority_score = np.maximum(0, 1.0 - (self.high_priority_count / 3.0))
+        else:
+            priority_score = np.full(count, 0.5)
+        
+        # Experience with task type
+        task_type = task_type.lower()
+        source_mask = np.array([task_type in source for source in self.sources], dtype=bool)
+        task_type_count = self.history_matrix[:, source_mask].sum(axis=1) if source_mask.any() else np.zeros(count)
+        experience_score = np.minimum(1.0, task_type_count / 10.0)
+        
+        # Department alignment
+        if domain in self.department_index:
+            department_score = self.department_scores[:, self.department_index[domain]]
+        else:
+            department_score = np.zeros(count)
+        
+        score = np.zeros(count)
+        score += 10
+        score += domain_score * 20
+        if required_skills:
+            score += self._skills_match_score(required_skills) * 15
+        score += workload_score * 10
+        score += priority_score * 8
+        score += experience_score * 5
+        score += department_score * 3
+        
+        return np.maximum(0, score)
+    
+    def score_matrix(self, tasks):
+        """
+        Score a batch of tasks against every encoded candidate.
+        
+        Args:
+            tasks (list): Dicts with task_type, priority, required_domain and
+                optional required_skills
+            
+        Returns:
+            numpy.ndarray: tasks x employees score matrix
+        """
+        if not tasks:
+            return np.zeros((0, len(self.employees)))
+        
+        return np.vstack([
+            self.score(
+                task['task_type'], task['priority'], task['required_domain'],
+                task.get('required_skills')
+            )
+            for task in tasks
+        ])
+    
+    def rank(self, task_type, priority, required_domain, required_skills=None, limit=None):
+        """
+        Rank candidates for one task.
+        
+        Returns:
+            list: (employee, score) tuples with positive scores, highest first;
+                ties keep candidate order like the per-employee ranking
+        """
+        scores = self.score(task_type, priority, required_domain, required_skills)
+        order = np.argsort(-scores, kind='stable')
+        ranked = [(self.employees[i], float(scores[i])) for i in order if scores[i] > 0]
+        return ranked[:limit] if limit is not None else ranked
+    
+    def _skills_match_score(self, required_skills):
+        """Fraction of required skills contained in one of each employee's skills"""
+        matches = np.zeros(len(self.employees))
+        for required_skill in required_skills:
+            terms = skill_terms(required_skill)
+            vocabulary_mask = np.array(
+                [any(term in skill for term in terms) for skill in self.vocabulary], dtype=bool
+            )
+            if vocabulary_mask.any():
+                matches += self.skill_matrix[:, vocabulary_mask].any(axis=1)
+        
+        return np.where(self.has_skills, np.minimum(1.0, matches / len(required_skills)), 0.0)
@@ -0,0 +1,397 @@
+import math
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event, inspect, select, and_, func, case
+
+ACTIVE_ASSIGNMENT_STATUSES = ('assigned', 'accepted')
+
+# Session.info key for deltas recorded at flush and applied at commit
+PENDING_KEY = 'workload_ledger_pending'
+
+# Task columns an assignment's workload and history are computed from
+LEDGER_TASK_COLUMNS = ('source', 'estimated_hours', 'priority')
+
+EMPTY_WORKLOAD = {'task_count': 0, 'estimated_hours': 0, 'high_priority_count': 0}
+
+
+def _workload_drifted(old, new):
+    """Whether two workload entries differ, counting a missing entry as idle"""
+    old = old or EMPTY_WORKLOAD
+    new = new or EMPTY_WORKLOAD
+    return (
+        old['task_count'] != new['task_count']
+        or old['high_priority_count'] != new['high_priority_count']
+        # Hours applied as deltas may carry float residue the recount doesn't
+        or not math.isclose(old['estimated_hours'], new['estimated_hours'], abs_tol=1e-6)
+    )
+
+
+class WorkloadLedger:
+    """
+    Process-local per-employee workload, maintained from session events.
+
+    Holds the same numbers the matcher's grouped workload query produces:
+    active task count, active estimated hours, active high-priority count and
+    per-source task history. Deltas are computed from the attribute history
+    of flushed Task/TaskAssignment rows and applied only once the transaction
+    commits, so rolled-back work never reaches the ledger. Writes that bypass
+    the ORM (bulk updates, other processes) are corrected by reconciling
+    against the database every `reconcile_interval` seconds, or sooner with
+    refresh() when the writer names the employees it touched.
+    """
+
+    def __init__(self, reconcile_interval=300):
+        self._workloads = {}  # employee id -> {'task_count', 'estimated_hours', 'high_priority_count'}
+        self._history = {}    # employee id -> {source: assignment count}
+        self._history_versions = {}  # employee id -> bumped whenever the history changes
+        self._lock = threading.RLock()
+        self.reconcile_interval = reconcile_interval
+        self.is_loaded = False
+        self.is_listening = False
+        self.last_reconciled = 0.0
+        self.reconciliations = 0
+        self.corrections = 0
+        self.refreshes = 0
+
+    def init_app(self, app):
+        """Start tracking commits made through the app's session"""
+        from models.database import db
+
+        self.reconcile_interval = app.config.get(
+            'WORKLOAD_LEDGER_RECONCILE_SECONDS', self.reconcile_interval
+        )
+
+        if not app.config.get('WORKLOAD_LEDGER_ENABLED', True) or self.is_listening:
+            return
+
+        event.listen(db.session, 'after_flush', self._after_flush)
+        event.listen(db.session, 'after_commit', self._after_commit)
+        event.listen(db.session, 'after_rollback', self._after_rollback)
+        self.is_listening = True
+
+    def get(self, employee_id):
+        """
+        Get an employee's current workload.
+
+        Returns:
+            dict: task_count, estimated_hours and high_priority_count
+        """
+        workload = self._workloads.get(employee_id)
+        return dict(workload or EMPTY_WORKLOAD)
+
+    def get_history(self, employee_id):
+        """Get an employee's assignment count per task source"""
+        return dict(self._history.get(employee_id, {}))
+
+    def get_history_version(self, employee_id):
+        """
+        Get a counter that changes whenever the employee's history does.
+
+        Read it before get_history: a change landing in between then only
+        makes the pair look older than it is, never newer.
+        """
+        return self._history_versions.get(employee_id, 0)
+
+    def ensure_loaded(self):
+        """Load the ledger on first use and reconcile once the interval has elapsed"""
+        if not self.is_loaded or time.monotonic() - self.last_reconciled >= self.reconcile_interval:
+            self.reconcile()
+
+    def reconcile(self):
+        """
+        Replace the ledger with workload aggregated from the database.
+
+        Returns:
+            int: Number of employees whose entries had drifted
+        """
+        try:
+            workloads, history = self._aggregate()
+
+            with self._lock:
+                drifted = 0
+                if self.is_loaded:
+                    for employee_id in set(workloads) | set(self._workloads):
+                        if self._drifted(employee_id, workloads, history):
+                            drifted += 1
+
+                self._workloads = workloads
+                self._history = history
+                self.is_loaded = True
+                self.last_reconciled = time.monotonic()
+                self.reconciliations += 1
+                self.corrections += drifted
+
+            if drifted:
+                # Rankings computed from the drifted entries are stale too
+                from utils.roster_events import roster_version
+                roster_version.bump()
+                current_app.logger.info(f"Workload ledger reconciled, corrected {drifted} employees")
+            return drifted
+
+        except Exception as e:
+            current_app.logger.error(f"Error reconciling workload ledger: {str(e)}")
+            return 0
+
+    def refresh(self, employee_ids):
+        """
+        Recount the given employees from the database.
+
+        For writes the session didn't see but whose employees are known,
+        such as commits in another process. Does nothing until the ledger is
+        loaded, since loading counts everyone.
+
+        Returns:
+            int: Number of employees whose entries changed
+        """
+        employee_ids = set(employee_ids)
+        if not employee_ids or not self.is_loaded:
+            return 0
+
+        try:
+            workloads, history = self._aggregate(employee_ids)
+        except Exception as e:
+            current_app.logger.error(f"Error refreshing workload ledger: {str(e)}")
+            return 0
+
+        with self._lock:
+            changed = 0
+            for employee_id in employee_ids:
+                if not self._drifted(employee_id, workloads, history):
+                    continue
+                changed += 1
+                if employee_id in workloads:
+                    self._workloads[employee_id] = workloads[employee_id]
+                else:
+                    self._workloads.pop(employee_id, None)
+                if employee_id in history:
+                    self._history[employee_id] = history[employee_id]
+                else:
+                    self._history.pop(employee_id, None)
+            self.refreshes += 1
+            return changed
+
+    def stats(self):
+        """Ledger size and reconciliation counters"""
+        return {
+            'employees': len(self._workloads),
+            'loaded': self.is_loaded,
+            'listening': self.is_listening,
+            'reconciliations': self.reconciliations,
+            'corrections': self.corrections,
+            'refreshes': self.refreshes,
+            'seconds_since_reconcile': (
+                round(time.monotonic() - self.last_reconciled, 1) if self.is_loaded else None
+            )
+        }
+
+    def _aggregate(self, employee_ids=None):
+        """
+        Count workload and history in the database.
+
+        Returns:
+            tuple: ({employee id: workload}, {employee id: {source: count}})
+                for the given employees, or everyone when None
+        """
+        from models.database import db, Task, TaskAssignment
+
+        active = TaskAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES)
+
+        query = db.session.query(
+            TaskAssignment.employee_id,
+            Task.source,
+            func.count(TaskAssignment.id),
+            func.sum(case((active, 1), else_=0)),
+            func.sum(case(
+                (and_(active, Task.estimated_hours.isnot(None)), Task.estimated_hours),
+                else_=0
+            )),
+            func.sum(case((and_(active, Task.priority == 'high'), 1), else_=0))
+        ).outerjoin(
+            Task, Task.id == TaskAssignment.task_id
+        )
+        if employee_ids is not None:
+            query = query.filter(TaskAssignment.employee_id.in_(employee_ids))
+        rows = query.group_by(TaskAssignment.employee_id, Task.source).all()
+
+        workloads = {}
+        history = {}
+        for employee_id, source, assignment_count, task_count, hours, high_priority in rows:
+            workload = workloads.setdefault(employee_id, {
+                'task_count': 0,
+                'estimated_hours': 0,
+                'high_priority_count': 0
+            })
+            workload['task_count'] += task_count or 0
+            workload['estimated_hours'] += hours or 0
+            workload['high_priority_count'] += high_priority or 0
+
+            if source and assignment_count:
+                history.setdefault(employee_id, {})[source] = assignment_count
+
+        return workloads, history
+
+    def _drifted(self, employee_id, workloads, history):
+        """Whether an employee's entries differ from a recount, bumping its history version if so"""
+        history_drifted = self._history.get(employee_id, {}) != history.get(employee_id, {})
+        if history_drifted:
+            self._bump_history_version(employee_id)
+        return history_drifted or _workload_drifted(
+            self._workloads.get(employee_id), workloads.get(employee_id)
+        )
+
+    def _after_flush(self, session, flush_context):
+        """Record workload deltas for the flushed rows"""
+        from models.database import Task, TaskAssignment
+
+        deltas = []
+        task_cache = {}
+        old_task_fields = {}
+        handled = set()  # assignments whose deltas are recorded directly
+
+        for obj in session.new:
+            if isinstance(obj, Task):
+                task_cache[obj.id] = self._task_fields(obj)
+
+        for obj in session.dirty:
+            if isinstance(obj, Task):
+                state = inspect(obj)
+                old_fields = tuple(
+                    self._previous(state, key) for key in LEDGER_TASK_COLUMNS
+                )
+                if old_fields != self._task_fields(obj):
+                    old_task_fields[obj.id] = old_fields
+
+        for obj in session.new:
+            if isinstance(obj, TaskAssignment):
+                task = self._load_task(session, obj.task_id, task_cache)
+                deltas.append((obj.employee_id, obj.status, task, 1))
+                handled.add(obj.id)
+
+        for obj in session.dirty:
+            if isinstance(obj, TaskAssignment):
+                state = inspect(obj)
+                employee_id = self._previous(state, 'employee_id')
+                status = self._previous(state, 'status')
+                if employee_id == obj.employee_id and status == obj.status:
+                    continue
+
+                task = self._load_task(session, obj.task_id, task_cache)
+                deltas.append((employee_id, status, old_task_fields.get(obj.task_id, task), -1))
+                deltas.append((obj.employee_id, obj.status, task, 1))
+                handled.add(obj.id)
+
+        for obj in session.deleted:
+            if isinstance(obj, TaskAssignment):
+                state = inspect(obj)
+                task = self._load_task(session, obj.task_id, task_cache)
+                deltas.append((
+                    self._previous(state, 'employee_id'),
+                    self._previous(state, 'status'),
+                    old_task_fields.get(obj.task_id, task),
+                    -1
+                ))
+
+        # Move the remaining assignments of edited tasks over to the new fields
+        for task_id, old_fields in old_task_fields.items():
+            new_fields = self._load_task(session, task_id, task_cache)
+            assignments = session.connection().execute(
+                select(TaskAssignment.id, TaskAssignment.employee_id, TaskAssignment.status).where(
+                    TaskAssignment.task_id == task_id
+                )
+            ).all()
+            for assignment_id, employee_id, status in assignments:
+                if assignment_id in handled:
+                    continue
+                deltas.append((employee_id, status, old_fields, -1))
+                deltas.append((employee_id, status, new_fields, 1))
+
+        if deltas:
+            session.info.setdefault(PENDING_KEY, []).extend(deltas)
+
+    def _after_commit(self, session):
+        """Apply the deltas of the committed transaction"""
+        deltas = session.info.pop(PENDING_KEY, None)
+        if not deltas or not self.is_loaded:
+            return
+
+        with self._lock:
+            for employee_id, status, task, sign in deltas:
+                self._apply(employee_id, status, task, sign)
+
+    def _after_rollback(self, session):
+        """Drop deltas of the rolled-back transaction"""
+        session.info.pop(PENDING_KEY, None)
+
+    def _apply(self, employee_id, status, task, sign):
+        """Add (sign=1) or remove (sign=-1) one assignment's contribution"""
+        if employee_id is None:
+            return
+
+        source, estimated_hours, priority = task
+
+        if source:
+            history = self._history.setdefault(employee_id, {})
+            count = history.get(source, 0) + sign
+            if count > 0:
+                history[source] = count
+            else:
+                history.pop(source, None)
+            self._bump_history_version(employee_id)
+
+        workload = self._workloads.setdefault(employee_id, {
+            'task_count': 0,
+            'estimated_hours': 0,
+            'high_priority_count': 0
+        })
+
+        if status in ACTIVE_ASSIGNMENT_STATUSES:
+            workload['task_count'] = max(0, workload['task_count'] + sign)
+            if estimated_hours is not None:
+                workload['estimated_hours'] += sign * estimated_hours
+            if priority == 'high':
+                workload['high_priority_count'] = max(0, workload['high_priority_count'] + sign)
+
+            # Don't let float residue outlive the last active task
+            if workload['task_count'] == 0:
+                workload['estimated_hours'] = 0
+
+    def _bump_history_version(self, employee_id):
+        self._history_versions[employee_id] = self._history_versions.get(employee_id, 0) + 1
+
+    def _load_task(self, session, task_id, task_cache):
+        """Get (source, estimated_hours, priority) for a task, preferring the identity map"""
+        from models.database import Task
+
+        if task_id in task_cache:
+            return task_cache[task_id]
+
+        task = session.identity_map.get(inspect(Task).identity_key_from_primary_key((task_id,)))
+        if task is not None:
+            fields = self._task_fields(task)
+        else:
+            row = session.connection().execute(
+                select(Task.source, Task.estimated_hours, Task.priority).where(Task.id == task_id)
+            ).first()
+            fields = tuple(row) if row else (None, None, None)
+
+        task_cache[task_id] = fields
+        return fields
+
+    @staticmethod
+    def _task_fields(task):
+        return (task.source, task.estimated_hours, task.priority)
+
+    @staticmethod
+    def _previous(state, key):
+        """Value of an attribute before the current flush"""
+        history = state.attrs[key].history
+        if history.deleted:
+            return history.deleted[0]
+        if history.unchanged:
+            return history.unchanged[0]
+        return history.added[0] if history.added else None
+
+
+# Shared ledger used by the employee matcher
+workload_ledger = WorkloadLedger()
@@ -0,0 +1,327 @@
+import heapq
+import math
+import numpy as np
+from flask import current_app
+from sqlalchemy import and_, case, func
+from utils.employee_matcher import MAX_ACTIVE_HOURS
+from utils.side_effects import enqueue_assignment_email
+from utils.workload_ledger import ACTIVE_ASSIGNMENT_STATUSES
+
+# Order in which an overloaded employee's tasks are offered for moving
+PRIORITY_RANK = {'low': 0, 'medium': 1, 'high': 2}
+
+# Tasks already being worked on stay with their assignee
+UNMOVABLE_TASK_STATUSES = ('In Progress', 'Closed')
+
+# Status left on an assignment whose task was moved to someone else
+REASSIGNED_STATUS = 'reassigned'
+
+
+def employee_loads():
+    """
+    Get every employee's active workload with one aggregate query.
+
+    Returns:
+        dict: employee id -> {'task_count', 'estimated_hours', 'available'},
+            including employees without active assignments
+    """
+    from models.database import db, Employee, Task, TaskAssignment
+
+    rows = db.session.query(
+        Employee.id,
+        Employee.availability,
+        func.count(TaskAssignment.id),
+        func.coalesce(func.sum(Task.estimated_hours), 0)
+    ).outerjoin(
+        TaskAssignment, and_(
+            TaskAssignment.employee_id == Employee.id,
+            TaskAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES)
+        )
+    ).outerjoin(
+        Task, Task.id == TaskAssignment.task_id
+    ).group_by(Employee.id, Employee.availability)
+
+    return {
+        employee_id: {
+            'task_count': task_count,
+            'estimated_hours': float(hours),
+            'available': bool(available)
+        }
+        for employee_id, available, task_count, hours in rows
+    }
+
+
+class WorkloadRebalancer:
+    """
+    Moves open work from overloaded employees to qualified, underloaded ones.
+
+    The average load is the number of active assignments per available
+    employee. Employees above `overload_ratio` times the average are donors
+    and give up tasks until they are back at the average (rounded up).
+    Available employees below that level receive tasks until they reach it.
+    Donors are served from a heap, most loaded first, and each offers its
+    lowest-priority open task that hasn't been accepted yet, latest due date
+    first. The task goes to the receiver with the highest match score among
+    those scoring at least `min_score_ratio` of the current assignee. A task
+    nobody qualifies for stays put, and the donor offers its next one.
+
+    Scores come from the matcher's vectorized scorer over donors and
+    receivers, and its workload vectors are updated after every move, so
+    later moves see earlier ones. At most `max_moves` moves are planned.
+    """
+
+    def __init__(self, matcher, profile_task, overload_ratio=1.5, min_score_ratio=0.9,
+                 max_moves=50, offers_per_donor=20):
+        """
+        Args:
+            matcher (EmployeeMatcher): Matcher whose scoring decides qualification
+            profile_task (callable): Task -> dict of task_type, priority,
+                required_domain and required_skills
+            overload_ratio (float): Load over the average that marks a donor
+            min_score_ratio (float): Share of the current assignee's score a
+                receiver needs to qualify
+            max_moves (int): Most moves per plan
+            offers_per_donor (int): Most tasks a donor offers per plan
+        """
+        self.matcher = matcher
+        self.profile_task = profile_task
+        self.overload_ratio = overload_ratio
+        self.min_score_ratio = min_score_ratio
+        self.max_moves = max_moves
+        self.offers_per_donor = offers_per_donor
+
+    def plan(self, max_moves=None):
+        """
+        Plan moves without writing anything.
+
+        Returns:
+            dict: 'average_load', 'overload_threshold', 'target_load',
+                'overloaded' (donor ids and task counts, most loaded first),
+                'underloaded' (number of receivers) and 'moves' (list of
+                dicts with assignment_id, task_id, task_title,
+                task_description, priority, from_employee_id, to_employee_id,
+                from_score and to_score)
+        """
+        max_moves = self.max_moves if max_moves is None else max_moves
+        loads = employee_loads()
+        available = [employee_id for employee_id, load in loads.items() if load['available']]
+
+        total = sum(load['task_count'] for load in loads.values())
+        average = total / len(available) if available else 0.0
+        threshold = average * self.overload_ratio
+        target = math.ceil(average)
+
+        donors = {
+            employee_id: load['task_count'] for employee_id, load in loads.items()
+            if load['task_count'] > threshold and load['task_count'] > target
+        }
+        receivers = {
+            employee_id: loads[employee_id]['task_count'] for employee_id in available
+            if loads[employee_id]['task_count'] < target
+        }
+
+        plan = {
+            'average_load': round(average, 2),
+            'overload_threshold': round(threshold, 2),
+            'target_load': target,
+            'overloaded': [
+                {'employee_id': employee_id, 'task_count': count}
+                for employee_id, count in sorted(donors.items(), key=lambda item: (-item[1], item[0]))
+            ],
+            'underloaded': len(receivers),
+            'moves': []
+        }
+
+        if donors and receivers and max_moves > 0:
+            plan['moves'] = self._plan_moves(donors, receivers, target, max_moves)
+        return plan
+
+    def apply(self, plan):
+        """
+        Carry out a plan's moves in one transaction.
+
+        Each moved task gets a new assignment and a queued notification;
+        the previous assignment is kept with status 'reassigned'. Moves
+        whose assignment changed since planning are skipped.
+
+        Returns:
+            dict: 'applied' (list of new TaskAssignment) and 'skipped'
+                (moves no longer valid)
+        """
+        from models.database import db, Employee, TaskAssignment
+
+        moves = plan['moves']
+        if not moves:
+            return {'applied': [], 'skipped': []}
+
+        current = {
+            assignment.id: assignment for assignment in TaskAssignment.query.filter(
+                TaskAssignment.id.in_([move['assignment_id'] for move in moves])
+            )
+        }
+        emails = dict(db.session.query(Employee.id, Employee.email).filter(
+            Employee.id.in_({move['to_employee_id'] for move in moves})
+        ))
+
+        applied = []
+        skipped = []
+        notifications = []
+        for move in moves:
+            previous = current.get(move['assignment_id'])
+            if (previous is None or previous.status != 'assigned'
+                    or previous.employee_id != move['from_employee_id']):
+                skipped.append(move)
+                continue
+
+            previous.status = REASSIGNED_STATUS
+            assignment = TaskAssignment(
+                task_id=move['task_id'],
+                employee_id=move['to_employee_id'],
+                assigned_by='Workload Rebalancer',
+                notes=f"Moved from employee {move['from_employee_id']} to rebalance workload"
+            )
+            db.session.add(assignment)
+            applied.append(assignment)
+            notifications.append((assignment, emails.get(move['to_employee_id']), move))
+
+        try:
+            # One flush gives every assignment its id for the notification keys
+            db.session.flush()
+            for assignment, email, move in notifications:
+                if email:
+                    enqueue_assignment_email(assignment, email, move['task_title'], move['task_description'])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        current_app.logger.info(
+            f"Workload rebalancing moved {len(applied)} tasks ({len(skipped)} skipped)"
+        )
+        return {'applied': applied, 'skipped': skipped}
+
+    def _plan_moves(self, donors, receivers, target, max_moves):
+        """Pair donor tasks with receivers, most loaded donor first"""
+        from utils.vectorized_scorer import VectorizedScorer
+
+        employees = self.matcher._get_available_employees(set(donors) | set(receivers))
+        # Unavailable donors aren't loaded as candidates but still give work away
+        scorer = VectorizedScorer(self.matcher).encode(employees)
+        columns = {employee.id: column for column, employee in enumerate(scorer.employees)}
+
+        receiver_mask = np.zeros(len(scorer.employees), dtype=bool)
+        room = np.zeros(len(scorer.employees))
+        for employee_id, count in receivers.items():
+            if employee_id in columns:
+                receiver_mask[columns[employee_id]] = True
+                room[columns[employee_id]] = target - count
+
+        offers = self._movable_tasks(donors)
+        heap = [(-count, employee_id) for employee_id, count in donors.items()]
+        heapq.heapify(heap)
+
+        moves = []
+        while heap and len(moves) < max_moves and room.any():
+            count, donor_id = heapq.heappop(heap)
+            count = -count
+
+            donor_offers = offers.get(donor_id)
+            while donor_offers:
+                assignment_id, task = donor_offers.pop()
+                profile = self.profile_task(task)
+                scores = scorer.score(
+                    profile['task_type'], profile['priority'], profile['required_domain'],
+                    profile.get('required_skills')
+                )
+
+                donor_column = columns.get(donor_id)
+                floor = scores[donor_column] * self.min_score_ratio if donor_column is not None else 0.0
+                eligible = np.where(receiver_mask & (room > 0) & (scores >= floor) & (scores > 0))[0]
+                if not len(eligible):
+                    continue
+
+                # Highest score wins; ties go to the lower column like the matcher's ranking
+                receiver_column = int(eligible[np.argmax(scores[eligible])])
+                receiver = scorer.employees[receiver_column]
+                moves.append({
+                    'assignment_id': assignment_id,
+                    'task_id': task.id,
+                    'task_title': task.title,
+                    'task_description': task.description,
+                    'priority': task.priority,
+                    'from_employee_id': donor_id,
+                    'to_employee_id': receiver.id,
+                    'from_score': round(float(scores[donor_column]), 2) if donor_column is not None else None,
+                    'to_score': round(float(scores[receiver_column]), 2)
+                })
+
+                room[receiver_column] -= 1
+                self._shift_load(scorer, receiver_column, task, 1)
+                if donor_column is not None:
+                    self._shift_load(scorer, donor_column, task, -1)
+                count -= 1
+                if count > target and donor_offers:
+                    heapq.heappush(heap, (-count, donor_id))
+                break
+
+        return moves
+
+    def _movable_tasks(self, donors):
+        """
+        Get the first `offers_per_donor` tasks each donor may give up, the
+        next one to offer last.
+
+        Returns:
+            dict: donor id -> list of (assignment id, task row); rows have the
+                id, title, description, priority, source and estimated_hours
+                of the task
+        """
+        from models.database import db, Task, TaskAssignment
+
+        priority_rank = case(PRIORITY_RANK, value=Task.priority, else_=PRIORITY_RANK['medium'])
+        offer_rank = func.row_number().over(
+            partition_by=TaskAssignment.employee_id,
+            order_by=(
+                priority_rank,
+                Task.due_date.is_(None).desc(),
+                Task.due_date.desc(),
+                TaskAssignment.assigned_at.desc(),
+                TaskAssignment.id.desc()
+            )
+        ).label('offer_rank')
+
+        ranked = db.session.query(
+            TaskAssignment.id.label('assignment_id'),
+            TaskAssignment.employee_id,
+            Task.id,
+            Task.title,
+            Task.description,
+            Task.priority,
+            Task.source,
+            Task.estimated_hours,
+            offer_rank
+        ).join(
+            Task, Task.id == TaskAssignment.task_id
+        ).filter(
+            TaskAssignment.employee_id.in_(list(donors)),
+            TaskAssignment.status == 'assigned',
+            Task.status.notin_(UNMOVABLE_TASK_STATUSES)
+        ).subquery()
+
+        rows = db.session.query(ranked).filter(
+            ranked.c.offer_rank <= self.offers_per_donor
+        ).order_by(ranked.c.employee_id, ranked.c.offer_rank.desc())
+
+        offers = {}
+        for row in rows:
+            offers.setdefault(row.employee_id, []).append((row.assignment_id, row))
+        return offers
+
+    def _shift_load(self, scorer, column, task, direction):
+        """Move a task's load onto (+1) or off (-1) an encoded candidate"""
+        hours = task.estimated_hours or 0
+        scorer.task_count[column] += direction
+        scorer.estimated_hours[column] += direction * hours
+        scorer.hours_load[column] += direction * hours / MAX_ACTIVE_HOURS
+        if task.priority == 'high':
+            scorer.high_priority_count[column] += direction